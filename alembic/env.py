@@ -4,6 +4,7 @@ from dotenv import load_dotenv
 import os
 
 from sqlmodel import SQLModel
+from app.db.fulltext import is_fulltext_object
 from app.db.models import User, Post
 
 load_dotenv()
@@ -21,6 +22,18 @@ fileConfig(config.config_file_name)
 target_metadata = SQLModel.metadata
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    """
+    Keep autogenerate from dropping the unmapped full-text index objects,
+    and app.db.seed's progress table while a seed run is pending.
+    """
+    return not (
+        reflected
+        and compare_to is None
+        and (is_fulltext_object(name) or name == "seed_progress")
+    )
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -39,6 +52,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -62,7 +76,9 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,26 @@
+"""Add post (created_at, id) index for keyset pagination
+
+Revision ID: 3f9a1c2d7b4e
+Revises: 86031c88516b
+Create Date: 2026-10-17 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c2d7b4e'
+down_revision: Union[str, None] = '86031c88516b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_post_created_at_id', 'post', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_post_created_at_id', table_name='post')
@@ -0,0 +1,31 @@
+"""Add full-text search index on post title and content
+
+Revision ID: 8b2e4f6a1c3d
+Revises: 3f9a1c2d7b4e
+Create Date: 2026-10-17 11:03:27.541092
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.db.fulltext import CREATE_STATEMENTS, DROP_STATEMENTS
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e4f6a1c3d'
+down_revision: Union[str, None] = '3f9a1c2d7b4e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # PostgreSQL: generated tsvector column + GIN index (rewrites `post`)
+    # SQLite: FTS5 table + sync triggers, populated from existing rows
+    for statement in CREATE_STATEMENTS.get(op.get_bind().dialect.name, ()):
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for statement in DROP_STATEMENTS.get(op.get_bind().dialect.name, ()):
+        op.execute(statement)
@@ -0,0 +1,39 @@
+"""Add version columns to user and post for optimistic concurrency
+
+Revision ID: a5c8e2f41b97
+Revises: e7f3a9c15d28
+Create Date: 2026-10-17 18:42:37.581204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.fulltext import CREATE_STATEMENTS
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5c8e2f41b97'
+down_revision: Union[str, None] = 'e7f3a9c15d28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+    with op.batch_alter_table('post') as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('post') as batch_op:
+        batch_op.drop_column('version')
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.drop_column('version')
+    # SQLite drops columns by rebuilding `post`, which loses the FTS5 sync
+    # triggers; recreate them (idempotent) and reindex
+    if op.get_bind().dialect.name == 'sqlite':
+        for statement in CREATE_STATEMENTS['sqlite']:
+            op.execute(statement)
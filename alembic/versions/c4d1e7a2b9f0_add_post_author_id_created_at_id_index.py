@@ -0,0 +1,28 @@
+"""Add post (author_id, created_at, id) index for per-author listings
+
+Revision ID: c4d1e7a2b9f0
+Revises: 8b2e4f6a1c3d
+Create Date: 2026-10-17 14:03:27.540912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d1e7a2b9f0'
+down_revision: Union[str, None] = '8b2e4f6a1c3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_post_author_id_created_at_id', 'post', ['author_id', 'created_at', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_post_author_id_created_at_id', table_name='post')
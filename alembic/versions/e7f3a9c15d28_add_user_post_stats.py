@@ -0,0 +1,36 @@
+"""Add denormalized post_count and last_posted_at to user
+
+Revision ID: e7f3a9c15d28
+Revises: c4d1e7a2b9f0
+Create Date: 2026-10-17 15:21:09.316457
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7f3a9c15d28'
+down_revision: Union[str, None] = 'c4d1e7a2b9f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.add_column(sa.Column('post_count', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('last_posted_at', sa.DateTime(), nullable=True))
+    # Backfill from existing posts
+    op.execute(
+        'UPDATE "user" SET '
+        'post_count = (SELECT count(*) FROM post WHERE post.author_id = "user".id), '
+        'last_posted_at = (SELECT max(created_at) FROM post WHERE post.author_id = "user".id)'
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.drop_column('last_posted_at')
+        batch_op.drop_column('post_count')
@@ -0,0 +1,23 @@
+"""Admin/operations routes (async, DB_MODE=async)."""
+
+from fastapi import APIRouter, Depends
+
+from app.db.models import User
+from app.admin import service
+from app.auth.dependencies import get_async_current_admin
+from app.core.timing import TimedRoute
+
+router = APIRouter(route_class=TimedRoute)
+
+
+@router.get("/db/pool")
+async def get_pool_state(
+    current_admin: User = Depends(get_async_current_admin)
+):
+    """
+    Live connection pool state of this worker (admin only).
+    
+    Reports checked-out/overflow connections, checkout wait times and
+    timeouts, plus the configured pool parameters.
+    """
+    return service.pool_report()
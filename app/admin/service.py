@@ -0,0 +1,19 @@
+"""Operational reports for administrators."""
+
+from typing import Any
+
+from app.db.engine import pool_options
+from app.db.pool import monitored_engines, pool_status
+
+
+def pool_report() -> dict[str, Any]:
+    """Configured pool parameters and live state of every monitored pool."""
+    options = pool_options()
+    return {
+        "worker_max_connections": options["pool_size"] + options["max_overflow"],
+        "config": options,
+        "pools": {
+            name: pool_status(engine.pool)
+            for name, engine in monitored_engines.items()
+        },
+    }
@@ -0,0 +1,104 @@
+"""Authentication routes (async, DB_MODE=async)."""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from datetime import timedelta
+
+from app.db.session import get_async_session
+from app.db.models import User
+from app.users.schemas import UserCreate, UserRead
+from app.core.security import create_access_token
+from app.core.hashing import hashing_service
+from app.core.config import settings
+from app.core.timing import TimedRoute
+
+router = APIRouter(route_class=TimedRoute)
+
+
+@router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
+async def register(
+    user_data: UserCreate,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Register a new user.
+    
+    - **email**: Valid email address
+    - **password**: Minimum 8 characters, must contain digit and uppercase letter
+    """
+    # Check if user already exists
+    statement = select(User).where(User.email == user_data.email)
+    existing_user = (await session.exec(statement)).first()
+    
+    if existing_user:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
+    
+    # Hash password (runs in the hashing process pool)
+    hashed_password = await hashing_service.hash_async(user_data.password)
+    
+    # Create user
+    user = User(
+        email=user_data.email,
+        hashed_password=hashed_password
+    )
+    
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+    
+    return user
+
+
+@router.post("/login")
+async def login(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Login with email and password.
+    
+    Returns JWT access token.
+    """
+    # Find user by email (OAuth2 uses 'username' field)
+    statement = select(User).where(User.email == form_data.username)
+    user = (await session.exec(statement)).first()
+    
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    # Verify password (runs in the hashing process pool)
+    if not await hashing_service.verify_async(
+        form_data.password, user.hashed_password
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    # Check if user is active
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User account is disabled"
+        )
+    
+    # Create access token
+    access_token = create_access_token(
+        data={"sub": user.email, "role": user.role},
+        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    
+    return {
+        "access_token": access_token,
+        "token_type": "bearer"
+    }
@@ -0,0 +1,111 @@
+"""In-process cache of authenticated principals."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from app.core.config import settings
+from app.db.models import User
+
+
+class PrincipalCache:
+    """
+    Bounded LRU cache of users keyed by token subject (email), with a TTL.
+
+    Entries are detached copies and must be treated as read-only. The cache
+    is per process: invalidation only reaches the current worker, other
+    workers pick up changes once their entry expires, so keep the TTL short.
+
+    Every invalidation bumps the generation: a fill read before it (take
+    generation() before the SELECT) is dropped by set(), so a concurrent
+    update can't put the old row back.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, User]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def get(self, subject: str) -> User | None:
+        """Return the cached user, or None on a miss or expired entry."""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[subject]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(subject)
+            self.hits += 1
+            return entry[1]
+
+    def generation(self) -> int:
+        """Invalidation counter, to pass to set() after reading the user."""
+        with self._lock:
+            return self._generation
+
+    def set(self, subject: str, user: User, generation: int | None = None) -> None:
+        """
+        Cache a detached copy of `user`, evicting the least recently used.
+
+        Skipped if `generation` is given and an invalidation ran since.
+        """
+        if not self.enabled:
+            return
+
+        # Copy so the entry isn't tied to (or expired by) the request's session
+        snapshot = User(**user.model_dump())
+        expires_at = time.monotonic() + self.ttl_seconds
+
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[subject] = (expires_at, snapshot)
+            self._entries.move_to_end(subject)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *subjects: str) -> None:
+        """Drop cached entries, e.g. after a user's email/role/status changes."""
+        with self._lock:
+            self._generation += 1
+            for subject in subjects:
+                self._entries.pop(subject, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss/eviction counters and current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+            }
+
+
+# Singleton instance
+principal_cache = PrincipalCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
@@ -1,15 +1,52 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlmodel import Session, select
-from jose import JWTError, jwt
-from app.db.session import get_session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db.session import get_async_session, get_session
 from app.db.models import User
-from app.core.config import settings
+from app.core.security import decode_access_token
+from app.auth.cache import principal_cache
+from app.core.timing import measure
+from app.db.routing import bind_principal
 
 # OAuth2 scheme (extracts token from Authorization header)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _get_token_subject(token: str) -> str:
+    """Verify the JWT and return its subject (the user's email)."""
+    payload = decode_access_token(token)
+    
+    # Extract email
+    email: str | None = payload.get("sub")
+    if email is None:
+        raise _credentials_exception()
+    
+    return email
+
+
+def _ensure_active(user: User | None) -> User:
+    """Reject unknown or disabled users."""
+    if user is None:
+        raise _credentials_exception()
+    
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User account is disabled"
+        )
+    
+    return user
+
+
 def get_current_user(
     token: str = Depends(oauth2_scheme),
     session: Session = Depends(get_session)
@@ -17,6 +54,9 @@ def get_current_user(
     """
     Dependency that extracts and validates the current user from JWT token.
     
+    The user row is served from the principal cache when possible; the
+    cached instance is detached, so treat it as read-only.
+    
     Args:
         token: JWT token from Authorization header
         session: Database session
@@ -27,42 +67,41 @@ def get_current_user(
     Raises:
         HTTPException: If token is invalid or user not found
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    
-    try:
-        # Decode token
-        payload = jwt.decode(
-            token,
-            settings.JWT_SECRET,
-            algorithms=[settings.JWT_ALGORITHM]
-        )
+    with measure("auth"):
+        email = _get_token_subject(token)
+        bind_principal(session, email)
         
-        # Extract email
-        email: str | None = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-            
-    except JWTError:
-        raise credentials_exception
-    
-    # Find user in database
-    statement = select(User).where(User.email == email)
-    user = session.exec(statement).first()
-    
-    if user is None:
-        raise credentials_exception
-    
-    if not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="User account is disabled"
-        )
-    
-    return user
+        user = principal_cache.get(email)
+        if user is None:
+            # Taken before the read: an invalidation in between drops the fill
+            generation = principal_cache.generation()
+            # Find user in database
+            statement = select(User).where(User.email == email)
+            user = session.exec(statement).first()
+            if user is not None:
+                principal_cache.set(email, user, generation)
+        
+        return _ensure_active(user)
+
+
+async def get_async_current_user(
+    token: str = Depends(oauth2_scheme),
+    session: AsyncSession = Depends(get_async_session)
+) -> User:
+    """Async variant of get_current_user (DB_MODE=async)."""
+    with measure("auth"):
+        email = _get_token_subject(token)
+        bind_principal(session, email)
+        
+        user = principal_cache.get(email)
+        if user is None:
+            generation = principal_cache.generation()
+            statement = select(User).where(User.email == email)
+            user = (await session.exec(statement)).first()
+            if user is not None:
+                principal_cache.set(email, user, generation)
+        
+        return _ensure_active(user)
 
 
 def get_current_admin(
@@ -86,3 +125,10 @@ def get_current_admin(
             detail="Admin access required"
         )
     return current_user
+
+
+async def get_async_current_admin(
+    current_user: User = Depends(get_async_current_user)
+) -> User:
+    """Async variant of get_current_admin (DB_MODE=async)."""
+    return get_current_admin(current_user)
@@ -8,10 +8,12 @@ from datetime import timedelta
 from app.db.session import get_session
 from app.db.models import User
 from app.users.schemas import UserCreate, UserRead
-from app.core.security import verify_password, create_access_token, hash_password
+from app.core.security import create_access_token
+from app.core.hashing import hashing_service
 from app.core.config import settings
+from app.core.timing import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
@@ -36,7 +38,7 @@ def register(
         )
     
     # Hash password
-    hashed_password = hash_password(user_data.password)
+    hashed_password = hashing_service.hash(user_data.password)
     
     # Create user
     user = User(
@@ -73,7 +75,7 @@ def login(
         )
     
     # Verify password
-    if not verify_password(form_data.password, user.hashed_password):
+    if not hashing_service.verify(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
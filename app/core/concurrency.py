@@ -0,0 +1,101 @@
+"""Optimistic concurrency helpers: version ETags and If-Match preconditions."""
+
+from datetime import datetime, timedelta
+from typing import NoReturn
+
+from fastapi import HTTPException, status
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def version_etag(version: int, created_at: datetime) -> str:
+    """
+    Strong ETag of a versioned row (post, user).
+
+    The version alone doesn't identify a row: SQLite reuses the id of a
+    deleted highest-id row, and the new row starts again at version 1. The
+    row's creation time (microseconds since the epoch, in hex) tells them
+    apart.
+
+    Args:
+        version: Row version
+        created_at: Row creation time (naive UTC)
+
+    Returns:
+        ETag header value, e.g. `"v3.63f1c2a4b5d6e"`
+    """
+    return f'"v{version}.{(created_at - _EPOCH) // _MICROSECOND:x}"'
+
+
+def _parse_version_etag(candidate: str) -> tuple[int, datetime] | None:
+    """(version, created_at) of an ETag made by version_etag, else None."""
+    if not (candidate.startswith('"v') and candidate.endswith('"')):
+        return None
+    version, _, created = candidate[2:-1].partition(".")
+    try:
+        return int(version), _EPOCH + int(created, 16) * _MICROSECOND
+    except (ValueError, OverflowError):
+        return None
+
+
+def if_match_versions(if_match: str | None) -> list[tuple[int, datetime]] | None:
+    """
+    Row versions an `If-Match` header accepts.
+
+    If-Match uses strong comparison, so weak ETags and ETags not made by
+    version_etag match no version.
+
+    Args:
+        if_match: If-Match header value
+
+    Returns:
+        Accepted (version, created_at) pairs (possibly none), or None
+        without a header or with `*` (any current version)
+    """
+    if not if_match:
+        return None
+    candidates = [candidate.strip() for candidate in if_match.split(",")]
+    if "*" in candidates:
+        return None
+    parsed = (_parse_version_etag(candidate) for candidate in candidates)
+    return [version for version in parsed if version is not None]
+
+
+def raise_version_conflict(
+    current_version: int,
+    created_at: datetime,
+    if_match: list[tuple[int, datetime]] | None,
+    expected_version: int | None
+) -> NoReturn:
+    """
+    Reject a conditional update whose row had another version.
+
+    Args:
+        current_version: Version of the row now
+        created_at: Creation time of the row
+        if_match: Versions accepted by If-Match, see if_match_versions
+        expected_version: Version given in the request body
+
+    Raises:
+        HTTPException: 412 if If-Match doesn't accept the current version,
+            409 otherwise (the body version is stale, or the row changed
+            again since it was checked)
+    """
+    headers = {"ETag": version_etag(current_version, created_at)}
+    if if_match is not None and (current_version, created_at) not in if_match:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=f"Resource has changed (now version {current_version})",
+            headers=headers
+        )
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=(
+            f"Resource was modified concurrently (version {expected_version} "
+            f"expected, now {current_version})"
+            if expected_version is not None
+            else "Resource was modified concurrently"
+        ),
+        headers=headers
+    )
@@ -11,16 +11,90 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    DB_MODE: Literal["sync", "async"] = "sync"  # Which router stack to serve
+    ASYNC_DATABASE_URL: str | None = None  # Default: DATABASE_URL with async driver
+    DB_ECHO: bool = False  # Log every SQL statement
+    
+    # Read replicas (GET endpoints); empty = everything on the primary
+    DATABASE_REPLICA_URLS: list[str] = []
+    ASYNC_DATABASE_REPLICA_URLS: list[str] = []  # Default: replica URLs with async driver
+    REPLICA_STRATEGY: Literal["round_robin", "least_connections"] = "round_robin"
+    READ_YOUR_WRITES_SECONDS: float = 5  # Keep a writer's reads on the primary
+    
+    # Connection pool (per worker process)
+    DB_POOL_SIZE: int = 5  # Connections kept open
+    DB_MAX_OVERFLOW: int = 10  # Extra connections opened under load
+    DB_POOL_TIMEOUT: float = 30  # Seconds to wait for a connection
+    DB_POOL_RECYCLE: int = 3600  # Seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True  # Test connections on checkout
+    DB_POOL_USE_LIFO: bool = False  # Reuse hottest connection, let idle ones expire
     
     # Security
     JWT_SECRET: str
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    JWT_DECODE_CACHE_SIZE: int = 10_000  # Verified tokens to memoize, 0 disables
+    
+    # Password hashing pool
+    HASH_POOL_WORKERS: int | None = None  # Default: CPU count, 0 = hash inline
+    HASH_POOL_MAX_PENDING: int = 64  # Queued + running hashes before 503
+    HASH_POOL_RETRY_AFTER: int = 1  # Seconds, sent in Retry-After on 503
+    
+    # Authenticated principal cache (per worker, 0 disables)
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10_000
+    
+    # Response cache for public post reads
+    RESPONSE_CACHE_BACKEND: Literal["memory", "redis", "fake", "none"] = "memory"
+    RESPONSE_CACHE_URL: str | None = None  # redis:// URL for the redis backend
+    RESPONSE_CACHE_MAX_ENTRIES: int = 10_000  # Memory backend only
+    RESPONSE_CACHE_TTL_SECONDS: float = 60  # Bounds staleness across workers
+    
+    # Bulk endpoints
+    POST_BULK_MAX_ITEMS: int = 1000  # Posts per POST /api/posts/bulk request
+    USER_BULK_MAX_ITEMS: int = 1000  # Users per POST /api/users/bulk request
+    POST_LIST_MAX_LIMIT: int = 100  # Largest `limit` accepted by GET /api/posts
+    
+    # Rate limiting: token buckets per user (valid bearer token) or client IP
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: Literal["memory", "redis"] = "memory"  # memory = per worker
+    RATE_LIMIT_URL: str | None = None  # redis:// URL for the redis backend
+    RATE_LIMIT_MAX_KEYS: int = 100_000  # Memory backend only, LRU beyond that
+    RATE_LIMIT_IP_PER_SECOND: float = 20
+    RATE_LIMIT_IP_BURST: int = 40
+    RATE_LIMIT_USER_PER_SECOND: float = 10
+    RATE_LIMIT_USER_BURST: int = 20
+    RATE_LIMIT_AUTH_PER_MINUTE: float = 10  # Login/register per IP (bcrypt-bound)
+    RATE_LIMIT_AUTH_BURST: int = 5
+    RATE_LIMIT_TRUST_FORWARDED: bool = False  # Client IP from X-Forwarded-For
+    
+    # Load shedding: adaptive cap on in-flight requests (per worker)
+    LOAD_SHED_ENABLED: bool = True
+    LOAD_SHED_MAX_IN_FLIGHT: int = 100  # Cap when the pool is healthy
+    LOAD_SHED_MIN_IN_FLIGHT: int = 8  # Floor the cap never shrinks below
+    LOAD_SHED_POOL_WAIT_TARGET: float = 0.05  # Mean checkout wait (s) that shrinks the cap
+    LOAD_SHED_INTERVAL: float = 0.5  # Seconds between cap adjustments
+    LOAD_SHED_RETRY_AFTER: int = 1  # Seconds, sent in Retry-After on 503
     
     # Application
     APP_NAME: str = "FastAPI Production App"
     DEBUG: bool = False
     ENVIRONMENT: Literal["development", "staging", "production"] = "development"
+    SERVER_TIMING_ENABLED: bool = True  # Send per-phase Server-Timing header
+    STARTUP_WARMUP: bool = True  # Warm DB, hashing pool and crypto before serving
+    STARTUP_PROFILE: bool = False  # Log create_app/warmup step timings on startup
+    JSON_RESPONSE_ENCODER: Literal["stdlib", "pydantic", "orjson"] = "pydantic"  # orjson needs `pip install orjson`
+    
+    # Logging (queue + writer thread, started by the app lifespan)
+    LOG_LEVEL: Literal["DEBUG", "INFO", "WARNING", "ERROR"] = "INFO"  # `app.*` loggers
+    LOG_FORMAT: Literal["json", "text"] = "json"
+    LOG_QUEUE_SIZE: int = 10_000  # Records waiting for the writer; beyond that dropped
+    LOG_SAMPLE_RATE: float = 1.0  # Share of per-request INFO lines kept, by trace ID
+    
+    # Metrics
+    METRICS_ENABLED: bool = True  # Serve /metrics
+    METRICS_MULTIPROC_DIR: str | None = None  # Shared dir to aggregate workers
+    METRICS_FLUSH_INTERVAL: float = 5.0  # Seconds between snapshot writes
     
     # CORS
     CORS_ORIGINS: list[str] = ["http://localhost:3000"]
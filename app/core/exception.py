@@ -1,16 +1,27 @@
 """Exception handling for the application."""
 
-from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, Request, Response, status
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import IntegrityError
 import logging
 
+from app.core.hashing import HashingPoolSaturated
+from app.core.responses import default_response_class
+
 logger = logging.getLogger(__name__)
 
 
-def register_exception_handlers(app: FastAPI) -> None:
-    """Register global exception handlers."""
+def register_exception_handlers(
+    app: FastAPI,
+    response_class: type[Response] = default_response_class
+) -> None:
+    """
+    Register global exception handlers.
+    
+    Args:
+        app: Application to register them on
+        response_class: JSON response class the errors are rendered with
+    """
     
     @app.exception_handler(RequestValidationError)
     async def validation_exception_handler(
@@ -34,11 +45,13 @@ def register_exception_handlers(app: FastAPI) -> None:
             errors.append(error_dict)
         
         logger.error(
-            f"[{trace_id}] Validation error: {errors}",
+            "[%s] Validation error: %s",
+            trace_id,
+            errors,
             extra={"trace_id": trace_id}
         )
         
-        return JSONResponse(
+        return response_class(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             content={
                 "detail": errors,
@@ -55,7 +68,9 @@ def register_exception_handlers(app: FastAPI) -> None:
         trace_id = getattr(request.state, "trace_id", "unknown")
         
         logger.error(
-            f"[{trace_id}] Database integrity error: {str(exc)}",
+            "[%s] Database integrity error: %s",
+            trace_id,
+            exc,
             extra={"trace_id": trace_id}
         )
         
@@ -68,7 +83,7 @@ def register_exception_handlers(app: FastAPI) -> None:
         else:
             detail = "Database constraint violation"
         
-        return JSONResponse(
+        return response_class(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={
                 "detail": detail,
@@ -76,6 +91,29 @@ def register_exception_handlers(app: FastAPI) -> None:
             }
         )
     
+    @app.exception_handler(HashingPoolSaturated)
+    async def hashing_saturated_handler(
+        request: Request,
+        exc: HashingPoolSaturated
+    ):
+        """Shed auth load when the password hashing pool is full."""
+        trace_id = getattr(request.state, "trace_id", "unknown")
+        
+        logger.warning(
+            "[%s] Password hashing pool saturated",
+            trace_id,
+            extra={"trace_id": trace_id}
+        )
+        
+        return response_class(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={
+                "detail": "Server busy, retry later",
+                "trace_id": trace_id
+            },
+            headers={"Retry-After": str(exc.retry_after)}
+        )
+    
     @app.exception_handler(Exception)
     async def general_exception_handler(
         request: Request,
@@ -85,11 +123,13 @@ def register_exception_handlers(app: FastAPI) -> None:
         trace_id = getattr(request.state, "trace_id", "unknown")
         
         logger.exception(
-            f"[{trace_id}] Unhandled exception: {str(exc)}",
+            "[%s] Unhandled exception: %s",
+            trace_id,
+            exc,
             extra={"trace_id": trace_id}
         )
         
-        return JSONResponse(
+        return response_class(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={
                 "detail": "Internal server error",
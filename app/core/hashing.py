@@ -0,0 +1,226 @@
+"""Bounded process pool for bcrypt hashing and verification."""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable
+
+from app.core.config import settings
+from app.core.passwords import hash_password, hash_passwords, load_backend, verify_password
+from app.core.timing import measure
+
+# Upper bounds (seconds) of the hash latency histogram
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Passwords per pool task in hash_many: big enough to amortize the IPC,
+# small enough that a login queued behind a chunk waits about a second
+BULK_CHUNK_SIZE = 4
+
+
+class HashingPoolSaturated(Exception):
+    """Raised when too many hashes are already queued; maps to 503."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Password hashing pool is saturated")
+        self.retry_after = retry_after
+
+
+class HashingService:
+    """
+    Runs bcrypt in worker processes so it doesn't hold the GIL of the
+    process serving requests.
+
+    At most `max_pending` hashes may be queued or running at once; beyond
+    that calls fail fast with HashingPoolSaturated instead of piling up.
+    With `max_workers=0` hashing runs inline (no pool).
+    """
+
+    def __init__(self, max_workers: int, max_pending: int, retry_after: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.retry_after = retry_after
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._rejected = 0
+        self._latency_buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self._latency_sum = 0.0
+        self._latency_count = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Created on first use so each uvicorn worker owns its own pool
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+        return self._executor
+
+    def _record(self, elapsed: float) -> None:
+        with self._lock:
+            self._latency_buckets[bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+            self._latency_sum += elapsed
+            self._latency_count += 1
+
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise HashingPoolSaturated(self.retry_after)
+            self._pending += 1
+
+        started = time.perf_counter()
+
+        def _done(_: Future) -> None:
+            with self._lock:
+                self._pending -= 1
+            self._record(time.perf_counter() - started)
+
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(_done)
+        return future
+
+    def _run_inline(self, fn: Callable[..., Any], *args: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self._record(time.perf_counter() - started)
+
+    def hash(self, password: str) -> str:
+        """Hash a password, blocking the calling thread (sync handlers)."""
+        with measure("hash"):
+            if not self.max_workers:
+                return self._run_inline(hash_password, password)
+            return self._submit(hash_password, password).result()
+
+    def _chunks(self, passwords: list[str]) -> list[list[str]]:
+        return [
+            passwords[start:start + BULK_CHUNK_SIZE]
+            for start in range(0, len(passwords), BULK_CHUNK_SIZE)
+        ]
+
+    def hash_many(self, passwords: list[str]) -> list[str]:
+        """
+        Hash many passwords across the pool, blocking the calling thread.
+        
+        Keeps at most one chunk per worker in flight, so bulk imports use
+        every core without queueing ahead of interactive logins.
+        """
+        with measure("hash"):
+            if not self.max_workers:
+                return self._run_inline(hash_passwords, passwords)
+            hashed: list[str] = []
+            window: deque[Future] = deque()
+            for chunk in self._chunks(passwords):
+                if len(window) >= self.max_workers:
+                    hashed.extend(window.popleft().result())
+                window.append(self._submit(hash_passwords, chunk))
+            while window:
+                hashed.extend(window.popleft().result())
+            return hashed
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password, blocking the calling thread (sync handlers)."""
+        with measure("hash"):
+            if not self.max_workers:
+                return self._run_inline(verify_password, plain_password, hashed_password)
+            return self._submit(verify_password, plain_password, hashed_password).result()
+
+    async def hash_async(self, password: str) -> str:
+        """Hash a password without blocking the event loop (async handlers)."""
+        with measure("hash"):
+            if not self.max_workers:
+                return await asyncio.to_thread(self._run_inline, hash_password, password)
+            return await asyncio.wrap_future(self._submit(hash_password, password))
+
+    async def hash_many_async(self, passwords: list[str]) -> list[str]:
+        """Hash many passwords without blocking the event loop, see hash_many."""
+        with measure("hash"):
+            if not self.max_workers:
+                return await asyncio.to_thread(self._run_inline, hash_passwords, passwords)
+            hashed: list[str] = []
+            window: deque[Future] = deque()
+            for chunk in self._chunks(passwords):
+                if len(window) >= self.max_workers:
+                    hashed.extend(await asyncio.wrap_future(window.popleft()))
+                window.append(self._submit(hash_passwords, chunk))
+            while window:
+                hashed.extend(await asyncio.wrap_future(window.popleft()))
+            return hashed
+
+    async def verify_async(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password without blocking the event loop (async handlers)."""
+        with measure("hash"):
+            if not self.max_workers:
+                return await asyncio.to_thread(
+                    self._run_inline, verify_password, plain_password, hashed_password
+                )
+            return await asyncio.wrap_future(
+                self._submit(verify_password, plain_password, hashed_password)
+            )
+
+    def stats(self) -> dict[str, Any]:
+        """Snapshot of queue depth, rejections and the latency histogram."""
+        with self._lock:
+            cumulative, buckets = 0, {}
+            for bound, count in zip(LATENCY_BUCKETS, self._latency_buckets):
+                cumulative += count
+                buckets[bound] = cumulative
+            return {
+                "workers": self.max_workers,
+                "queue_depth": self._pending,
+                "max_pending": self.max_pending,
+                "rejected_total": self._rejected,
+                "latency_seconds": {
+                    "buckets": buckets,
+                    "sum": self._latency_sum,
+                    "count": self._latency_count,
+                },
+            }
+
+    def warmup(self) -> None:
+        """
+        Start the worker processes and load bcrypt in each, so the first
+        logins don't wait for a process spawn (called on startup).
+        """
+        if self.max_workers == 0:
+            load_backend()
+            return
+
+        executor = self._get_executor()
+        # Spawned pools start a worker per task submitted while none is idle
+        futures = [executor.submit(load_backend) for _ in range(self.max_workers)]
+        for future in futures:
+            future.result()
+
+    def shutdown(self) -> None:
+        """Stop the worker processes (called on application shutdown)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Singleton instance
+hashing_service = HashingService(
+    max_workers=(
+        os.cpu_count() or 1
+        if settings.HASH_POOL_WORKERS is None
+        else settings.HASH_POOL_WORKERS
+    ),
+    max_pending=settings.HASH_POOL_MAX_PENDING,
+    retry_after=settings.HASH_POOL_RETRY_AFTER,
+)
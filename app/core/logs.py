@@ -0,0 +1,183 @@
+"""Non-blocking, structured logging: a queue drained by a writer thread."""
+
+import json
+import logging
+import queue
+import sys
+import zlib
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import TextIO
+
+from app.core.config import settings
+
+# Loggers that write per-request lines; routed through the queue as well
+UVICORN_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+
+# LogRecord attributes that aren't caller-supplied `extra` fields
+_RECORD_ATTRS = frozenset(logging.makeLogRecord({}).__dict__) | {"message", "asctime"}
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    One JSON object per line: timestamp, level, logger, message, then any
+    `extra` fields (trace_id, timings, ...) and the exception, if any.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep `rate` of the INFO-and-below records that carry a trace_id.
+
+    The decision is a hash of the trace ID, so a request's lines are kept
+    or dropped together. Warnings and errors are always kept.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.threshold = int(rate * 2**32)
+        self.sampled_out = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        trace_id = getattr(record, "trace_id", None)
+        if trace_id is None or record.levelno > logging.INFO:
+            return True
+        if zlib.crc32(str(trace_id).encode()) < self.threshold:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler that never blocks the caller and formats nothing.
+
+    When the queue is full the record is dropped and counted. The stock
+    prepare() renders the message (and traceback) in the caller's thread;
+    here that is left to the writer thread, so `%`-style arguments must
+    not be mutated after the logging call.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _DrainingQueueListener(QueueListener):
+    """QueueListener whose stop() waits for room instead of raising queue.Full."""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+class LogPipeline:
+    """
+    Routes the root logger (and uvicorn's loggers) through a bounded queue
+    to a background thread that formats and writes the records. LOG_LEVEL
+    sets the level of the `app` loggers; libraries keep theirs.
+
+    Request-handling code only pays for building a LogRecord and a
+    non-blocking put: no formatting, no I/O, no stream lock contention.
+    Started and stopped by the app lifespan; stop() drains the queue.
+    """
+
+    def __init__(
+        self,
+        level: str,
+        json_format: bool,
+        queue_size: int,
+        sample_rate: float,
+        stream: TextIO | None = None,
+    ):
+        self.level = level
+        self.json_format = json_format
+        self.stream = stream  # Default: sys.stderr
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.handler = DroppingQueueHandler(self.queue)
+        self.sampling = SamplingFilter(sample_rate)
+        self.handler.addFilter(self.sampling)
+        self._listener: _DrainingQueueListener | None = None
+        self._saved: dict[str, tuple[list[logging.Handler], bool]] = {}
+        self._app_level = logging.NOTSET
+
+    def start(self) -> None:
+        if self._listener is not None:
+            return
+
+        writer = logging.StreamHandler(self.stream or sys.stderr)
+        writer.setFormatter(
+            JSONFormatter()
+            if self.json_format
+            else logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s")
+        )
+        self._listener = _DrainingQueueListener(self.queue, writer)
+        self._listener.start()
+
+        # LOG_LEVEL applies to our own loggers; raising the root level would
+        # also switch on SQLAlchemy's per-statement INFO logging
+        app_logger = logging.getLogger("app")
+        self._app_level = app_logger.level
+        app_logger.setLevel(self.level)
+        logging.getLogger().addHandler(self.handler)
+        for name in UVICORN_LOGGERS:
+            logger = logging.getLogger(name)
+            self._saved[name] = (logger.handlers[:], logger.propagate)
+            logger.handlers = []
+            logger.propagate = True
+
+    def stop(self) -> None:
+        if self._listener is None:
+            return
+
+        logging.getLogger().removeHandler(self.handler)
+        logging.getLogger("app").setLevel(self._app_level)
+        for name, (handlers, propagate) in self._saved.items():
+            logger = logging.getLogger(name)
+            logger.handlers = handlers
+            logger.propagate = propagate
+        self._saved.clear()
+
+        # Writes whatever is still queued, then joins the thread
+        self._listener.stop()
+        self._listener = None
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "queue_depth": self.queue.qsize(),
+            "dropped_total": self.handler.dropped,
+            "sampled_out_total": self.sampling.sampled_out,
+        }
+
+
+# Singleton instance
+log_pipeline = LogPipeline(
+    level=settings.LOG_LEVEL,
+    json_format=settings.LOG_FORMAT == "json",
+    queue_size=settings.LOG_QUEUE_SIZE,
+    sample_rate=settings.LOG_SAMPLE_RATE,
+)
@@ -0,0 +1,385 @@
+"""Prometheus text-format metrics, collected in-process."""
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.auth.cache import principal_cache
+from app.core.hashing import LATENCY_BUCKETS, hashing_service
+from app.core.logs import log_pipeline
+from app.core.response_cache import response_cache
+from app.db.pool import WAIT_BUCKETS, monitored_engines, pool_status
+from app.middlewares.rate_limit import load_shedder, rate_limiter
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds (seconds) of the request latency histogram
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# name -> (type, help, histogram buckets)
+METRICS: dict[str, tuple[str, str, tuple[float, ...]]] = {
+    "http_requests_total": (
+        "counter", "HTTP requests by method, route and status code", ()),
+    "http_request_duration_seconds": (
+        "histogram", "HTTP request latency by method and route", DURATION_BUCKETS),
+    "http_requests_in_flight": (
+        "gauge", "HTTP requests currently being served", ()),
+    "http_requests_rate_limited_total": (
+        "counter", "Requests rejected with 429 by the rate limiter", ()),
+    "http_requests_shed_total": (
+        "counter", "Requests rejected with 503 by the load shedder", ()),
+    "load_shed_in_flight_limit": (
+        "gauge", "Current adaptive cap on requests in flight", ()),
+    "db_pool_size": (
+        "gauge", "Configured connection pool size", ()),
+    "db_pool_checked_out": (
+        "gauge", "Connections currently checked out of the pool", ()),
+    "db_pool_overflow": (
+        "gauge", "Connections open beyond the pool size", ()),
+    "db_pool_checkouts_total": (
+        "counter", "Connection checkouts", ()),
+    "db_pool_waits_total": (
+        "counter", "Checkouts that found the pool exhausted and had to wait", ()),
+    "db_pool_timeouts_total": (
+        "counter", "Checkouts that timed out waiting for a connection", ()),
+    "db_pool_wait_seconds": (
+        "histogram", "Time checkouts spent waiting for a connection", WAIT_BUCKETS),
+    "password_hash_queue_depth": (
+        "gauge", "Password hashes queued or running", ()),
+    "password_hash_rejected_total": (
+        "counter", "Password hashes rejected because the pool was saturated", ()),
+    "password_hash_duration_seconds": (
+        "histogram", "Password hash/verify latency including queueing", LATENCY_BUCKETS),
+    "principal_cache_hits_total": (
+        "counter", "Principal cache hits", ()),
+    "principal_cache_misses_total": (
+        "counter", "Principal cache misses", ()),
+    "principal_cache_evictions_total": (
+        "counter", "Principal cache LRU evictions", ()),
+    "response_cache_hits_total": (
+        "counter", "Post responses served from the response cache", ()),
+    "response_cache_misses_total": (
+        "counter", "Post responses rendered from the database", ()),
+    "response_cache_not_modified_total": (
+        "counter", "Post responses answered with 304 Not Modified", ()),
+    "log_queue_depth": (
+        "gauge", "Log records waiting for the writer thread", ()),
+    "log_records_dropped_total": (
+        "counter", "Log records dropped because the log queue was full", ()),
+    "log_records_sampled_out_total": (
+        "counter", "Request log records skipped by LOG_SAMPLE_RATE", ()),
+}
+
+
+def _labels(**labels: Any) -> str:
+    """Render labels as `k="v",...` with exposition-format escaping."""
+    return ",".join(
+        '{}="{}"'.format(
+            key,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for key, value in labels.items()
+    )
+
+
+class HTTPMetrics:
+    """
+    Request counters and latency histograms.
+
+    Only mutated by MetricsMiddleware on the event loop thread, so
+    recording is plain dict/list arithmetic without locks.
+    """
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.requests: dict[str, int] = {}
+        # labels -> [non-cumulative bucket counts..., +Inf count, sum]
+        self.durations: dict[str, list[float]] = {}
+
+    def observe(self, method: str, route: str, status: int, seconds: float) -> None:
+        key = _labels(method=method, route=route, status=status)
+        self.requests[key] = self.requests.get(key, 0) + 1
+
+        key = _labels(method=method, route=route)
+        histogram = self.durations.get(key)
+        if histogram is None:
+            histogram = self.durations[key] = [0] * (len(DURATION_BUCKETS) + 2)
+        histogram[bisect_left(DURATION_BUCKETS, seconds)] += 1
+        histogram[-1] += seconds
+
+
+http_metrics = HTTPMetrics()
+
+
+class MetricsMiddleware:
+    """Record per-route request counts, latency and in-flight requests."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_metrics.in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_metrics.in_flight -= 1
+            # Label by route template, not raw path, to bound cardinality
+            route = scope.get("route")
+            http_metrics.observe(
+                scope["method"],
+                route.path if route is not None else "unmatched",
+                status_code,
+                time.perf_counter() - started,
+            )
+
+
+def _cumulative(counts: list[float]) -> list[float]:
+    total, result = 0, []
+    for count in counts:
+        total += count
+        result.append(total)
+    return result
+
+
+def collect() -> dict[str, dict[str, dict[str, Any]]]:
+    """
+    Snapshot every metric of this process.
+
+    Shape: {type: {metric: {labels: value}}}, histogram values being
+    {"buckets": [cumulative counts per bound], "sum": s, "count": n}.
+    """
+    counters: dict[str, dict[str, Any]] = {}
+    gauges: dict[str, dict[str, Any]] = {}
+    histograms: dict[str, dict[str, Any]] = {}
+
+    counters["http_requests_total"] = dict(http_metrics.requests)
+    gauges["http_requests_in_flight"] = {"": http_metrics.in_flight}
+    histograms["http_request_duration_seconds"] = {
+        key: {
+            "buckets": _cumulative(values[:len(DURATION_BUCKETS)]),
+            "sum": values[-1],
+            "count": sum(values[:-1]),
+        }
+        for key, values in list(http_metrics.durations.items())
+    }
+
+    if rate_limiter is not None:
+        counters["http_requests_rate_limited_total"] = {"": rate_limiter.limited}
+    if load_shedder is not None:
+        counters["http_requests_shed_total"] = {"": load_shedder.shed}
+        gauges["load_shed_in_flight_limit"] = {"": load_shedder.limit}
+
+    for name, engine in monitored_engines.items():
+        status = pool_status(engine.pool)
+        if not status:
+            continue
+        key = _labels(engine=name)
+        gauges.setdefault("db_pool_size", {})[key] = status["size"]
+        gauges.setdefault("db_pool_checked_out", {})[key] = status["checked_out"]
+        gauges.setdefault("db_pool_overflow", {})[key] = status["overflow"]
+        if "waits" in status:
+            counters.setdefault("db_pool_checkouts_total", {})[key] = status["checkouts"]
+            counters.setdefault("db_pool_waits_total", {})[key] = status["waits"]
+            counters.setdefault("db_pool_timeouts_total", {})[key] = status["timeouts"]
+            wait = status["wait_seconds"]
+            histograms.setdefault("db_pool_wait_seconds", {})[key] = {
+                "buckets": list(wait["buckets"].values()),
+                "sum": wait["sum"],
+                "count": wait["count"],
+            }
+
+    hashing = hashing_service.stats()
+    gauges["password_hash_queue_depth"] = {"": hashing["queue_depth"]}
+    counters["password_hash_rejected_total"] = {"": hashing["rejected_total"]}
+    latency = hashing["latency_seconds"]
+    histograms["password_hash_duration_seconds"] = {
+        "": {
+            "buckets": list(latency["buckets"].values()),
+            "sum": latency["sum"],
+            "count": latency["count"],
+        }
+    }
+
+    cache = principal_cache.stats()
+    counters["principal_cache_hits_total"] = {"": cache["hits"]}
+    counters["principal_cache_misses_total"] = {"": cache["misses"]}
+    counters["principal_cache_evictions_total"] = {"": cache["evictions"]}
+
+    responses = response_cache.stats()
+    counters["response_cache_hits_total"] = {"": responses["hits"]}
+    counters["response_cache_misses_total"] = {"": responses["misses"]}
+    counters["response_cache_not_modified_total"] = {"": responses["not_modified"]}
+
+    logs = log_pipeline.stats()
+    gauges["log_queue_depth"] = {"": logs["queue_depth"]}
+    counters["log_records_dropped_total"] = {"": logs["dropped_total"]}
+    counters["log_records_sampled_out_total"] = {"": logs["sampled_out_total"]}
+
+    return {"counter": counters, "gauge": gauges, "histogram": histograms}
+
+
+def render(snapshot: dict[str, dict[str, dict[str, Any]]]) -> str:
+    """Render a snapshot in the Prometheus text exposition format."""
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        samples = snapshot[kind].get(name)
+        if not samples:
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for key, value in sorted(samples.items()):
+            if kind != "histogram":
+                lines.append(f"{name}{{{key}}} {value}" if key else f"{name} {value}")
+                continue
+            prefix = f"{key}," if key else ""
+            for bound, count in zip(buckets, value["buckets"]):
+                lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {count}')
+            lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {value["count"]}')
+            suffix = f"{{{key}}}" if key else ""
+            lines.append(f"{name}_sum{suffix} {value['sum']}")
+            lines.append(f"{name}_count{suffix} {value['count']}")
+    return "\n".join(lines) + "\n"
+
+
+# --- Multi-process aggregation -------------------------------------------
+#
+# With several uvicorn workers each process only sees its own requests.
+# When METRICS_MULTIPROC_DIR is set, every worker periodically writes its
+# snapshot to <dir>/metrics-<pid>-<token>.json and /metrics merges all
+# files: counters and histograms are summed over every file (including
+# workers that have exited, so totals never go backwards), gauges only over
+# live workers. The token is random per process, so a worker reusing a
+# dead worker's PID doesn't overwrite its file. Clear the directory when
+# the deployment (re)starts.
+
+# (pid, token) of this process; regenerated in forked children
+_process_token: tuple[int, str] = (os.getpid(), uuid.uuid4().hex[:12])
+
+
+def _snapshot_name() -> str:
+    """This process's snapshot file name."""
+    global _process_token
+    if _process_token[0] != os.getpid():
+        _process_token = (os.getpid(), uuid.uuid4().hex[:12])
+    pid, token = _process_token
+    return f"metrics-{pid}-{token}.json"
+
+
+def write_snapshot(directory: str, snapshot: dict[str, Any]) -> None:
+    """Atomically write this process's snapshot into `directory`."""
+    path = Path(directory) / _snapshot_name()
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(snapshot))
+    os.replace(tmp, path)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def merge_snapshots(directory: str, own: dict[str, Any]) -> dict[str, Any]:
+    """Merge `own` with the snapshots other workers wrote to `directory`."""
+    snapshots = [own]
+    own_name = _snapshot_name()
+    for path in Path(directory).glob("metrics-*.json"):
+        if path.name == own_name:
+            continue
+        pid = int(path.stem.split("-")[1])
+        try:
+            snapshot = json.loads(path.read_text())
+        except (OSError, ValueError):
+            logger.warning("Skipping unreadable metrics snapshot %s", path)
+            continue
+        # Our PID with another token: a dead worker whose PID we reused
+        if pid == os.getpid() or not _pid_alive(pid):
+            snapshot["gauge"] = {}
+        snapshots.append(snapshot)
+
+    merged: dict[str, dict[str, dict[str, Any]]] = {
+        "counter": {}, "gauge": {}, "histogram": {},
+    }
+    for snapshot in snapshots:
+        for kind in ("counter", "gauge"):
+            for name, samples in snapshot[kind].items():
+                target = merged[kind].setdefault(name, {})
+                for key, value in samples.items():
+                    target[key] = target.get(key, 0) + value
+        for name, samples in snapshot["histogram"].items():
+            target = merged["histogram"].setdefault(name, {})
+            for key, value in samples.items():
+                if key not in target:
+                    target[key] = {
+                        "buckets": list(value["buckets"]),
+                        "sum": value["sum"],
+                        "count": value["count"],
+                    }
+                    continue
+                existing = target[key]
+                existing["buckets"] = [
+                    a + b for a, b in zip(existing["buckets"], value["buckets"])
+                ]
+                existing["sum"] += value["sum"]
+                existing["count"] += value["count"]
+    return merged
+
+
+async def exposition(multiproc_dir: str | None) -> str:
+    """Build the /metrics response body."""
+    # Snapshot on the event loop, where the counters are mutated
+    snapshot = collect()
+    if not multiproc_dir:
+        return render(snapshot)
+
+    def _aggregate() -> str:
+        write_snapshot(multiproc_dir, snapshot)
+        return render(merge_snapshots(multiproc_dir, snapshot))
+
+    return await asyncio.to_thread(_aggregate)
+
+
+async def run_snapshot_writer(directory: str, interval: float) -> None:
+    """Background task: keep this worker's snapshot file fresh."""
+    os.makedirs(directory, exist_ok=True)
+    while True:
+        await asyncio.sleep(interval)
+        snapshot = collect()
+        try:
+            await asyncio.to_thread(write_snapshot, directory, snapshot)
+        except OSError:
+            logger.exception("Failed to write metrics snapshot to %s", directory)
+
+
+def write_final_snapshot(directory: str) -> None:
+    """On shutdown: keep this worker's counters, drop its gauges."""
+    snapshot = collect()
+    snapshot["gauge"] = {}
+    write_snapshot(directory, snapshot)
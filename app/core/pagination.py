@@ -0,0 +1,86 @@
+"""Opaque cursor helpers for keyset pagination."""
+
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """
+    Encode a keyset position into an opaque, URL-safe cursor token.
+
+    Args:
+        created_at: Sort key of the last row on the page
+        id: Tie-breaker of the last row on the page
+
+    Returns:
+        Cursor string to hand back to the client
+    """
+    raw = json.dumps([created_at.isoformat(), id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string from the client
+
+    Returns:
+        (created_at, id) keyset position
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def encode_rank_cursor(score: float, id: int) -> str:
+    """
+    Encode a position in relevance-ranked results (score desc, id desc).
+
+    Args:
+        score: Relevance score of the last row on the page
+        id: Tie-breaker of the last row on the page
+
+    Returns:
+        Cursor string to hand back to the client
+    """
+    # repr round-trips floats exactly, so the next page resumes on the same score
+    raw = json.dumps([score, id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_rank_cursor(cursor: str) -> tuple[float, int]:
+    """
+    Decode a cursor produced by encode_rank_cursor.
+
+    Args:
+        cursor: Cursor string from the client
+
+    Returns:
+        (score, id) position
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        score, id = json.loads(base64.urlsafe_b64decode(padded))
+        return float(score), int(id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
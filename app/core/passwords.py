@@ -0,0 +1,68 @@
+"""
+Password hashing with bcrypt.
+
+Deliberately free of settings and web framework imports: the hashing
+pool's worker processes import this module (not app.core.security) to
+run these functions, and every new worker pays that import before it can
+serve its first login.
+"""
+
+from functools import cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+
+@cache
+def password_context() -> "CryptContext":
+    """bcrypt context, built on first use (importing passlib takes ~25ms)."""
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def load_backend() -> None:
+    """Import passlib and load the bcrypt backend, without hashing anything."""
+    password_context().handler("bcrypt").get_backend()
+
+
+def hash_password(password: str) -> str:
+    """
+    Hash a password using bcrypt.
+
+    Args:
+        password: Plain text password
+
+    Returns:
+        Hashed password string
+    """
+    return password_context().hash(password)
+
+
+def hash_passwords(passwords: list[str]) -> list[str]:
+    """
+    Hash several passwords (one hashing pool task for a bulk import).
+
+    Args:
+        passwords: Plain text passwords
+
+    Returns:
+        Hashed password strings, in the same order
+    """
+    context = password_context()
+    return [context.hash(password) for password in passwords]
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password against its hash.
+
+    Args:
+        plain_password: Plain text password from user
+        hashed_password: Stored hash from database
+
+    Returns:
+        True if password matches, False otherwise
+    """
+    return password_context().verify(plain_password, hashed_password)
@@ -0,0 +1,353 @@
+"""Cache of serialized responses with strong ETags and tag invalidation."""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Iterable, Protocol
+
+from fastapi import Response, status
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """Serialized JSON body and its strong ETag."""
+    body: bytes
+    etag: str
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag derived from the response bytes."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> CachedResponse | None: ...
+
+    def generation(self) -> int: ...
+
+    def set(
+        self, key: str, entry: CachedResponse, tags: Iterable[str], generation: int | None
+    ) -> None: ...
+
+    def invalidate(self, tags: Iterable[str]) -> None: ...
+
+
+class MemoryBackend:
+    """
+    In-process LRU with TTL and a tag -> keys index.
+
+    Invalidations only reach the current worker; with several workers
+    use the shared backend, or accept up to TTL seconds of staleness.
+    Every invalidation bumps the generation; set() with an older one is
+    dropped, see ResponseCache.store.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, CachedResponse, tuple[str, ...]]] = OrderedDict()
+        self._tags: dict[str, set[str]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _drop(self, key: str) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def get(self, key: str) -> CachedResponse | None:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            if item[0] <= time.monotonic():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return item[1]
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def set(
+        self, key: str, entry: CachedResponse, tags: Iterable[str], generation: int | None
+    ) -> None:
+        tags = tuple(tags)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, entry, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            self._generation += 1
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._drop(key)
+
+
+class SharedClient(Protocol):
+    """Subset of the redis-py client API used by SharedBackend."""
+
+    def get(self, name: str) -> bytes | None: ...
+
+    def set(self, name: str, value: bytes, ex: int | None = None) -> Any: ...
+
+    def delete(self, *names: str) -> Any: ...
+
+    def sadd(self, name: str, *values: str) -> Any: ...
+
+    def smembers(self, name: str) -> Iterable[bytes]: ...
+
+    def expire(self, name: str, time: int) -> Any: ...
+
+    def incr(self, name: str) -> int: ...
+
+
+class SharedBackend:
+    """
+    Backend on a shared key-value store (Redis API), so every worker sees
+    the same entries and invalidations.
+
+    Entries are stored as `etag\\nbody`; each tag is a set of keys. The
+    generation is a counter bumped before each invalidation deletes keys.
+    """
+
+    PREFIX = "response-cache:"
+    GENERATION_KEY = PREFIX + "generation"
+
+    def __init__(self, client: SharedClient, ttl_seconds: float):
+        self.client = client
+        self.ttl = max(int(ttl_seconds), 1)
+
+    def get(self, key: str) -> CachedResponse | None:
+        raw = self.client.get(self.PREFIX + key)
+        if raw is None:
+            return None
+        etag, _, body = raw.partition(b"\n")
+        return CachedResponse(body=body, etag=etag.decode())
+
+    def generation(self) -> int:
+        return int(self.client.get(self.GENERATION_KEY) or 0)
+
+    def set(
+        self, key: str, entry: CachedResponse, tags: Iterable[str], generation: int | None
+    ) -> None:
+        if generation is not None and self.generation() != generation:
+            return
+        self.client.set(
+            self.PREFIX + key, entry.etag.encode() + b"\n" + entry.body, ex=self.ttl
+        )
+        for tag in tags:
+            tag_key = self.PREFIX + "tag:" + tag
+            self.client.sadd(tag_key, key)
+            self.client.expire(tag_key, self.ttl)
+        # An invalidation that bumped the generation after the check above
+        # may have read the tag sets before our key was added: undo
+        if generation is not None and self.generation() != generation:
+            self.client.delete(self.PREFIX + key)
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        self.client.incr(self.GENERATION_KEY)
+        for tag in tags:
+            tag_key = self.PREFIX + "tag:" + tag
+            keys = [self.PREFIX + member.decode() for member in self.client.smembers(tag_key)]
+            self.client.delete(*keys, tag_key)
+
+
+class LocalFakeClient:
+    """
+    In-process stand-in for a Redis client (RESPONSE_CACHE_BACKEND=fake).
+
+    Exercises SharedBackend locally and in tests without a server.
+    """
+
+    def __init__(self) -> None:
+        self._values: dict[str, tuple[Any, float | None]] = {}
+        self._lock = threading.Lock()
+
+    def _live(self, name: str) -> Any:
+        item = self._values.get(name)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._values[name]
+            return None
+        return value
+
+    def get(self, name: str) -> bytes | None:
+        with self._lock:
+            return self._live(name)
+
+    def set(self, name: str, value: bytes, ex: int | None = None) -> None:
+        with self._lock:
+            self._values[name] = (value, time.monotonic() + ex if ex else None)
+
+    def delete(self, *names: str) -> None:
+        with self._lock:
+            for name in names:
+                self._values.pop(name, None)
+
+    def sadd(self, name: str, *values: str) -> None:
+        with self._lock:
+            members = self._live(name) or set()
+            members.update(value.encode() for value in values)
+            expires_at = self._values.get(name, (None, None))[1]
+            self._values[name] = (members, expires_at)
+
+    def smembers(self, name: str) -> Iterable[bytes]:
+        with self._lock:
+            return set(self._live(name) or ())
+
+    def expire(self, name: str, time_seconds: int) -> None:
+        with self._lock:
+            value = self._live(name)
+            if value is not None:
+                self._values[name] = (value, time.monotonic() + time_seconds)
+
+    def incr(self, name: str) -> int:
+        with self._lock:
+            value = int(self._live(name) or 0) + 1
+            expires_at = self._values.get(name, (None, None))[1]
+            self._values[name] = (str(value).encode(), expires_at)
+            return value
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match uses weak comparison; `*` matches anything."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in (
+        candidate.removeprefix("W/") for candidate in candidates
+    )
+
+
+class ResponseCache:
+    """
+    Serves cached JSON bodies, answering `If-None-Match` with 304.
+
+    Usage in a handler:
+        cached = response_cache.lookup(key, if_none_match)
+        if cached is not None:
+            return cached
+        generation = response_cache.generation()
+        ... query ...
+        return response_cache.store(key, body, tags, if_none_match, generation=generation)
+
+    The generation taken before the query keeps a body read before a
+    concurrent write's invalidation from being cached after it.
+    """
+
+    def __init__(self, backend: CacheBackend | None):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()  # Handlers run on threadpool threads
+
+    def _respond(self, entry: CachedResponse, if_none_match: str | None, cache: str) -> Response:
+        headers = {"ETag": entry.etag, "Cache-Control": "no-cache", "X-Cache": cache}
+        if _etag_matches(if_none_match, entry.etag):
+            with self._lock:
+                self.not_modified += 1
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(entry.body, media_type="application/json", headers=headers)
+
+    def lookup(self, key: str, if_none_match: str | None = None) -> Response | None:
+        """Cached response for `key` (200 or 304), or None on a miss."""
+        if self.backend is None:
+            return None
+        entry = self.backend.get(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if entry is None:
+            return None
+        return self._respond(entry, if_none_match, "HIT")
+
+    def generation(self) -> int | None:
+        """Invalidation generation to pass to store(); take it before the query."""
+        if self.backend is None:
+            return None
+        return self.backend.generation()
+
+    def store(
+        self,
+        key: str,
+        body: bytes,
+        tags: Iterable[str],
+        if_none_match: str | None = None,
+        etag: str | None = None,
+        generation: int | None = None,
+    ) -> Response:
+        """
+        Cache `body` under `key`, tagged for invalidation, and respond.
+
+        `etag` defaults to make_etag(body); versioned resources pass their
+        version_etag so If-Match can name the version. With `generation`
+        (from generation()), the body is only cached if nothing was
+        invalidated since: it may predate a concurrent write. It is still
+        returned either way.
+        """
+        entry = CachedResponse(body=body, etag=etag or make_etag(body))
+        if self.backend is not None:
+            self.backend.set(key, entry, tags, generation)
+        return self._respond(entry, if_none_match, "MISS")
+
+    def invalidate(self, *tags: str) -> None:
+        """Drop every entry carrying any of `tags`."""
+        if self.backend is not None:
+            self.backend.invalidate(tags)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+            }
+
+
+def build_backend() -> CacheBackend | None:
+    """Backend selected by RESPONSE_CACHE_BACKEND."""
+    kind = settings.RESPONSE_CACHE_BACKEND
+    ttl = settings.RESPONSE_CACHE_TTL_SECONDS
+    if kind == "none":
+        return None
+    if kind == "memory":
+        return MemoryBackend(settings.RESPONSE_CACHE_MAX_ENTRIES, ttl)
+    if kind == "fake":
+        return SharedBackend(LocalFakeClient(), ttl)
+
+    try:
+        import redis
+    except ImportError:
+        raise RuntimeError(
+            "RESPONSE_CACHE_BACKEND=redis requires the redis package (pip install redis)"
+        )
+    if not settings.RESPONSE_CACHE_URL:
+        raise RuntimeError("RESPONSE_CACHE_BACKEND=redis requires RESPONSE_CACHE_URL")
+    return SharedBackend(redis.Redis.from_url(settings.RESPONSE_CACHE_URL), ttl)
+
+
+# Singleton instance
+response_cache = ResponseCache(build_backend())
@@ -0,0 +1,105 @@
+"""JSON response classes that render response models straight to bytes."""
+
+from typing import Annotated, Any, Callable
+
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+from app.core.config import settings
+
+
+class RawJSON(bytes):
+    """A body that is already serialized; FastJSONResponse sends it as is."""
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse with a faster encoder, which passes RawJSON through.
+
+    Route handlers hand it response models already rendered by
+    JSONBytesField; anything else (exception handlers, endpoints without
+    a response_model) goes through `encode`.
+    """
+
+    encode: Callable[[Any], bytes] = staticmethod(to_json)
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, RawJSON):
+            return content
+        return self.encode(content)
+
+
+class JSONBytesField:
+    """
+    Stand-in for a route's response field whose serialize() dumps the
+    validated model to JSON bytes in one pass (pydantic-core), instead of
+    building a JSON-compatible dict for json.dumps to walk again.
+
+    Validation, and so the filtering of fields not in the response_model,
+    is delegated to the original field unchanged.
+    """
+
+    def __init__(self, field: Any):
+        self.field = field
+        self.adapter = TypeAdapter(Annotated[field.field_info.annotation, field.field_info])
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.field, name)
+
+    def validate(self, *args: Any, **kwargs: Any) -> Any:
+        return self.field.validate(*args, **kwargs)
+
+    def serialize(self, value: Any, *, mode: str = "json", **options: Any) -> RawJSON:
+        return RawJSON(self.adapter.dump_json(value, **options))
+
+
+def json_bytes_field(field: Any, response_class: Any) -> Any:
+    """
+    Wrap a route's response field if its response class accepts RawJSON.
+
+    Args:
+        field: The route's response field, or None without a response_model
+        response_class: The route's response class (or its default placeholder)
+
+    Returns:
+        A JSONBytesField, or `field` unchanged
+    """
+    if isinstance(response_class, DefaultPlaceholder):
+        response_class = response_class.value
+    if (
+        field is None
+        or isinstance(field, JSONBytesField)
+        or not issubclass(response_class, FastJSONResponse)
+    ):
+        return field
+    return JSONBytesField(field)
+
+
+def build_response_class() -> type[JSONResponse]:
+    """Default response class selected by JSON_RESPONSE_ENCODER."""
+    encoder = settings.JSON_RESPONSE_ENCODER
+    if encoder == "stdlib":
+        return JSONResponse
+    if encoder == "pydantic":
+        return FastJSONResponse
+
+    try:
+        import orjson
+    except ImportError:
+        raise RuntimeError(
+            "JSON_RESPONSE_ENCODER=orjson requires the orjson package (pip install orjson)"
+        )
+
+    class ORJSONResponse(FastJSONResponse):
+        """FastJSONResponse encoding plain content with orjson."""
+
+        encode = staticmethod(orjson.dumps)
+
+    return ORJSONResponse
+
+
+# Response class used app-wide and by the exception handlers, unless
+# create_app is given another
+default_response_class = build_response_class()
@@ -1,38 +1,13 @@
-from passlib.context import CryptContext
-from jose import jwt, JWTError
+from jose import JWTError
+from jose.exceptions import ExpiredSignatureError
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from fastapi import HTTPException, status
 from app.core.config import settings
-
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
-def hash_password(password: str) -> str:
-    """
-    Hash a password using bcrypt.
-    
-    Args:
-        password: Plain text password
-        
-    Returns:
-        Hashed password string
-    """
-    return pwd_context.hash(password)
-
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """
-    Verify a password against its hash.
-    
-    Args:
-        plain_password: Plain text password from user
-        hashed_password: Stored hash from database
-        
-    Returns:
-        True if password matches, False otherwise
-    """
-    return pwd_context.verify(plain_password, hashed_password)
+from app.core.passwords import hash_password, hash_passwords, verify_password  # noqa: F401
+import hmac
+import threading
+import time
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
@@ -56,7 +31,9 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     
     to_encode.update({"exp": expire})
     
-    # Encode token
+    # Encode token (jose and its crypto backends load on first use)
+    from jose import jwt
+    
     encoded_jwt = jwt.encode(
         to_encode,
         settings.JWT_SECRET,
@@ -66,6 +43,79 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     return encoded_jwt
 
 
+class TokenVerifier:
+    """
+    JWT verifier that memoizes successfully verified tokens.
+    
+    Clients send the same token on every request until it expires, so the
+    HMAC check and JSON parsing only need to happen once per token. Entries
+    are keyed by the signature segment and also store the signed
+    header/payload, so a hit only counts if those bytes match too.
+    `exp` is checked again on every hit.
+    """
+    
+    def __init__(self, secret: str, algorithm: str, max_size: int):
+        self.secret = secret
+        self.algorithm = algorithm
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[str, dict, float | None]] = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _decode(self, token: str) -> dict:
+        from jose import jwt
+        
+        return jwt.decode(token, self.secret, algorithms=[self.algorithm])
+    
+    def verify(self, token: str) -> dict:
+        """
+        Verify a token and return a copy of its payload.
+        
+        Raises:
+            JWTError: If the token is invalid or expired
+        """
+        if self.max_size <= 0:
+            return self._decode(token)
+        
+        signing_input, _, signature = token.rpartition(".")
+        with self._lock:
+            entry = self._entries.get(signature)
+            if entry is not None:
+                self._entries.move_to_end(signature)
+        
+        if entry is not None and hmac.compare_digest(entry[0], signing_input):
+            _, payload, exp = entry
+            if exp is not None and exp < time.time():
+                with self._lock:
+                    self._entries.pop(signature, None)
+                raise ExpiredSignatureError("Signature has expired.")
+            return dict(payload)
+        
+        payload = self._decode(token)
+        exp = payload.get("exp")
+        with self._lock:
+            self._entries[signature] = (
+                signing_input,
+                payload,
+                float(exp) if exp is not None else None,
+            )
+            self._entries.move_to_end(signature)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return dict(payload)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared verifier instance
+token_verifier = TokenVerifier(
+    secret=settings.JWT_SECRET,
+    algorithm=settings.JWT_ALGORITHM,
+    max_size=settings.JWT_DECODE_CACHE_SIZE,
+)
+
+
 def decode_access_token(token: str) -> dict:
     """
     Decode and validate a JWT token.
@@ -80,12 +130,7 @@ def decode_access_token(token: str) -> dict:
         HTTPException: If token is invalid or expired
     """
     try:
-        payload = jwt.decode(
-            token,
-            settings.JWT_SECRET,
-            algorithms=[settings.JWT_ALGORITHM]
-        )
-        return payload
+        return token_verifier.verify(token)
         
     except JWTError:
         raise HTTPException(
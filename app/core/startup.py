@@ -0,0 +1,187 @@
+"""
+Profile and warm up worker startup.
+
+Run from the project root for a startup report (per-module import times,
+then create_app and warmup steps):
+    python -m app.core.startup [--top 25]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Iterator
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class StartupProfile:
+    """Durations of the named startup steps (create_app, warmup), in order."""
+
+    def __init__(self) -> None:
+        self.steps: dict[str, float] = {}
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps[name] = self.steps.get(name, 0.0) + time.perf_counter() - started
+
+    def as_dict(self) -> dict[str, float]:
+        """Step durations in milliseconds."""
+        return {name: round(seconds * 1000, 3) for name, seconds in self.steps.items()}
+
+    def log(self) -> None:
+        steps = self.as_dict()
+        logger.info(
+            "Startup steps (ms): %s",
+            ", ".join(f"{name}={duration:.1f}" for name, duration in steps.items()),
+            extra={"startup_steps": steps},
+        )
+
+
+# Singleton instance
+startup_profile = StartupProfile()
+
+
+def prefork_warmup() -> None:
+    """
+    Load what requests would otherwise load lazily, in a fork-safe way:
+    no threads, processes or connections are left behind.
+
+    A preloading server (gunicorn --preload) can call this from its
+    `when_ready` hook so forked workers inherit the loaded modules;
+    uvicorn --workers spawns fresh interpreters, so warmup() runs it in
+    each worker instead. Safe to call more than once; like warmup(), a
+    failing step is logged and left to happen lazily.
+    """
+    from app.core.passwords import load_backend
+    from app.core.security import create_access_token
+
+    with startup_profile.step("warmup: jose"):
+        try:
+            from jose import jwt
+
+            token = create_access_token({"sub": "warmup"}, timedelta(minutes=1))
+            jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
+        except Exception:
+            logger.exception("JWT warmup failed")
+    with startup_profile.step("warmup: passlib"):
+        try:
+            load_backend()
+        except Exception:
+            logger.exception("Password hashing backend warmup failed")
+
+
+async def warmup() -> None:
+    """
+    Prepare a new worker before it serves its first request (called by the
+    app lifespan when STARTUP_WARMUP is on): prefork_warmup(), then start
+    the hashing pool and open a connection to each database.
+
+    Best effort: a failing step is logged and left to happen lazily.
+    """
+    from app.core.hashing import hashing_service
+    from app.db import engine as engines
+
+    prefork_warmup()
+
+    with startup_profile.step("warmup: hashing pool"):
+        try:
+            await asyncio.to_thread(hashing_service.warmup)
+        except Exception:
+            logger.exception("Hashing pool warmup failed")
+
+    with startup_profile.step("warmup: database"):
+        try:
+            if engines.async_engine is not None:
+                for async_engine in [engines.async_engine, *engines.async_replica_engines]:
+                    async with async_engine.connect() as connection:
+                        await connection.exec_driver_sql("SELECT 1")
+            else:
+                for engine in [engines.engine, *engines.replica_engines]:
+                    with engine.connect() as connection:
+                        connection.exec_driver_sql("SELECT 1")
+        except Exception:
+            logger.exception("Database warmup failed")
+
+
+# Runs in the profiled interpreter: build the app, warm up, print the steps
+_PROFILED = """
+import asyncio, json
+import app.main
+app.main.app
+from app.core.hashing import hashing_service
+from app.core.startup import startup_profile, warmup
+from app.db.engine import async_engine
+async def main():
+    await warmup()
+    if async_engine is not None:
+        await async_engine.dispose()
+asyncio.run(main())
+hashing_service.shutdown()
+print(json.dumps(startup_profile.as_dict()))
+"""
+
+
+def parse_importtime(output: str) -> list[tuple[str, int, int, int]]:
+    """(module, self us, cumulative us, depth) per `-X importtime` line."""
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules.append((name.strip(), int(own), int(cumulative), depth))
+    return modules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--top", type=int, default=25, help="modules to list")
+    args = parser.parse_args()
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROFILED],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "LOG_LEVEL": "WARNING"},
+    )
+    if result.returncode != 0:
+        sys.exit(result.stderr)
+    modules = parse_importtime(result.stderr)
+    steps = json.loads(result.stdout.strip().splitlines()[-1])
+
+    total = sum(own for _, own, _, _ in modules)
+    app_main = next(cumulative for name, _, cumulative, _ in modules if name == "app.main")
+    print(f"imports: {total / 1000:.1f} ms in total, {app_main / 1000:.1f} ms under app.main")
+
+    packages: dict[str, int] = defaultdict(int)
+    for name, own, _, _ in modules:
+        packages[name.split(".")[0]] += own
+    print("\nby package (self time):")
+    for package, own in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {own / 1000:>8.1f} ms  {package}")
+
+    print("\nslowest modules (self time, cumulative):")
+    for name, own, cumulative, _ in sorted(modules, key=lambda module: -module[1])[:args.top]:
+        print(f"  {own / 1000:>8.1f} ms  {cumulative / 1000:>8.1f} ms  {name}")
+
+    print("\nstartup steps:")
+    for name, duration in steps.items():
+        print(f"  {duration:>8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""Per-request phase timings, reported in the Server-Timing header."""
+
+import asyncio
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Match
+from starlette.types import Scope
+
+from app.core.responses import json_bytes_field
+
+
+class RequestTimings:
+    """
+    Accumulated phase durations (seconds) for the current request.
+
+    Phases may overlap: `db` and `auth` happen inside `deps` and `app`.
+    """
+
+    __slots__ = ("started", "phases", "db_queries", "handler_started",
+                 "endpoint_started", "endpoint_finished")
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.phases: dict[str, float] = {}
+        self.db_queries = 0
+        self.handler_started: float | None = None
+        self.endpoint_started: float | None = None
+        self.endpoint_finished: float | None = None
+
+    def add(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def total(self) -> float:
+        return time.perf_counter() - self.started
+
+    def as_dict(self) -> dict[str, float]:
+        """Phase durations in milliseconds, including the total so far."""
+        timings = {name: round(seconds * 1000, 3) for name, seconds in self.phases.items()}
+        timings["total"] = round(self.total() * 1000, 3)
+        return timings
+
+    def header_value(self) -> str:
+        """Render as a Server-Timing header value (durations in ms)."""
+        parts = []
+        for name, duration in self.as_dict().items():
+            if name == "db":
+                parts.append(f'db;dur={duration};desc="{self.db_queries} queries"')
+            else:
+                parts.append(f"{name};dur={duration}")
+        return ", ".join(parts)
+
+
+_current_timings: ContextVar[RequestTimings | None] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def start_request_timings() -> tuple[RequestTimings, Any]:
+    """Begin timing a request; returns the timings and a reset token."""
+    timings = RequestTimings()
+    return timings, _current_timings.set(timings)
+
+
+def end_request_timings(token: Any) -> None:
+    _current_timings.reset(token)
+
+
+def current_timings() -> RequestTimings | None:
+    """Timings of the request being served, or None outside a request."""
+    return _current_timings.get()
+
+
+@contextmanager
+def measure(name: str) -> Iterator[None]:
+    """Add the duration of the block to phase `name` of the current request."""
+    timings = _current_timings.get()
+    if timings is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attribute cursor execution time on `engine` to the `db` phase."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info["query_started"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        timings = _current_timings.get()
+        if timings is not None:
+            timings.add("db", time.perf_counter() - conn.info["query_started"])
+            timings.db_queries += 1
+
+
+def _timed_endpoint(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap an endpoint to mark where dependency resolution ends."""
+
+    def _started() -> RequestTimings | None:
+        timings = _current_timings.get()
+        if timings is not None:
+            timings.endpoint_started = time.perf_counter()
+        return timings
+
+    def _finished(timings: RequestTimings | None) -> None:
+        if timings is not None:
+            timings.endpoint_finished = time.perf_counter()
+
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def timed_async_endpoint(*args: Any, **kwargs: Any) -> Any:
+            timings = _started()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                _finished(timings)
+
+        return timed_async_endpoint
+
+    @functools.wraps(endpoint)
+    def timed_endpoint(*args: Any, **kwargs: Any) -> Any:
+        timings = _started()
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            _finished(timings)
+
+    return timed_endpoint
+
+
+class TimedRoute(APIRoute):
+    """
+    APIRoute that splits handler time into phases:
+
+    - deps: request parsing and dependency resolution (get_session,
+      get_current_user, ...)
+    - app: the endpoint function itself
+    - serialize: response_model validation and JSON rendering
+
+    The matched route is also stored in scope["route"] so middleware can
+    label metrics by path template.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def matches(self, scope: Scope) -> tuple[Match, Scope]:
+        match, child_scope = super().matches(scope)
+        if match == Match.FULL:
+            child_scope["route"] = self
+        return match, child_scope
+
+    def get_route_handler(self) -> Callable[[Request], Any]:
+        # Response models are rendered to bytes if the response class takes them
+        self.secure_cloned_response_field = json_bytes_field(
+            self.secure_cloned_response_field, self.response_class
+        )
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request) -> Response:
+            timings = _current_timings.get()
+            if timings is None:
+                return await handler(request)
+
+            timings.handler_started = time.perf_counter()
+            response = await handler(request)
+            finished = time.perf_counter()
+
+            if timings.endpoint_started is not None:
+                timings.add("deps", timings.endpoint_started - timings.handler_started)
+            if timings.endpoint_finished is not None:
+                timings.add("app", timings.endpoint_finished - timings.endpoint_started)
+                timings.add("serialize", finished - timings.endpoint_finished)
+            return response
+
+        return timed_handler
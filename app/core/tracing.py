@@ -1,39 +1,74 @@
 """Request tracing middleware."""
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import uuid
 import logging
 
+from app.core.config import settings
+from app.core.timing import end_request_timings, start_request_timings
+
 logger = logging.getLogger(__name__)
 
 
-class TracingMiddleware(BaseHTTPMiddleware):
-    """Add unique trace ID to each request for debugging."""
+class TracingMiddleware:
+    """
+    Add unique trace ID to each request for debugging.
     
-    async def dispatch(self, request: Request, call_next):
-        # Generate or extract trace ID
-        trace_id = request.headers.get("X-Trace-ID") or str(uuid.uuid4())
+    Also times the request: phases recorded through app.core.timing are
+    logged against the trace ID and returned in a Server-Timing header.
+    
+    Plain ASGI middleware: unlike BaseHTTPMiddleware it doesn't wrap the
+    request/response in extra tasks and streams, so it adds almost no
+    per-request overhead and leaves streaming responses untouched.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # Store in request state
-        request.state.trace_id = trace_id
+        # Generate or extract trace ID
+        trace_id = Headers(scope=scope).get("X-Trace-ID") or str(uuid.uuid4())
         
-        # Log request
-        logger.info(
-            f"[{trace_id}] {request.method} {request.url.path}",
-            extra={"trace_id": trace_id}
-        )
+        # Store in request state (backs request.state.trace_id)
+        scope.setdefault("state", {})["trace_id"] = trace_id
         
-        # Process request
-        response = await call_next(request)
+        # Log request (only build the record's fields if INFO is enabled)
+        log_info = logger.isEnabledFor(logging.INFO)
+        if log_info:
+            logger.info(
+                "[%s] %s %s",
+                trace_id,
+                scope["method"],
+                scope.get("root_path", "") + scope["path"],
+                extra={"trace_id": trace_id}
+            )
         
-        # Add trace ID to response headers
-        response.headers["X-Trace-ID"] = trace_id
+        timings, timings_token = start_request_timings()
         
-        # Log response
-        logger.info(
-            f"[{trace_id}] Response: {response.status_code}",
-            extra={"trace_id": trace_id}
-        )
+        async def send_with_trace_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Add trace ID to response headers
+                headers = MutableHeaders(scope=message)
+                headers["X-Trace-ID"] = trace_id
+                if settings.SERVER_TIMING_ENABLED:
+                    headers.append("Server-Timing", timings.header_value())
+                
+                # Log response
+                if log_info:
+                    logger.info(
+                        "[%s] Response: %s",
+                        trace_id,
+                        message["status"],
+                        extra={"trace_id": trace_id, "timings": timings.as_dict()}
+                    )
+            await send(message)
         
-        return response
+        try:
+            await self.app(scope, receive, send_with_trace_id)
+        finally:
+            end_request_timings(timings_token)
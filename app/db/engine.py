@@ -1,11 +1,117 @@
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel import create_engine
 from app.core.config import settings
+from app.core.timing import instrument_engine
+from app.db.pool import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    monitor_engine,
+)
+
+
+def pool_options() -> dict:
+    """
+    Pool keyword arguments from settings.
+    
+    Each worker process opens up to DB_POOL_SIZE + DB_MAX_OVERFLOW
+    connections, so keep workers * (size + overflow) below Postgres
+    max_connections.
+    """
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_use_lifo": settings.DB_POOL_USE_LIFO,
+    }
+
 
 engine = create_engine(
     settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    pool_size=5,
-    max_overflow=10,
-    pool_pre_ping=True,
-    pool_recycle=3600,
-)
\ No newline at end of file
+    echo=settings.DB_ECHO,
+    poolclass=InstrumentedQueuePool,
+    **pool_options(),
+)
+instrument_engine(engine)
+monitor_engine("primary", engine)
+
+# Read replicas, used by get_read_session
+replica_engines = [
+    create_engine(
+        url,
+        echo=settings.DB_ECHO,
+        poolclass=InstrumentedQueuePool,
+        **pool_options(),
+    )
+    for url in settings.DATABASE_REPLICA_URLS
+]
+for index, replica in enumerate(replica_engines):
+    instrument_engine(replica)
+    monitor_engine(f"replica_{index}", replica)
+
+
+# Async drivers to use when ASYNC_DATABASE_URL is not set explicitly
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(sync_url: str) -> str:
+    """Swap the sync driver in a URL for its async counterpart."""
+    url = make_url(sync_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise RuntimeError(
+            f"No async driver known for '{backend}', set ASYNC_DATABASE_URL"
+        )
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(
+        hide_password=False
+    )
+
+
+def get_async_database_url() -> str:
+    """
+    Resolve the URL for the async engine.
+    
+    Uses ASYNC_DATABASE_URL when set, otherwise swaps the sync driver in
+    DATABASE_URL for its async counterpart (psycopg2 -> asyncpg,
+    pysqlite -> aiosqlite).
+    """
+    return settings.ASYNC_DATABASE_URL or to_async_url(settings.DATABASE_URL)
+
+
+def get_async_replica_urls() -> list[str]:
+    """Async replica URLs, derived from DATABASE_REPLICA_URLS if not set."""
+    return settings.ASYNC_DATABASE_REPLICA_URLS or [
+        to_async_url(url) for url in settings.DATABASE_REPLICA_URLS
+    ]
+
+
+# Only built in async mode so the sync deployment doesn't need asyncpg
+async_engine: AsyncEngine | None = None
+async_replica_engines: list[AsyncEngine] = []
+if settings.DB_MODE == "async":
+    async_engine = create_async_engine(
+        get_async_database_url(),
+        echo=settings.DB_ECHO,
+        poolclass=InstrumentedAsyncQueuePool,
+        **pool_options(),
+    )
+    instrument_engine(async_engine.sync_engine)
+    monitor_engine("primary_async", async_engine.sync_engine)
+    
+    async_replica_engines = [
+        create_async_engine(
+            url,
+            echo=settings.DB_ECHO,
+            poolclass=InstrumentedAsyncQueuePool,
+            **pool_options(),
+        )
+        for url in get_async_replica_urls()
+    ]
+    for index, replica in enumerate(async_replica_engines):
+        instrument_engine(replica.sync_engine)
+        monitor_engine(f"replica_{index}_async", replica.sync_engine)
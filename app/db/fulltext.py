@@ -0,0 +1,84 @@
+"""
+Full-text index over post title and content.
+
+The index isn't mapped by the models, it's raw DDL per dialect:
+- PostgreSQL: a generated, weighted `tsvector` column with a GIN index
+- SQLite: an external-content FTS5 table kept in sync by triggers
+  (local development and tests)
+
+The same statements are run by the Alembic migration and, through
+register_fulltext_ddl, by `SQLModel.metadata.create_all()`.
+"""
+
+from sqlalchemy import DDL, Table, event
+
+# Text search configuration (stemming, stop words) on PostgreSQL
+SEARCH_CONFIG = "english"
+
+POSTGRES_CREATE = (
+    "ALTER TABLE post ADD COLUMN IF NOT EXISTS search_vector tsvector"
+    " GENERATED ALWAYS AS ("
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(content, '')), 'B')"
+    ") STORED",
+    "CREATE INDEX IF NOT EXISTS ix_post_search_vector ON post USING gin (search_vector)",
+)
+
+POSTGRES_DROP = (
+    "DROP INDEX IF EXISTS ix_post_search_vector",
+    "ALTER TABLE post DROP COLUMN IF EXISTS search_vector",
+)
+
+SQLITE_CREATE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS post_fts USING fts5("
+    "title, content, content='post', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS post_fts_insert AFTER INSERT ON post BEGIN "
+    "INSERT INTO post_fts(rowid, title, content) VALUES (new.id, new.title, new.content); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS post_fts_delete AFTER DELETE ON post BEGIN "
+    "INSERT INTO post_fts(post_fts, rowid, title, content) "
+    "VALUES ('delete', old.id, old.title, old.content); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS post_fts_update AFTER UPDATE OF title, content ON post BEGIN "
+    "INSERT INTO post_fts(post_fts, rowid, title, content) "
+    "VALUES ('delete', old.id, old.title, old.content); "
+    "INSERT INTO post_fts(rowid, title, content) VALUES (new.id, new.title, new.content); "
+    "END",
+    # Index rows that already exist
+    "INSERT INTO post_fts(post_fts) VALUES ('rebuild')",
+)
+
+SQLITE_DROP = (
+    "DROP TRIGGER IF EXISTS post_fts_update",
+    "DROP TRIGGER IF EXISTS post_fts_delete",
+    "DROP TRIGGER IF EXISTS post_fts_insert",
+    "DROP TABLE IF EXISTS post_fts",
+)
+
+CREATE_STATEMENTS = {"postgresql": POSTGRES_CREATE, "sqlite": SQLITE_CREATE}
+DROP_STATEMENTS = {"postgresql": POSTGRES_DROP, "sqlite": SQLITE_DROP}
+
+# Run before bulk loads (app.db.seed), then CREATE_STATEMENTS afterwards:
+# rebuilding the index once is several times faster than maintaining it
+# row by row. The PostgreSQL tsvector column is left alone, it's generated.
+BULK_LOAD_DROP_STATEMENTS = {
+    "postgresql": ("DROP INDEX IF EXISTS ix_post_search_vector",),
+    "sqlite": SQLITE_DROP,
+}
+
+
+def is_fulltext_object(name: str | None) -> bool:
+    """Whether a reflected schema object belongs to the full-text index."""
+    return bool(name) and (
+        name in ("search_vector", "ix_post_search_vector") or name.startswith("post_fts")
+    )
+
+
+def register_fulltext_ddl(table: Table) -> None:
+    """Create/drop the full-text index along with the post table."""
+    for dialect, statements in CREATE_STATEMENTS.items():
+        for statement in statements:
+            event.listen(table, "after_create", DDL(statement).execute_if(dialect=dialect))
+    # The FTS5 table outlives `post` otherwise, and create_all would trip on it
+    for statement in SQLITE_DROP:
+        event.listen(table, "before_drop", DDL(statement).execute_if(dialect="sqlite"))
@@ -1,6 +1,9 @@
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 from datetime import datetime
 
+from app.db.fulltext import register_fulltext_ddl
+
 
 class User(SQLModel, table=True):
     """
@@ -15,6 +18,15 @@ class User(SQLModel, table=True):
     role: str = Field(default="user", max_length=50)  # "user" or "admin"
     is_active: bool = Field(default=True)
     
+    # Denormalized post stats, kept in step by the post write paths
+    # (see app/users/service.py); app.users.reconcile repairs drift
+    post_count: int = Field(default=0)
+    last_posted_at: datetime | None = Field(default=None)
+    
+    # Optimistic concurrency: bumped by every profile update (not by the
+    # post stats above); updates are conditional on it, see If-Match
+    version: int = Field(default=1)
+    
     # Timestamps
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -25,14 +37,29 @@ class User(SQLModel, table=True):
 
 class Post(SQLModel, table=True):
     """Post database model."""
+    __table_args__ = (
+        # Keyset pagination seeks on (created_at, id)
+        Index("ix_post_created_at_id", "created_at", "id"),
+        # Per-author timelines seek on (author_id, created_at, id); all
+        # ascending, so a backward scan yields created_at DESC, id DESC
+        Index("ix_post_author_id_created_at_id", "author_id", "created_at", "id"),
+    )
+
     id: int | None = Field(default=None, primary_key=True)
     title: str = Field(max_length=255)
     content: str
     author_id: int = Field(foreign_key="user.id")
     
+    # Optimistic concurrency: bumped by every update, see If-Match
+    version: int = Field(default=1)
+    
     # Timestamps
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
     # Relationships
-    author: User = Relationship(back_populates="posts")
\ No newline at end of file
+    author: User = Relationship(back_populates="posts")
+
+
+# Full-text index on title/content is raw DDL, see app/db/fulltext.py
+register_fulltext_ddl(Post.__table__)
@@ -0,0 +1,104 @@
+"""Connection pool classes with checkout instrumentation."""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Any
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+# Engines whose pools are reported by /metrics, by name
+monitored_engines: dict[str, Engine] = {}
+
+# Upper bounds (seconds) of the checkout wait histogram
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+
+class _InstrumentedPoolMixin:
+    """
+    Records checkouts, how long checkouts that found the pool exhausted
+    waited for a connection, and how many gave up with a timeout.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS) + 1)
+        self.wait_seconds = 0.0
+        self._stats_lock = threading.Lock()
+
+    def _must_wait(self) -> bool:
+        # No idle connection and no overflow left: the checkout will block
+        return (
+            self._pool.empty()
+            and self._max_overflow > -1
+            and self._overflow >= self._max_overflow
+        )
+
+    def _do_get(self) -> Any:
+        if not self._must_wait():
+            with self._stats_lock:
+                self.checkouts += 1
+            return super()._do_get()
+
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._stats_lock:
+                self.checkouts += 1
+                self.waits += 1
+                self.wait_buckets[bisect_left(WAIT_BUCKETS, waited)] += 1
+                self.wait_seconds += waited
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    """QueuePool for the sync engine."""
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """QueuePool for the async engine."""
+
+
+def pool_status(pool: Pool) -> dict[str, Any]:
+    """Point-in-time pool counters (QueuePool-based pools only)."""
+    if not isinstance(pool, QueuePool):
+        return {}
+
+    status: dict[str, Any] = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+    }
+    if isinstance(pool, _InstrumentedPoolMixin):
+        with pool._stats_lock:
+            cumulative, buckets = 0, {}
+            for bound, count in zip(WAIT_BUCKETS, pool.wait_buckets):
+                cumulative += count
+                buckets[bound] = cumulative
+            status.update(
+                checkouts=pool.checkouts,
+                waits=pool.waits,
+                timeouts=pool.timeouts,
+                wait_seconds={
+                    "buckets": buckets,
+                    "sum": pool.wait_seconds,
+                    "count": pool.waits,
+                },
+            )
+    return status
+
+
+def monitor_engine(name: str, engine: Engine) -> None:
+    """Include `engine`'s pool in metrics under `name`."""
+    monitored_engines[name] = engine
@@ -0,0 +1,136 @@
+"""Read-replica selection with read-your-writes stickiness."""
+
+import itertools
+import threading
+import time
+from typing import Any, Generic, TypeVar
+
+from jose import JWTError
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.core.config import settings
+from app.core.security import token_verifier
+
+EngineT = TypeVar("EngineT")
+
+
+class RecentWrites:
+    """
+    Remembers which principals wrote recently, so their reads can stay on
+    the primary until replicas have caught up.
+
+    Per process: a write handled by one worker doesn't pin reads served
+    by another, so size READ_YOUR_WRITES_SECONDS to replication lag.
+    """
+
+    # Prune expired entries once the map grows past this
+    PRUNE_THRESHOLD = 10_000
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self._last_write: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def note(self, subject: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._last_write[subject] = now
+            if len(self._last_write) > self.PRUNE_THRESHOLD:
+                cutoff = now - self.window_seconds
+                self._last_write = {
+                    key: at for key, at in self._last_write.items() if at > cutoff
+                }
+
+    def is_recent(self, subject: str | None) -> bool:
+        if subject is None or self.window_seconds <= 0:
+            return False
+        at = self._last_write.get(subject)
+        return at is not None and time.monotonic() - at < self.window_seconds
+
+
+recent_writes = RecentWrites(settings.READ_YOUR_WRITES_SECONDS)
+
+
+class ReplicaRouter(Generic[EngineT]):
+    """
+    Picks a replica engine for read-only requests.
+
+    Strategies:
+    - round_robin: rotate through replicas
+    - least_connections: replica with the fewest sessions handed out by
+      this router that are still open
+    """
+
+    def __init__(self, primary: EngineT, replicas: list[EngineT], strategy: str):
+        self.primary = primary
+        self.replicas = replicas
+        self.strategy = strategy
+        self._in_use = [0] * len(replicas)
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+
+    def acquire(self, subject: str | None) -> tuple[EngineT, int | None]:
+        """
+        Choose the engine for a read.
+
+        Returns the engine and the replica index to pass to release()
+        (None when the primary was chosen).
+        """
+        if not self.replicas or recent_writes.is_recent(subject):
+            return self.primary, None
+
+        with self._lock:
+            if self.strategy == "least_connections":
+                index = min(range(len(self.replicas)), key=self._in_use.__getitem__)
+            else:
+                index = next(self._next) % len(self.replicas)
+            self._in_use[index] += 1
+        return self.replicas[index], index
+
+    def release(self, index: int | None) -> None:
+        if index is None:
+            return
+        with self._lock:
+            self._in_use[index] -= 1
+
+
+def request_subject(authorization: str | None) -> str | None:
+    """Token subject from an optional `Authorization: Bearer` header."""
+    if not authorization:
+        return None
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return token_verifier.verify(token).get("sub")
+    except JWTError:
+        # Public reads don't fail on a bad token, they just aren't sticky
+        return None
+
+
+def bind_principal(session: Any, subject: str) -> None:
+    """Record who is using `session` so their writes can be tracked."""
+    session.info["principal"] = subject
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_session_wrote(session: Session, flush_context: Any) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_statement_wrote(orm_execute_state: ORMExecuteState) -> None:
+    # Bulk INSERT/UPDATE/DELETE statements bypass the flush
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _note_principal_write(session: Session) -> None:
+    if session.info.pop("wrote", False) and "principal" in session.info:
+        recent_writes.note(session.info["principal"])
@@ -0,0 +1,340 @@
+"""
+Seed the database: the initial admin user, plus optional synthetic data.
+
+Run from the project root, after `alembic upgrade head`:
+    python -m app.db.seed
+    python -m app.db.seed --users 100000 --posts 10000000 [--workers 8] [--batch-size 20000]
+
+Synthetic data is generated and written in batches, in parallel worker
+processes on PostgreSQL, where batches go through `COPY` when the
+driver is psycopg2. Other setups use multi-row inserts. Each batch
+commits together with a row in the `seed_progress` table, so an
+interrupted run picks up where it stopped when rerun with the same
+arguments. The table is dropped once the run completes. Every run adds
+`--users` and `--posts` on top of what is already there.
+
+The full-text index is dropped while posts load and rebuilt at the end,
+so search misses posts until the run completes.
+
+Generated users all share one password (SEED_PASSWORD), hashed once.
+"""
+
+import argparse
+import csv
+import io
+import json
+import math
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+from sqlalchemy import Column, Connection, MetaData, String, Table, Text, func, insert, inspect
+from sqlmodel import Session, select
+
+from app.core.security import hash_password
+from app.db.engine import engine
+from app.db.fulltext import BULK_LOAD_DROP_STATEMENTS, CREATE_STATEMENTS
+from app.db.models import Post, User
+from app.users.reconcile import reconcile_post_counts
+
+ADMIN_EMAIL = "admin@example.com"
+ADMIN_PASSWORD = "admin123"
+
+SEED_EMAIL_DOMAIN = "seed.example.com"
+SEED_PASSWORD = "Seed-Passw0rd"
+
+DEFAULT_BATCH_SIZE = 20_000
+
+# Generated users and posts are spread over this much history
+HISTORY = timedelta(days=730)
+
+# Posts per author follow a Zipf distribution with this exponent
+AUTHOR_ZIPF_EXPONENT = 1.1
+
+# Post bodies: log-normal word counts (median ~80 words, long tail)
+CONTENT_WORDS_MEDIAN = 80
+CONTENT_WORDS_SIGMA = 0.9
+CONTENT_WORDS_MAX = 3000
+
+# Committed batches of an unfinished run; outside the app's models
+progress_metadata = MetaData()
+seed_progress = Table(
+    "seed_progress",
+    progress_metadata,
+    Column("batch", String(64), primary_key=True),
+    Column("value", Text, nullable=True),
+)
+
+PARAMS_KEY = "params"
+
+
+def seed_admin() -> None:
+    """Create the initial admin user unless it exists."""
+    with Session(engine) as session:
+        if session.exec(select(User).where(User.email == ADMIN_EMAIL)).first():
+            print(f"Admin user {ADMIN_EMAIL} already exists")
+            return
+        session.add(User(
+            email=ADMIN_EMAIL,
+            hashed_password=hash_password(ADMIN_PASSWORD),
+            role="admin",
+        ))
+        session.commit()
+    print(f"Created admin user {ADMIN_EMAIL}")
+
+
+# Per-process generation state, set by _init_worker
+_state: dict = {}
+
+
+def _init_worker(hashed_password: str, author_ids: list[int]) -> None:
+    """Build the word corpus and author weights once per process."""
+    rng = random.Random(0)
+    syllables = [c + v for c in "bcdfghklmnprstvz" for v in "aeiou"]
+    vocabulary = list(dict.fromkeys(
+        "".join(rng.choices(syllables, k=rng.randint(1, 4))) for _ in range(30_000)
+    ))
+    # Posts are slices of one Zipf-distributed text, cheaper than sampling words
+    weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+    _state["corpus"] = rng.choices(vocabulary, weights, k=1_000_000)
+    _state["hashed_password"] = hashed_password
+    _state["author_ids"] = author_ids
+    _state["author_weights"] = list(accumulate(
+        1 / rank ** AUTHOR_ZIPF_EXPONENT for rank in range(1, len(author_ids) + 1)
+    ))
+
+
+def _words(rng: random.Random, count: int) -> str:
+    corpus = _state["corpus"]
+    start = rng.randrange(len(corpus) - count)
+    return " ".join(corpus[start:start + count])
+
+
+def user_rows(index: int, params: dict) -> list[dict]:
+    """Generate the users of batch `index`."""
+    rng = random.Random(f"users:{index}")
+    epoch = datetime.fromisoformat(params["epoch"])
+    first = index * params["batch_size"]
+    last = min(first + params["batch_size"], params["users"])
+    rows = []
+    for i in range(first, last):
+        created_at = epoch - HISTORY * rng.random()
+        rows.append({
+            "email": f"user{params['user_offset'] + i}@{SEED_EMAIL_DOMAIN}",
+            "hashed_password": _state["hashed_password"],
+            "role": "user",
+            "is_active": rng.random() > 0.02,
+            "post_count": 0,
+            "version": 1,
+            "created_at": created_at,
+            "updated_at": created_at,
+        })
+    return rows
+
+
+def post_rows(index: int, params: dict) -> list[dict]:
+    """Generate the posts of batch `index`, oldest first."""
+    rng = random.Random(f"posts:{index}")
+    epoch = datetime.fromisoformat(params["epoch"])
+    first = index * params["batch_size"]
+    last = min(first + params["batch_size"], params["posts"])
+    authors = rng.choices(
+        _state["author_ids"], cum_weights=_state["author_weights"], k=last - first
+    )
+    rows = []
+    for i, author_id in zip(range(first, last), authors):
+        # IDs roughly follow time, like a real table
+        created_at = epoch - HISTORY * (1 - i / params["posts"])
+        updated_at = created_at
+        if rng.random() < 0.1:
+            updated_at += timedelta(hours=rng.expovariate(1 / 48))
+        words = int(rng.lognormvariate(math.log(CONTENT_WORDS_MEDIAN), CONTENT_WORDS_SIGMA))
+        rows.append({
+            "title": _words(rng, rng.randint(3, 12)).capitalize()[:255],
+            "content": _words(rng, max(5, min(words, CONTENT_WORDS_MAX))),
+            "author_id": author_id,
+            "version": 1,
+            "created_at": created_at,
+            "updated_at": updated_at,
+        })
+    return rows
+
+
+BATCH_KINDS = {
+    "users": (User.__table__, user_rows),
+    "posts": (Post.__table__, post_rows),
+}
+
+
+def write_rows(conn: Connection, table: Table, rows: list[dict]) -> None:
+    """Write rows with COPY on psycopg2, multi-row inserts otherwise."""
+    if conn.dialect.name != "postgresql" or conn.dialect.driver != "psycopg2":
+        conn.execute(insert(table), rows)
+        return
+
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([row[column] for column in columns])
+    buffer.seek(0)
+    cursor = conn.connection.driver_connection.cursor()
+    cursor.copy_expert(
+        f'COPY "{table.name}" ({", ".join(columns)}) FROM STDIN WITH (FORMAT csv)', buffer
+    )
+
+
+def load_batch(kind: str, index: int, params: dict) -> int:
+    """Generate and commit one batch along with its progress row."""
+    table, generate = BATCH_KINDS[kind]
+    rows = generate(index, params)
+    with engine.begin() as conn:
+        write_rows(conn, table, rows)
+        conn.execute(insert(seed_progress).values(batch=f"{kind}:{index}"))
+    return len(rows)
+
+
+def start_run(args: argparse.Namespace) -> dict:
+    """
+    Record the run's parameters, or resume an interrupted run.
+
+    Raises:
+        SystemExit: If an interrupted run used different arguments
+    """
+    requested = {"users": args.users, "posts": args.posts, "batch_size": args.batch_size}
+    progress_metadata.create_all(engine)
+    with engine.begin() as conn:
+        stored = conn.execute(
+            select(seed_progress.c.value).where(seed_progress.c.batch == PARAMS_KEY)
+        ).scalar()
+        if stored is not None:
+            params = json.loads(stored)
+            if {key: params[key] for key in requested} != requested:
+                raise SystemExit(
+                    f"An interrupted seed run with {params} is pending. Rerun it with the "
+                    "same arguments, or pass --restart to discard its progress."
+                )
+            print("Resuming interrupted seed run")
+            return params
+
+        # New users are numbered after the ones from earlier runs
+        user_offset = conn.execute(
+            select(func.count()).select_from(User.__table__)
+            .where(User.email.like(f"%@{SEED_EMAIL_DOMAIN}"))
+        ).scalar()
+        params = {
+            **requested,
+            "user_offset": user_offset,
+            "epoch": datetime.utcnow().isoformat(),
+        }
+        conn.execute(insert(seed_progress).values(batch=PARAMS_KEY, value=json.dumps(params)))
+    return params
+
+
+def run_batches(kind: str, params: dict, workers: int, initargs: tuple) -> None:
+    """Load the pending batches of `kind`, in parallel if workers > 1."""
+    batches = math.ceil(params[kind] / params["batch_size"])
+    with engine.connect() as conn:
+        done = set(conn.execute(select(seed_progress.c.batch)).scalars())
+    pending = [index for index in range(batches) if f"{kind}:{index}" not in done]
+    if not pending:
+        return
+
+    started = time.perf_counter()
+    rows = 0
+
+    def report(count: int, finished: int) -> None:
+        nonlocal rows
+        rows += count
+        rate = rows / (time.perf_counter() - started)
+        print(f"{kind}: {batches - len(pending) + finished}/{batches} batches, {rate:,.0f} rows/s")
+
+    if workers <= 1:
+        _init_worker(*initargs)
+        for finished, index in enumerate(pending, 1):
+            report(load_batch(kind, index, params), finished)
+        return
+
+    # spawn: forked children would share the parent's pooled connections
+    with ProcessPoolExecutor(
+        workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=initargs,
+    ) as pool:
+        futures = [pool.submit(load_batch, kind, index, params) for index in pending]
+        for finished, future in enumerate(as_completed(futures), 1):
+            report(future.result(), finished)
+
+
+def seed_data(args: argparse.Namespace) -> None:
+    if args.restart:
+        progress_metadata.drop_all(engine)
+    params = start_run(args)
+    # bcrypt is deliberately slow: hash once, share it across all users
+    hashed_password = hash_password(SEED_PASSWORD)
+
+    run_batches("users", params, args.workers, (hashed_password, []))
+
+    if params["posts"]:
+        with Session(engine) as session:
+            author_ids = session.exec(
+                select(User.id).where(User.email.like(f"%@{SEED_EMAIL_DOMAIN}")).order_by(User.id)
+            ).all() or session.exec(select(User.id).order_by(User.id)).all()
+        if not author_ids:
+            raise SystemExit("No users to author posts, pass --users")
+        dialect = engine.dialect.name
+        with engine.begin() as conn:
+            for statement in BULK_LOAD_DROP_STATEMENTS.get(dialect, ()):
+                conn.exec_driver_sql(statement)
+        run_batches("posts", params, args.workers, (hashed_password, author_ids))
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            for statement in CREATE_STATEMENTS.get(dialect, ()):
+                conn.exec_driver_sql(statement)
+        print(f"Rebuilt the full-text index in {time.perf_counter() - started:.0f}s")
+
+    with Session(engine) as session:
+        repaired = reconcile_post_counts(session)
+    print(f"Updated post stats of {repaired} user(s)")
+    if engine.dialect.name == "postgresql":
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.exec_driver_sql('ANALYZE "user", post')
+    progress_metadata.drop_all(engine)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=0, help="synthetic users to add")
+    parser.add_argument("--posts", type=int, default=0, help="synthetic posts to add")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="parallel loader processes (default: 1 on SQLite, up to 8 otherwise)",
+    )
+    parser.add_argument(
+        "--restart", action="store_true", help="discard an interrupted run's progress"
+    )
+    args = parser.parse_args()
+    if args.workers is None:
+        # SQLite has a single writer, parallel batches would just wait on the lock
+        args.workers = 1 if engine.dialect.name == "sqlite" else min(8, multiprocessing.cpu_count())
+
+    if not inspect(engine).has_table(User.__tablename__):
+        raise SystemExit("Tables are missing, run `alembic upgrade head` first")
+
+    seed_admin()
+    if args.users or args.posts or args.restart:
+        started = time.perf_counter()
+        seed_data(args)
+        print(f"Seeded {args.users:,} users and {args.posts:,} posts "
+              f"in {time.perf_counter() - started:.0f}s")
+
+
+if __name__ == "__main__":
+    main()
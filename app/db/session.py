@@ -1,6 +1,16 @@
+from fastapi import Request
 from sqlmodel import Session
-from app.db.engine import engine
-from typing import Generator
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.config import settings
+from app.db.engine import async_engine, async_replica_engines, engine, replica_engines
+from app.db.routing import ReplicaRouter, request_subject
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncGenerator, AsyncIterator, Generator, Iterator
+
+read_router = ReplicaRouter(engine, replica_engines, settings.REPLICA_STRATEGY)
+async_read_router = ReplicaRouter(
+    async_engine, async_replica_engines, settings.REPLICA_STRATEGY
+)
 
 
 def get_session() -> Generator[Session, None, None]:
@@ -11,4 +21,78 @@ def get_session() -> Generator[Session, None, None]:
         Session: SQLModel session for database operations
     """
     with Session(engine) as session: 
-        yield session
\ No newline at end of file
+        yield session
+
+
+@contextmanager
+def read_session(subject: str | None) -> Iterator[Session]:
+    """
+    Session on a read replica or the primary, see get_read_session.
+    
+    For code that outlives the request's dependencies, such as a
+    streaming response body.
+    """
+    read_engine, replica = read_router.acquire(subject)
+    try:
+        with Session(read_engine) as session:
+            session.info["read_your_writes"] = replica is None and bool(read_router.replicas)
+            yield session
+    finally:
+        read_router.release(replica)
+
+
+def get_read_session(request: Request) -> Generator[Session, None, None]:
+    """
+    Session dependency for read-only handlers.
+    
+    Uses a read replica when configured, except for callers who wrote
+    within READ_YOUR_WRITES_SECONDS; those stay on the primary so they
+    see their own changes, flagged by `session.info["read_your_writes"]`.
+    Never use it for writes.
+    
+    Yields:
+        Session: SQLModel session bound to a replica or the primary
+    """
+    with read_session(request_subject(request.headers.get("Authorization"))) as session:
+        yield session
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async database session dependency (DB_MODE=async).
+    
+    Yields:
+        AsyncSession: SQLModel async session for database operations
+    """
+    if async_engine is None:
+        raise RuntimeError("Async engine is not configured, set DB_MODE=async")
+    
+    # Expired attributes can't lazy-load outside a greenlet, so keep them
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+
+@asynccontextmanager
+async def async_read_session(subject: str | None) -> AsyncIterator[AsyncSession]:
+    """Async variant of read_session (DB_MODE=async)."""
+    if async_engine is None:
+        raise RuntimeError("Async engine is not configured, set DB_MODE=async")
+    
+    read_engine, replica = async_read_router.acquire(subject)
+    try:
+        async with AsyncSession(read_engine, expire_on_commit=False) as session:
+            session.info["read_your_writes"] = (
+                replica is None and bool(async_read_router.replicas)
+            )
+            yield session
+    finally:
+        async_read_router.release(replica)
+
+
+async def get_async_read_session(
+    request: Request,
+) -> AsyncGenerator[AsyncSession, None]:
+    """Async variant of get_read_session (DB_MODE=async)."""
+    subject = request_subject(request.headers.get("Authorization"))
+    async with async_read_session(subject) as session:
+        yield session
@@ -1,17 +1,79 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, Response
 
 from app.core.config import settings
 from app.core.exception import register_exception_handlers
+from app.core.responses import default_response_class
 from app.middlewares.cors import setup_cors
+from app.middlewares.rate_limit import RateLimitMiddleware
 from app.core.tracing import TracingMiddleware
+from app.core.hashing import hashing_service
+from app.core.logs import log_pipeline
+from app.core.metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    MetricsMiddleware,
+    exposition,
+    run_snapshot_writer,
+    write_final_snapshot,
+)
+from app.core.timing import TimedRoute
+from app.core.startup import startup_profile, warmup
 
-# Feature routers
-from app.auth.routes import router as auth_router
-from app.users.routes import router as users_router
-from app.posts.routes import router as posts_router
 
-def create_app() -> FastAPI:
+def _feature_routers() -> list[tuple[APIRouter, str, str]]:
+    """
+    (router, prefix, tag) per feature, imported when an app is created.
+    
+    DB_MODE picks the sync or async stack; only that one is imported.
+    """
+    if settings.DB_MODE == "async":
+        from app.auth.async_routes import router as auth_router
+        from app.users.async_routes import router as users_router
+        from app.posts.async_routes import router as posts_router
+        from app.admin.async_routes import router as admin_router
+    else:
+        from app.auth.routes import router as auth_router
+        from app.users.routes import router as users_router
+        from app.posts.routes import router as posts_router
+        from app.admin.routes import router as admin_router
+    return [
+        (auth_router, "/api/auth", "Authentication"),
+        (users_router, "/api/users", "Users"),
+        (posts_router, "/api/posts", "Posts"),
+        (admin_router, "/api/admin", "Admin"),
+    ]
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Startup/shutdown hooks."""
+    log_pipeline.start()
+    if settings.STARTUP_WARMUP:
+        await warmup()  # Pay lazy imports and first connections before serving
+    if settings.STARTUP_PROFILE:
+        startup_profile.log()
+    metrics_dir = settings.METRICS_ENABLED and settings.METRICS_MULTIPROC_DIR
+    snapshot_writer = None
+    if metrics_dir:
+        snapshot_writer = asyncio.create_task(
+            run_snapshot_writer(metrics_dir, settings.METRICS_FLUSH_INTERVAL)
+        )
+    
+    yield
+    
+    if snapshot_writer is not None:
+        snapshot_writer.cancel()
+        with suppress(asyncio.CancelledError):
+            await snapshot_writer
+        write_final_snapshot(metrics_dir)
+    hashing_service.shutdown()
+    log_pipeline.stop()
+
+
+def create_app(response_class: type[Response] | None = None) -> FastAPI:
     """
     Application factory pattern.
     
@@ -19,7 +81,13 @@ def create_app() -> FastAPI:
     - Easier to test (create app with different configs)
     - Can create multiple app instances
     - Clean separation of concerns
+    
+    Args:
+        response_class: Default response class for every route; defaults
+            to the one selected by JSON_RESPONSE_ENCODER; error responses
+            (exception handlers, rate limiting) use it too
     """
+    response_class = response_class or default_response_class
     
     app = FastAPI(
         title=settings.APP_NAME,
@@ -27,29 +95,57 @@ def create_app() -> FastAPI:
         version="1.0.0",
         docs_url="/docs" if settings.DEBUG else None,  # Disable docs in prod
         redoc_url="/redoc" if settings.DEBUG else None,
+        lifespan=lifespan,
+        default_response_class=response_class,
     )
+    # Time app-level routes too and label them in metrics
+    app.router.route_class = TimedRoute
     
     # Register middleware (order matters!)
+    if settings.RATE_LIMIT_ENABLED or settings.LOAD_SHED_ENABLED:
+        # 429/503 before any handler work
+        app.add_middleware(RateLimitMiddleware, response_class=response_class)
     app.add_middleware(TracingMiddleware)  # First: Add trace ID
-    setup_cors(app)  # Second: Handle CORS
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)  # Count requests, incl. tracing
+    setup_cors(app)  # Last: Handle CORS
     
     # Register exception handlers
-    register_exception_handlers(app)
+    register_exception_handlers(app, response_class)
     
     # Register routers
-    app.include_router(auth_router, prefix="/api/auth", tags=["Authentication"])
-    app.include_router(users_router, prefix="/api/users", tags=["Users"])
-    app.include_router(posts_router, prefix="/api/posts", tags=["Posts"])
+    with startup_profile.step("import routers"):
+        routers = _feature_routers()
+    with startup_profile.step("include routers"):
+        for router, prefix, tag in routers:
+            app.include_router(router, prefix=prefix, tags=[tag])
     
     @app.get("/health")
     def health_check():
         """Health check endpoint for load balancers."""
         return {"status": "healthy"}
     
+    if settings.METRICS_ENABLED:
+        @app.get("/metrics", include_in_schema=False)
+        async def metrics():
+            """Prometheus scrape endpoint."""
+            body = await exposition(settings.METRICS_MULTIPROC_DIR)
+            return PlainTextResponse(body, media_type=METRICS_CONTENT_TYPE)
+    
     return app
 
-# Create app instance
-app = create_app()
+
+def __getattr__(name: str):
+    """
+    Create the app instance on first access (`uvicorn app.main:app`), so
+    importing create_app for a custom instance doesn't build this one.
+    """
+    if name == "app":
+        with startup_profile.step("create_app"):
+            globals()["app"] = create_app()
+        return globals()["app"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # For running with: uvicorn app.main:app --reload
 if __name__ == "__main__":
@@ -17,5 +17,5 @@ def setup_cors(app: FastAPI) -> None:
         allow_credentials=True,  # Allow cookies
         allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH"],
         allow_headers=["*"],  # Allow all headers
-        expose_headers=["X-Trace-ID"],  # Expose custom headers
+        expose_headers=["X-Trace-ID", "Server-Timing"],  # Expose custom headers
     )
@@ -0,0 +1,362 @@
+"""Rate limiting and adaptive load shedding middleware."""
+
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Protocol
+
+from fastapi import status
+from jose import JWTError
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.responses import default_response_class
+from app.core.security import token_verifier
+from app.db.pool import monitored_engines
+
+logger = logging.getLogger(__name__)
+
+# Never limited: load balancer probes and scrapes must see an overloaded worker
+EXEMPT_PATHS = frozenset({"/health", "/metrics"})
+
+# Anonymous, bcrypt-bound endpoints with their own, much smaller budget
+AUTH_PATHS = frozenset({"/api/auth/login", "/api/auth/register"})
+
+
+class BucketStore(Protocol):
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        """Take one token; return 0 if granted, else seconds until one is."""
+        ...
+
+
+class MemoryStore:
+    """
+    Token buckets in a bounded LRU dict, per worker process.
+
+    Only touched by RateLimitMiddleware on the event loop thread, so no
+    locking. An evicted bucket starts full again, which only matters for
+    clients idle long enough to have refilled anyway.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / rate
+        self._buckets[key] = (tokens, now)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+class SharedClient(Protocol):
+    """Subset of the redis.asyncio client API used by SharedStore."""
+
+    async def eval(self, script: str, numkeys: int, *keys_and_args: Any) -> Any: ...
+
+
+# Refill and take in one atomic step, timed by the server clock so workers
+# on different hosts agree. Returns the wait as a string: Lua numbers are
+# truncated to integers on the way back.
+TAKE_SCRIPT = """
+local rate, burst = tonumber(ARGV[1]), tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or burst
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(now - updated, 0) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+
+class SharedStore:
+    """
+    Token buckets on a shared store (Redis API), so limits hold across
+    workers and hosts.
+
+    Fails open: if the store is unreachable requests are let through and
+    a warning is logged, rather than turning an outage into a 500 storm.
+    """
+
+    PREFIX = "rate-limit:"
+
+    def __init__(self, client: SharedClient):
+        self.client = client
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        try:
+            wait = await self.client.eval(TAKE_SCRIPT, 1, self.PREFIX + key, rate, burst)
+        except Exception as exc:
+            logger.warning("Rate limit store unavailable, allowing request: %s", exc)
+            return 0.0
+        return float(wait)
+
+
+class LoadShedder:
+    """
+    Adaptive cap on requests in flight in this worker.
+
+    Every `interval` seconds the cap is adjusted from the connection pools'
+    checkout counters: if checkouts in the last interval waited longer than
+    `wait_target` on average (or timed out), the cap shrinks by a quarter,
+    down to `min_in_flight`; otherwise it grows by one, up to
+    `max_in_flight`. Requests beyond the cap get a 503 straight away
+    instead of queueing for the threadpool or a connection, so the ones
+    admitted keep their normal latency.
+
+    Only touched on the event loop thread, so no locking.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        min_in_flight: int,
+        wait_target: float,
+        interval: float,
+    ):
+        self.max_in_flight = max_in_flight
+        self.min_in_flight = min(min_in_flight, max_in_flight)
+        self.wait_target = wait_target
+        self.interval = interval
+        self.limit = max_in_flight
+        self.in_flight = 0
+        self.shed = 0
+        self._adjusted_at = time.monotonic()
+        self._last_totals = self._pool_totals()
+
+    @staticmethod
+    def _pool_totals() -> tuple[int, float, int]:
+        """(checkouts, seconds waited, timeouts) summed over monitored pools."""
+        checkouts, waited, timeouts = 0, 0.0, 0
+        for engine in monitored_engines.values():
+            pool = engine.pool
+            checkouts += getattr(pool, "checkouts", 0)
+            waited += getattr(pool, "wait_seconds", 0.0)
+            timeouts += getattr(pool, "timeouts", 0)
+        return checkouts, waited, timeouts
+
+    def _adjust(self) -> None:
+        totals = self._pool_totals()
+        checkouts, waited, timeouts = (
+            now - last for now, last in zip(totals, self._last_totals)
+        )
+        self._last_totals = totals
+
+        mean_wait = waited / checkouts if checkouts else 0.0
+        if timeouts or mean_wait > self.wait_target:
+            self.limit = max(self.min_in_flight, self.limit * 3 // 4)
+        else:
+            self.limit = min(self.max_in_flight, self.limit + 1)
+
+    def admit(self) -> bool:
+        """Count the request in, or return False if it must be shed."""
+        now = time.monotonic()
+        if now - self._adjusted_at >= self.interval:
+            self._adjusted_at = now
+            self._adjust()
+
+        if self.in_flight >= self.limit:
+            self.shed += 1
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self) -> None:
+        self.in_flight -= 1
+
+
+class RateLimiter:
+    """
+    Picks the bucket for a request and charges it.
+
+    Requests with a valid bearer token are limited per user, so clients
+    sharing an address (NAT, office proxy) don't starve each other; all
+    others per client IP. Login and registration also draw from a small
+    per-IP budget, as each attempt costs a bcrypt round.
+    """
+
+    def __init__(self, store: BucketStore):
+        self.store = store
+        self.limited = 0
+
+    @staticmethod
+    def client_ip(scope: Scope, headers: Headers) -> str:
+        if settings.RATE_LIMIT_TRUST_FORWARDED:
+            forwarded = headers.get("x-forwarded-for")
+            if forwarded:
+                # The right-most entry was added by our proxy; the rest is client-supplied
+                return forwarded.rsplit(",", 1)[-1].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    @staticmethod
+    def user_subject(headers: Headers) -> str | None:
+        scheme, _, token = headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return None
+        try:
+            # Memoized per token, so this is a dict lookup after the first request
+            return token_verifier.verify(token).get("sub")
+        except JWTError:
+            return None
+
+    async def check(self, scope: Scope) -> float:
+        """Charge the request's buckets; return seconds to wait, or 0."""
+        headers = Headers(scope=scope)
+        path = scope["path"]
+        if path in AUTH_PATHS:
+            wait = await self.store.take(
+                "auth:" + self.client_ip(scope, headers),
+                settings.RATE_LIMIT_AUTH_PER_MINUTE / 60,
+                settings.RATE_LIMIT_AUTH_BURST,
+            )
+            if wait:
+                self.limited += 1
+                return wait
+
+        subject = self.user_subject(headers)
+        if subject is not None:
+            wait = await self.store.take(
+                "user:" + subject,
+                settings.RATE_LIMIT_USER_PER_SECOND,
+                settings.RATE_LIMIT_USER_BURST,
+            )
+        else:
+            wait = await self.store.take(
+                "ip:" + self.client_ip(scope, headers),
+                settings.RATE_LIMIT_IP_PER_SECOND,
+                settings.RATE_LIMIT_IP_BURST,
+            )
+        if wait:
+            self.limited += 1
+        return wait
+
+
+def _reject(
+    scope: Scope,
+    response_class: type[Response],
+    status_code: int,
+    detail: str,
+    retry_after: int,
+) -> Response:
+    trace_id = scope.get("state", {}).get("trace_id", "unknown")
+    logger.warning(
+        "[%s] %s %s: %s",
+        trace_id,
+        status_code,
+        scope["path"],
+        detail,
+        extra={"trace_id": trace_id},
+    )
+    return response_class(
+        status_code=status_code,
+        content={"detail": detail, "trace_id": trace_id},
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+class RateLimitMiddleware:
+    """
+    Reject over-quota clients with 429 and shed load with 503, before
+    any routing, authentication or database work happens.
+
+    Both answers carry Retry-After. Plain ASGI middleware, like
+    TracingMiddleware, so admitted requests pay almost nothing for it.
+    Rejections are rendered with `response_class`, the app's JSON
+    response class.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        response_class: type[Response] = default_response_class,
+    ):
+        self.app = app
+        self.response_class = response_class
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        if rate_limiter is not None:
+            wait = await rate_limiter.check(scope)
+            if wait:
+                response = _reject(
+                    scope,
+                    self.response_class,
+                    status.HTTP_429_TOO_MANY_REQUESTS,
+                    "Too many requests",
+                    max(math.ceil(wait), 1),
+                )
+                await response(scope, receive, send)
+                return
+
+        if load_shedder is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not load_shedder.admit():
+            response = _reject(
+                scope,
+                self.response_class,
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                "Server busy, retry later",
+                settings.LOAD_SHED_RETRY_AFTER,
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            load_shedder.release()
+
+
+def build_store() -> BucketStore:
+    """Bucket store selected by RATE_LIMIT_BACKEND."""
+    if settings.RATE_LIMIT_BACKEND == "memory":
+        return MemoryStore(settings.RATE_LIMIT_MAX_KEYS)
+
+    try:
+        from redis import asyncio as redis
+    except ImportError:
+        raise RuntimeError(
+            "RATE_LIMIT_BACKEND=redis requires the redis package (pip install redis)"
+        )
+    if not settings.RATE_LIMIT_URL:
+        raise RuntimeError("RATE_LIMIT_BACKEND=redis requires RATE_LIMIT_URL")
+    return SharedStore(redis.Redis.from_url(settings.RATE_LIMIT_URL))
+
+
+# Singleton instances (None when disabled)
+rate_limiter = RateLimiter(build_store()) if settings.RATE_LIMIT_ENABLED else None
+load_shedder = (
+    LoadShedder(
+        settings.LOAD_SHED_MAX_IN_FLIGHT,
+        settings.LOAD_SHED_MIN_IN_FLIGHT,
+        settings.LOAD_SHED_POOL_WAIT_TARGET,
+        settings.LOAD_SHED_INTERVAL,
+    )
+    if settings.LOAD_SHED_ENABLED
+    else None
+)
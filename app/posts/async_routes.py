@@ -0,0 +1,310 @@
+"""Post management routes (async, DB_MODE=async)."""
+
+from fastapi import APIRouter, Depends, Header, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from sqlmodel.ext.asyncio.session import AsyncSession
+from datetime import datetime
+from typing import AsyncIterator, Literal
+
+from app.db.routing import request_subject
+from app.db.session import async_read_session, get_async_read_session, get_async_session
+from app.db.models import Post, User
+from app.posts.schemas import (
+    PostBulkCreate,
+    PostBulkResult,
+    PostCreate,
+    PostPage,
+    PostRead,
+    PostSearchPage,
+    PostUpdate,
+    PostWithAuthor,
+    PostWithAuthorPage,
+)
+from app.posts import search, service
+from app.users import service as user_service
+from app.auth.dependencies import get_async_current_user
+from app.core.concurrency import if_match_versions, version_etag
+from app.core.config import settings
+from app.core.response_cache import response_cache
+from app.core.timing import TimedRoute
+
+router = APIRouter(route_class=TimedRoute)
+
+
+@router.get(
+    "/",
+    response_model=list[PostRead] | PostPage | list[PostWithAuthor] | PostWithAuthorPage
+)
+async def list_posts(
+    session: AsyncSession = Depends(get_async_read_session),
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=settings.POST_LIST_MAX_LIMIT),
+    pagination: Literal["offset", "cursor"] = "offset",
+    cursor: str | None = None,
+    author_id: int | None = None,
+    include_author: bool = False,
+    if_none_match: str | None = Header(None)
+):
+    """
+    List all posts (public endpoint).
+    
+    - **skip**: Number of posts to skip (offset pagination)
+    - **limit**: Maximum number of posts to return (at most `POST_LIST_MAX_LIMIT`)
+    - **pagination**: `offset` (default, returns a plain list) or `cursor`
+    - **cursor**: `next_cursor` from the previous page (implies cursor mode)
+    - **author_id**: Only posts by this user
+    - **include_author**: Embed each post's `author` (`id`, `email`)
+    
+    Cursor mode returns posts newest first as `{"items": [...], "next_cursor": ...}`
+    and seeks on the `(created_at, id)` index, or `(author_id, created_at, id)`
+    with `author_id`, so deep pages cost the same as the first one.
+    
+    Responses are cached with a strong `ETag`; a matching `If-None-Match`
+    gets 304 without querying the database.
+    """
+    cursor_mode = pagination == "cursor" or cursor is not None
+    key = service.list_cache_key(
+        cursor_mode, skip, limit, cursor, author_id, include_author
+    )
+    cached = service.cached_response(session, key, if_none_match)
+    if cached is not None:
+        return cached
+    generation = response_cache.generation()
+    
+    if cursor_mode:
+        statement = service.cursor_page_statement(cursor, limit, author_id, include_author)
+    else:
+        statement = service.offset_page_statement(skip, limit, author_id, include_author)
+    posts = (await session.exec(statement)).all()
+    
+    body, tags = service.serialize_post_list(
+        posts, limit, cursor_mode, cursor, author_id, include_author
+    )
+    return response_cache.store(key, body, tags, if_none_match, generation=generation)
+
+
+@router.post("/", response_model=PostRead, status_code=status.HTTP_201_CREATED)
+async def create_post(
+    post_data: PostCreate,
+    current_user: User = Depends(get_async_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Create a new post (authenticated users only).
+    """
+    post = Post(
+        **post_data.model_dump(),
+        author_id=current_user.id
+    )
+    
+    session.add(post)
+    stats = await session.exec(
+        user_service.post_count_increment(current_user.id, 1, post.created_at)
+    )
+    email = stats.scalar_one()
+    await session.commit()
+    service.invalidate_created(current_user.id)
+    user_service.invalidate_post_stats(email)
+    await session.refresh(post)
+    
+    return post
+
+
+@router.post(
+    "/bulk",
+    response_model=PostBulkResult,
+    status_code=status.HTTP_201_CREATED
+)
+async def create_posts_bulk(
+    payload: PostBulkCreate,
+    current_user: User = Depends(get_async_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Create many posts in one transaction (authenticated users only).
+    
+    - **items**: Up to POST_BULK_MAX_ITEMS `{"title", "content"}` objects
+    - **mode**: `atomic` (default) rejects the whole batch with 422 if any
+      item is invalid; `partial` creates the valid items and reports the
+      rest in `errors` by index
+    
+    Rows go in with multi-row `INSERT ... RETURNING` statements in one
+    transaction, so a batch costs a couple of round trips instead of
+    three per post.
+    """
+    posts, errors = service.validate_bulk_items(payload)
+    if not posts:
+        return PostBulkResult(created=[], errors=errors)
+    
+    statement, rows = service.bulk_insert(posts, current_user.id)
+    result = await session.exec(statement, params=rows)
+    created = result.mappings().all()
+    stats = await session.exec(user_service.post_count_increment(
+        current_user.id, len(created), rows[0]["created_at"]
+    ))
+    email = stats.scalar_one()
+    await session.commit()
+    service.invalidate_created(current_user.id)
+    user_service.invalidate_post_stats(email)
+    
+    return PostBulkResult(created=created, errors=errors)
+
+
+@router.get("/search", response_model=PostSearchPage)
+async def search_posts(
+    q: str = Query(..., min_length=1, max_length=256),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+    session: AsyncSession = Depends(get_async_read_session)
+):
+    """
+    Full-text search over post titles and content (public endpoint).
+    
+    - **q**: Search words; all of them must match (stemmed, so "running"
+      finds "runs"). On PostgreSQL, `"quoted phrases"`, `or` and `-word`
+      work as in web search engines
+    - **limit**: Maximum number of results to return
+    - **cursor**: `next_cursor` from the previous page
+    
+    Results are ranked by relevance, title matches weighing more, and
+    carry a `snippet` with the matched words wrapped in `<mark>`.
+    """
+    statement = search.search_statement(session.bind.dialect.name, q, cursor, limit)
+    rows = (await session.exec(statement)).all() if statement is not None else []
+    return Response(search.serialize_search_page(rows, limit), media_type="application/json")
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {service.NDJSON_MEDIA_TYPE: {}}}}
+)
+async def export_posts(
+    request: Request,
+    author_id: int | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None
+):
+    """
+    Stream posts as newline-delimited JSON, one PostRead per line (public endpoint).
+    
+    - **author_id**: Only posts by this user
+    - **created_after**: Only posts created at or after this time
+    - **created_before**: Only posts created before this time
+    
+    Rows are read through a server-side cursor in batches and streamed as
+    they arrive, so memory stays flat however many posts match. The export
+    holds one pooled connection until the last line is sent or the client
+    disconnects.
+    """
+    statement = service.export_statement(author_id, created_after, created_before)
+    subject = request_subject(request.headers.get("Authorization"))
+    
+    # The body outlives the handler's dependencies, so it owns its session
+    async def stream() -> AsyncIterator[bytes]:
+        async with async_read_session(subject) as session:
+            result = await session.stream(statement)
+            async for rows in result.partitions():
+                yield service.ndjson_chunk(rows)
+    
+    # Starlette doesn't close a body abandoned by a disconnecting client;
+    # closing it afterwards returns the connection to the pool right away
+    body = stream()
+    
+    async def close() -> None:
+        # BackgroundTask would run the builtin aclose in the threadpool
+        await body.aclose()
+    
+    return StreamingResponse(
+        body,
+        media_type=service.NDJSON_MEDIA_TYPE,
+        background=BackgroundTask(close)
+    )
+
+
+@router.get("/{post_id}", response_model=PostRead)
+async def get_post(
+    post_id: int,
+    session: AsyncSession = Depends(get_async_read_session),
+    if_none_match: str | None = Header(None)
+):
+    """Get post by ID (public endpoint, cached with an `ETag`)."""
+    key = service.post_cache_key(post_id)
+    cached = service.cached_response(session, key, if_none_match)
+    if cached is not None:
+        return cached
+    generation = response_cache.generation()
+    
+    result = await session.exec(service.post_statement(post_id))
+    post = service.ensure_post_found(result.first())
+    return response_cache.store(
+        key,
+        service.serialize_post(post),
+        [service.post_tag(post_id)],
+        if_none_match,
+        etag=version_etag(post.version, post.created_at),
+        generation=generation
+    )
+
+
+@router.put("/{post_id}", response_model=PostRead)
+async def update_post(
+    post_id: int,
+    post_data: PostUpdate,
+    current_user: User = Depends(get_async_current_user),
+    session: AsyncSession = Depends(get_async_session),
+    if_match: str | None = Header(None)
+):
+    """
+    Update a post.
+    
+    Users can only update their own posts.
+    Admins can update any post.
+    
+    Optimistic concurrency: send the post's `ETag` as `If-Match` (412 if
+    it has changed since), or its `version` in the body (409). The update
+    is one conditional `UPDATE ... RETURNING`; no rows are locked.
+    """
+    # Update only provided fields
+    update_data = post_data.model_dump(exclude_unset=True, exclude={"version"})
+    versions = if_match_versions(if_match)
+    statement = service.update_statement(
+        post_id, update_data, current_user, versions, post_data.version
+    )
+    post = (await session.exec(statement)).first()
+    if post is None:
+        current = (await session.exec(service.version_statement(post_id))).first()
+        service.raise_update_failure(current, current_user, versions, post_data.version)
+    
+    if update_data:
+        await session.commit()
+        service.invalidate_updated(post_id)
+    
+    return service.updated_response(post)
+
+
+@router.delete("/{post_id}")
+async def delete_post(
+    post_id: int,
+    current_user: User = Depends(get_async_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Delete a post.
+    
+    Users can only delete their own posts.
+    Admins can delete any post.
+    """
+    post = service.ensure_post_found(await session.get(Post, post_id))
+    service.ensure_can_modify(post, current_user, "delete")
+    
+    # Only the request whose DELETE removed the row updates the stats
+    deleted = service.ensure_post_found((await session.exec(service.delete_statement(post_id))).first())
+    stats = await session.exec(user_service.post_count_decrement(deleted.author_id))
+    email = stats.scalar_one()
+    await session.commit()
+    service.invalidate_deleted(post_id, deleted.author_id)
+    user_service.invalidate_post_stats(email)
+    
+    return {"message": "Post deleted successfully"}
@@ -1,5 +1,10 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
+from typing import Any, Literal
+from typing_extensions import TypedDict
+
+from app.core.config import settings
+from app.users.schemas import AuthorSummary
 
 
 class PostCreate(BaseModel):
@@ -14,6 +19,7 @@ class PostRead(BaseModel):
     title: str
     content: str
     author_id: int
+    version: int
     created_at: datetime
     updated_at: datetime
     
@@ -21,10 +27,119 @@ class PostRead(BaseModel):
         from_attributes = True
 
 
+class PostRow(TypedDict):
+    """
+    PostRead's fields as a plain dict, for serializing query rows
+    directly (no model instances, no validation). Keep in sync with PostRead.
+    """
+    id: int
+    title: str
+    content: str
+    author_id: int
+    version: int
+    created_at: datetime
+    updated_at: datetime
+
+
+class PostWithAuthor(PostRead):
+    """Schema for reading a post along with its author (`include_author`)."""
+    author: AuthorSummary
+
+
+class AuthorRow(TypedDict):
+    """AuthorSummary as a plain dict, see PostRow."""
+    id: int
+    email: str
+
+
+class PostWithAuthorRow(PostRow):
+    """PostWithAuthor as a plain dict, see PostRow."""
+    author: AuthorRow
+
+
 class PostUpdate(BaseModel):
-    """Schema for updating a post."""
+    """
+    Schema for updating a post.
+    
+    `version` is the version the edit was based on: the update fails with
+    409 if the post has changed since (like `If-Match` does with 412).
+    """
     title: str | None = Field(None, min_length=1, max_length=255)
     content: str | None = Field(None, min_length=1)
+    version: int | None = Field(None, ge=1)
     
     class Config:
         extra = "forbid"
+
+
+class PostPage(BaseModel):
+    """Schema for a keyset-paginated page of posts."""
+    items: list[PostRead]
+    next_cursor: str | None = None
+
+
+class PostRowPage(TypedDict):
+    """PostPage as a plain dict, see PostRow."""
+    items: list[PostRow]
+    next_cursor: str | None
+
+
+class PostWithAuthorPage(BaseModel):
+    """Schema for a keyset-paginated page of posts with their authors."""
+    items: list[PostWithAuthor]
+    next_cursor: str | None = None
+
+
+class PostWithAuthorRowPage(TypedDict):
+    """PostWithAuthorPage as a plain dict, see PostRow."""
+    items: list[PostWithAuthorRow]
+    next_cursor: str | None
+
+
+class PostBulkCreate(BaseModel):
+    """
+    Schema for creating many posts in one request.
+    
+    Items are validated one by one against PostCreate, so a bad item is
+    reported by index instead of rejecting the whole payload.
+    """
+    items: list[Any] = Field(..., min_length=1, max_length=settings.POST_BULK_MAX_ITEMS)
+    mode: Literal["atomic", "partial"] = "atomic"
+
+
+class PostBulkItemError(BaseModel):
+    """Validation error of one bulk item."""
+    index: int
+    loc: list[str | int]
+    msg: str
+    type: str
+
+
+class PostBulkResult(BaseModel):
+    """Schema for the outcome of a bulk create."""
+    created: list[PostRead]  # In request order, skipping failed items
+    errors: list[PostBulkItemError]
+
+
+class PostSearchHit(PostRead):
+    """Schema for a search result."""
+    score: float  # Relevance, higher is better; only comparable within one query
+    snippet: str  # HTML-escaped excerpt with matches wrapped in <mark>
+
+
+class PostSearchPage(BaseModel):
+    """Schema for a page of search results, best match first."""
+    items: list[PostSearchHit]
+    next_cursor: str | None = None
+
+
+class PostSearchRow(PostRow):
+    """PostSearchHit as a plain dict, see PostRow."""
+    score: float
+    snippet: str
+
+
+class PostSearchRowPage(TypedDict):
+    """PostSearchPage as a plain dict, see PostRow."""
+    items: list[PostSearchRow]
+    next_cursor: str | None
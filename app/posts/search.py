@@ -0,0 +1,133 @@
+"""Ranked full-text search over posts, see app/db/fulltext.py for the index."""
+
+import html
+import re
+from typing import Sequence
+
+from fastapi import HTTPException, status
+from pydantic import TypeAdapter
+from sqlalchemy import Double, Row, and_, cast, column, func, literal_column, or_, table
+from sqlmodel import select
+from sqlmodel.sql.expression import Select
+
+from app.core.pagination import decode_rank_cursor, encode_rank_cursor
+from app.db.fulltext import SEARCH_CONFIG
+from app.db.models import Post
+from app.posts.schemas import PostSearchRowPage
+from app.posts.service import POST_READ_COLUMNS
+
+# Snippet highlight markers, replaced by <mark> tags after HTML-escaping
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_STOP = "\x03"
+
+# PostgreSQL ts_headline options
+HEADLINE_OPTIONS = (
+    f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, "
+    "MaxFragments=2, MaxWords=20, MinWords=8"
+)
+
+# SQLite bm25 column weights (title, content), like setweight A vs B
+BM25_WEIGHTS = (2.5, 1.0)
+
+# Tokens per SQLite snippet
+SNIPPET_TOKENS = 16
+
+_search_page_serializer = TypeAdapter(PostSearchRowPage)
+
+
+def _postgres_search(q: str) -> tuple[Select, object]:
+    query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    vector = column("search_vector")
+    # ts_rank_cd returns a float4, which the driver hands over as its shortest
+    # decimal: bound back into a cursor as float8 it no longer equals the row's
+    # score, and the next page would repeat the row. Rank in float8 instead
+    score = cast(func.ts_rank_cd(vector, query), Double)
+    snippet = func.ts_headline(SEARCH_CONFIG, Post.content, query, HEADLINE_OPTIONS)
+    statement = select(
+        *POST_READ_COLUMNS, score.label("score"), snippet.label("snippet")
+    ).where(vector.op("@@")(query))
+    return statement, score
+
+
+def _sqlite_search(q: str) -> tuple[Select, object] | None:
+    # Quote every word so FTS5 query syntax in user input can't error out;
+    # the terms are ANDed like websearch_to_tsquery does
+    terms = re.findall(r"\w+", q)
+    if not terms:
+        return None
+    fts = table("post_fts", column("rowid"))
+    fts_ref = literal_column("post_fts")
+    score = -func.bm25(fts_ref, *BM25_WEIGHTS)
+    snippet = func.snippet(
+        fts_ref, -1, HIGHLIGHT_START, HIGHLIGHT_STOP, "…", SNIPPET_TOKENS
+    )
+    statement = (
+        select(*POST_READ_COLUMNS, score.label("score"), snippet.label("snippet"))
+        .select_from(fts.join(Post, Post.id == fts.c.rowid))
+        .where(fts_ref.op("MATCH")(" ".join(f'"{term}"' for term in terms)))
+    )
+    return statement, score
+
+
+def search_statement(
+    dialect: str,
+    q: str,
+    cursor: str | None,
+    limit: int
+) -> Select | None:
+    """
+    Build a ranked search query, best match first.
+    
+    Fetches one row more than `limit` so build_search_page can tell
+    whether another page exists.
+    
+    Returns:
+        The query, or None when `q` has no searchable words
+    
+    Raises:
+        HTTPException: 501 if the database has no full-text index
+    """
+    if dialect == "postgresql":
+        built = _postgres_search(q)
+    elif dialect == "sqlite":
+        built = _sqlite_search(q)
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=f"Full-text search is not available on {dialect}"
+        )
+    if built is None:
+        return None
+    
+    statement, score = built
+    if cursor is not None:
+        last_score, last_id = decode_rank_cursor(cursor)
+        statement = statement.where(or_(
+            score < last_score,
+            and_(score == last_score, Post.id < last_id)
+        ))
+    return statement.order_by(score.desc(), Post.id.desc()).limit(limit + 1)
+
+
+def render_snippet(raw: str) -> str:
+    """Escape the snippet for HTML, then turn the markers into <mark> tags."""
+    return (
+        html.escape(raw)
+        .replace(HIGHLIGHT_START, "<mark>")
+        .replace(HIGHLIGHT_STOP, "</mark>")
+    )
+
+
+def serialize_search_page(rows: Sequence[Row], limit: int) -> bytes:
+    """Trim the look-ahead row, derive next_cursor and serialize the page."""
+    next_cursor = None
+    if limit > 0 and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_rank_cursor(rows[-1].score, rows[-1].id)
+    
+    items = []
+    for row in rows:
+        item = row._asdict()
+        item["snippet"] = render_snippet(item["snippet"] or "")
+        items.append(item)
+    return _search_page_serializer.dump_json({"items": items, "next_cursor": next_cursor})
@@ -0,0 +1,443 @@
+"""Post business logic shared by the sync and async routers."""
+
+from datetime import datetime
+from fastapi import HTTPException, Response, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter, ValidationError
+from typing import Any, NoReturn, Sequence, TypeVar
+from sqlalchemy import Row, delete, insert, tuple_, update
+from sqlalchemy.orm import selectinload
+from sqlalchemy.sql.dml import ReturningDelete, ReturningInsert, ReturningUpdate
+from sqlmodel import select
+from sqlmodel.sql.expression import Select
+
+from app.db.models import Post, User
+from app.posts.schemas import (
+    PostBulkCreate,
+    PostBulkItemError,
+    PostCreate,
+    PostRead,
+    PostRow,
+    PostRowPage,
+    PostWithAuthorRow,
+    PostWithAuthorRowPage,
+)
+from app.core.concurrency import raise_version_conflict, version_etag
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.response_cache import response_cache
+
+# Response cache tags: offset listings shift on any insert or delete,
+# the first cursor page changes when a post is created (see also author_tag)
+OFFSET_LISTINGS_TAG = "posts:list:offset"
+CURSOR_HEAD_TAG = "posts:list:head"
+
+# Read paths select just these columns as plain rows and serialize them
+# with pydantic's compiled serializers: no ORM objects, no validation
+POST_READ_COLUMNS = tuple(Post.__table__.c[name] for name in PostRead.model_fields)
+
+_post_serializer = TypeAdapter(PostRow)
+_post_list_serializer = TypeAdapter(list[PostRow])
+_post_page_serializer = TypeAdapter(PostRowPage)
+_post_with_author_list_serializer = TypeAdapter(list[PostWithAuthorRow])
+_post_with_author_page_serializer = TypeAdapter(PostWithAuthorRowPage)
+
+# A Post entity or a POST_READ_COLUMNS row
+PostT = TypeVar("PostT", Post, Row)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Rows fetched per round trip, and sent per chunk, by the export
+EXPORT_BATCH_SIZE = 1000
+
+
+def _listing_statement(author_id: int | None, include_author: bool) -> Select:
+    """
+    Select PostRead rows, or Post entities with their author.
+    
+    Authors are loaded by selectinload: one extra `WHERE user.id IN (...)`
+    query for the whole page instead of one per post.
+    """
+    if include_author:
+        statement = select(Post).options(
+            selectinload(Post.author).load_only(User.id, User.email)
+        )
+    else:
+        statement = select(*POST_READ_COLUMNS)
+    if author_id is not None:
+        statement = statement.where(Post.author_id == author_id)
+    return statement
+
+
+def offset_page_statement(
+    skip: int,
+    limit: int,
+    author_id: int | None = None,
+    include_author: bool = False
+) -> Select:
+    """Build the legacy OFFSET/LIMIT listing query."""
+    return _listing_statement(author_id, include_author).offset(skip).limit(limit)
+
+
+def cursor_page_statement(
+    cursor: str | None,
+    limit: int,
+    author_id: int | None = None,
+    include_author: bool = False
+) -> Select:
+    """
+    Build a keyset listing query, newest first.
+    
+    Seeks on the (created_at, id) index, or on (author_id, created_at, id)
+    for one author's posts. Fetches one row more than `limit` so
+    build_cursor_page can tell whether another page exists.
+    """
+    statement = _listing_statement(author_id, include_author).order_by(
+        Post.created_at.desc(), Post.id.desc()
+    )
+    if cursor is not None:
+        created_at, post_id = decode_cursor(cursor)
+        statement = statement.where(
+            tuple_(Post.created_at, Post.id) < tuple_(created_at, post_id)
+        )
+    return statement.limit(limit + 1)
+
+
+def post_statement(post_id: int) -> Select:
+    """Build the single-post read query."""
+    return select(*POST_READ_COLUMNS).where(Post.id == post_id)
+
+
+def update_statement(
+    post_id: int,
+    values: dict[str, Any],
+    current_user: User,
+    if_match: list[tuple[int, datetime]] | None = None,
+    expected_version: int | None = None
+) -> ReturningUpdate | Select:
+    """
+    Build the conditional update of a post, returning its PostRead columns.
+    
+    The ownership check (unless the user is an admin) and the version
+    preconditions are part of the WHERE clause, and the version is bumped
+    in the database, so a successful update costs one round trip and
+    concurrent writers can't overwrite each other's edits. No row back
+    means a check failed: see raise_update_failure.
+    
+    Without values this is a SELECT with the same checks: an empty update
+    changes nothing, so it must not bump the version and fail other
+    clients' If-Match.
+    
+    Args:
+        post_id: Post to update
+        values: Columns to set
+        current_user: User making the change
+        if_match: Versions accepted by If-Match, see if_match_versions
+        expected_version: Version given in the request body
+    """
+    if values:
+        statement = (
+            update(Post)
+            .where(Post.id == post_id)
+            .values(**values, version=Post.version + 1, updated_at=datetime.utcnow())
+            .returning(*POST_READ_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+    else:
+        statement = post_statement(post_id)
+    if current_user.role != "admin":
+        statement = statement.where(Post.author_id == current_user.id)
+    if if_match is not None:
+        statement = statement.where(tuple_(Post.version, Post.created_at).in_(if_match))
+    if expected_version is not None:
+        statement = statement.where(Post.version == expected_version)
+    return statement
+
+
+def version_statement(post_id: int) -> Select:
+    """Build the lookup that explains a failed update_statement."""
+    return select(Post.author_id, Post.version, Post.created_at).where(Post.id == post_id)
+
+
+def raise_update_failure(
+    post: Row | None,
+    current_user: User,
+    if_match: list[tuple[int, datetime]] | None,
+    expected_version: int | None
+) -> NoReturn:
+    """
+    Raise the error for an update_statement that matched no row: 404, 403,
+    then 412 or 409 for a version mismatch.
+    
+    Args:
+        post: version_statement row, None if the post doesn't exist
+    """
+    post = ensure_post_found(post)
+    ensure_can_modify(post, current_user, "update")
+    raise_version_conflict(post.version, post.created_at, if_match, expected_version)
+
+
+def delete_statement(post_id: int) -> ReturningDelete:
+    """
+    Build the delete of a post, returning its author_id.
+    
+    No row back means the post is already gone, e.g. a concurrent delete
+    of the same post won: then the author's stats must not be touched.
+    """
+    return (
+        delete(Post)
+        .where(Post.id == post_id)
+        .returning(Post.author_id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _listing_item(post: Row | Post) -> PostRow | PostWithAuthorRow:
+    """Turn a listing row, or a Post loaded with its author, into a dict."""
+    if isinstance(post, Post):
+        item = {name: getattr(post, name) for name in PostRead.model_fields}
+        item["author"] = {"id": post.author.id, "email": post.author.email}
+        return item
+    return post._asdict()
+
+
+def build_cursor_page(
+    rows: Sequence[Row | Post],
+    limit: int
+) -> PostRowPage | PostWithAuthorRowPage:
+    """Trim the look-ahead row and derive next_cursor."""
+    next_cursor = None
+    if limit > 0 and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return {"items": [_listing_item(row) for row in rows], "next_cursor": next_cursor}
+
+
+def export_statement(
+    author_id: int | None,
+    created_after: datetime | None,
+    created_before: datetime | None
+) -> Select:
+    """
+    Build the export query: plain columns in id order, no ORM objects.
+    
+    `yield_per` makes SQLAlchemy use a server-side cursor where the driver
+    has one (psycopg2, asyncpg) and hand rows over in fixed-size batches,
+    so memory doesn't grow with the table.
+    """
+    statement = select(*POST_READ_COLUMNS).order_by(Post.id)
+    if author_id is not None:
+        statement = statement.where(Post.author_id == author_id)
+    if created_after is not None:
+        statement = statement.where(Post.created_at >= created_after)
+    if created_before is not None:
+        statement = statement.where(Post.created_at < created_before)
+    return statement.execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+
+def ndjson_chunk(rows: Sequence[Row]) -> bytes:
+    """Serialize a batch of export rows as newline-delimited PostRead JSON."""
+    return b"".join(_post_serializer.dump_json(row._asdict()) + b"\n" for row in rows)
+
+
+def post_tag(post_id: int) -> str:
+    """Cache tag of every cached response that includes the post."""
+    return f"post:{post_id}"
+
+
+def author_tag(author_id: int) -> str:
+    """
+    Cache tag of every cached listing scoped to the author's posts or
+    embedding the author.
+    """
+    return f"author:{author_id}"
+
+
+def post_cache_key(post_id: int) -> str:
+    return f"posts:get:{post_id}"
+
+
+def list_cache_key(
+    cursor_mode: bool,
+    skip: int,
+    limit: int,
+    cursor: str | None,
+    author_id: int | None = None,
+    include_author: bool = False
+) -> str:
+    scope = f"{author_id if author_id is not None else '*'}:{int(include_author)}"
+    if cursor_mode:
+        return f"posts:cursor:{scope}:{limit}:{cursor or ''}"
+    return f"posts:offset:{scope}:{skip}:{limit}"
+
+
+def cached_response(session: Any, key: str, if_none_match: str | None) -> Response | None:
+    """
+    Look up the response cache for a read.
+    
+    Reads pinned to the primary for read-your-writes skip the lookup: the
+    shared entry may have been filled from a lagging replica.
+    """
+    if session.info.get("read_your_writes"):
+        return None
+    return response_cache.lookup(key, if_none_match)
+
+
+def serialize_post(row: Row) -> bytes:
+    return _post_serializer.dump_json(row._asdict())
+
+
+def updated_response(row: Row) -> Response:
+    """Respond with an updated post and the ETag of its new version."""
+    return Response(
+        serialize_post(row),
+        media_type="application/json",
+        headers={"ETag": version_etag(row.version, row.created_at)}
+    )
+
+
+def serialize_post_list(
+    rows: Sequence[Row | Post],
+    limit: int,
+    cursor_mode: bool,
+    cursor: str | None,
+    author_id: int | None = None,
+    include_author: bool = False
+) -> tuple[bytes, list[str]]:
+    """
+    Serialize a listing for the response cache.
+    
+    Returns the JSON body and the tags that must invalidate it: one per
+    included post, plus the listing tag for pages a new post can enter.
+    Later cursor pages only hold posts older than the cursor, so creating
+    a post never changes them. Cursor pages also carry the tag of their
+    look-ahead row, whose deletion can take away the next page. Pages of
+    one author's posts, and pages embedding authors, also carry the
+    author tags.
+    """
+    if cursor_mode:
+        page = build_cursor_page(rows, limit)
+        if include_author:
+            body = _post_with_author_page_serializer.dump_json(page)
+        else:
+            body = _post_page_serializer.dump_json(page)
+        items = page["items"]
+        tags = [CURSOR_HEAD_TAG] if cursor is None and author_id is None else []
+        if limit > 0 and len(rows) > limit:
+            tags.append(post_tag(rows[limit].id))
+    else:
+        items = [_listing_item(row) for row in rows]
+        if include_author:
+            body = _post_with_author_list_serializer.dump_json(items)
+        else:
+            body = _post_list_serializer.dump_json(items)
+        tags = [OFFSET_LISTINGS_TAG]
+    if author_id is not None:
+        tags.append(author_tag(author_id))
+    tags.extend(post_tag(item["id"]) for item in items)
+    if include_author:
+        tags.extend(author_tag(item["author_id"]) for item in items)
+    return body, list(dict.fromkeys(tags))
+
+
+def invalidate_created(author_id: int) -> None:
+    response_cache.invalidate(OFFSET_LISTINGS_TAG, CURSOR_HEAD_TAG, author_tag(author_id))
+
+
+def invalidate_updated(post_id: int) -> None:
+    response_cache.invalidate(post_tag(post_id))
+
+
+def invalidate_deleted(post_id: int, author_id: int) -> None:
+    response_cache.invalidate(
+        post_tag(post_id), OFFSET_LISTINGS_TAG, CURSOR_HEAD_TAG, author_tag(author_id)
+    )
+
+
+def validate_bulk_items(
+    payload: PostBulkCreate
+) -> tuple[list[PostCreate], list[PostBulkItemError]]:
+    """
+    Validate each bulk item against PostCreate.
+    
+    Raises:
+        RequestValidationError: In atomic mode if any item is invalid,
+            with locations pointing at the offending items
+    """
+    valid: list[PostCreate] = []
+    errors: list[PostBulkItemError] = []
+    for index, item in enumerate(payload.items):
+        try:
+            valid.append(PostCreate.model_validate(item))
+        except ValidationError as exc:
+            errors.extend(
+                PostBulkItemError(
+                    index=index,
+                    loc=list(error["loc"]),
+                    msg=error["msg"],
+                    type=error["type"]
+                )
+                for error in exc.errors(include_url=False)
+            )
+    
+    if errors and payload.mode == "atomic":
+        raise RequestValidationError([
+            {
+                "loc": ("body", "items", error.index, *error.loc),
+                "msg": error.msg,
+                "type": error.type
+            }
+            for error in errors
+        ])
+    return valid, errors
+
+
+def bulk_insert(
+    posts: list[PostCreate],
+    author_id: int
+) -> tuple[ReturningInsert, list[dict[str, Any]]]:
+    """
+    Build a bulk INSERT ... RETURNING and its rows.
+    
+    Execute as `session.exec(statement, params=rows)`: SQLAlchemy's
+    "insertmanyvalues" sends the rows as multi-row VALUES batches of up to
+    1000 rows (one round trip at the default POST_BULK_MAX_ITEMS), and the
+    statement compiles once and is cached, unlike `.values(rows)`.
+    
+    Neither RETURNING order nor id order is guaranteed to follow VALUES
+    order (concurrent batches interleave sequence values on PostgreSQL),
+    so `sort_by_parameter_order` has SQLAlchemy return the rows in input
+    order. PostgreSQL keeps the batches; SQLite has no way to correlate
+    them, so SQLAlchemy inserts its rows one at a time there.
+    """
+    # default_factory only runs when building models, so stamp rows here
+    now = datetime.utcnow()
+    rows = [
+        {**post.model_dump(), "author_id": author_id, "created_at": now, "updated_at": now}
+        for post in posts
+    ]
+    statement = insert(Post.__table__).returning(
+        *Post.__table__.c, sort_by_parameter_order=True
+    )
+    return statement, rows
+
+
+def ensure_post_found(post: PostT | None) -> PostT:
+    """Raise 404 if the post doesn't exist."""
+    if not post:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Post not found"
+        )
+    return post
+
+
+def ensure_can_modify(post: Post | Row, current_user: User, action: str) -> None:
+    """
+    Users can only modify their own posts.
+    Admins can modify any post.
+    """
+    if post.author_id != current_user.id and current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Not authorized to {action} this post"
+        )
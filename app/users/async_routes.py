@@ -0,0 +1,196 @@
+"""User management routes (async, DB_MODE=async)."""
+
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.db.session import get_async_read_session, get_async_session
+from app.db.models import User
+from app.users.schemas import UserBulkCreate, UserBulkResult, UserRead, UserUpdate
+from app.users import service
+from app.posts.schemas import PostPage, PostWithAuthorPage
+from app.posts import service as post_service
+from app.auth.dependencies import get_async_current_user, get_async_current_admin
+from app.core.concurrency import if_match_versions, version_etag
+from app.core.hashing import hashing_service
+from app.core.response_cache import response_cache
+from app.core.timing import TimedRoute
+
+router = APIRouter(route_class=TimedRoute)
+
+
+@router.get("/me", response_model=UserRead)
+async def get_current_user_info(
+    response: Response,
+    current_user: User = Depends(get_async_current_user)
+):
+    """
+    Get current authenticated user's information.
+    
+    Requires valid JWT token. The `ETag` is the user's version, for
+    `If-Match` on `PATCH /api/users/{id}`.
+    """
+    response.headers["ETag"] = version_etag(current_user.version, current_user.created_at)
+    return current_user
+
+
+@router.post(
+    "/bulk",
+    response_model=UserBulkResult,
+    status_code=status.HTTP_201_CREATED
+)
+async def create_users_bulk(
+    payload: UserBulkCreate,
+    session: AsyncSession = Depends(get_async_session),
+    current_admin: User = Depends(get_async_current_admin)
+):
+    """
+    Create many users in one request (admin only), e.g. from an identity import.
+    
+    - **items**: Up to USER_BULK_MAX_ITEMS `{"email", "password" | "password_hash",
+      "role", "is_active"}` objects; `password_hash` takes a bcrypt hash from
+      the source system as is
+    
+    Invalid items and emails that are already registered (or repeated in
+    the batch) are skipped; `results` reports each item's outcome by index.
+    Duplicates are found with one `IN` query before any hashing, plain
+    passwords are hashed in parallel across the hashing pool, and rows
+    go in with multi-row `INSERT ... RETURNING`.
+    """
+    users, outcomes = service.validate_bulk_users(payload)
+    if users:
+        emails = [user.email for _, user in users]
+        existing = set((await session.exec(service.existing_emails_statement(emails))).all())
+        users = service.drop_existing(users, existing, outcomes)
+    
+    created = []
+    if users:
+        # Don't keep a pooled connection idle in a transaction while bcrypt runs
+        await session.commit()
+        hashed_passwords = await hashing_service.hash_many_async(
+            [user.password for _, user in users if user.password_hash is None]
+        )
+        statement, rows = service.bulk_user_insert(
+            session.bind.dialect.name, users, hashed_passwords
+        )
+        created = (await session.exec(statement, params=rows)).all()
+        await session.commit()
+    
+    return service.bulk_user_result(len(payload.items), users, outcomes, created)
+
+
+@router.get("/{user_id}", response_model=UserRead)
+async def get_user(
+    user_id: int,
+    response: Response,
+    session: AsyncSession = Depends(get_async_read_session),
+    current_user: User = Depends(get_async_current_user)
+):
+    """
+    Get user by ID.
+    
+    Requires authentication. The `ETag` is the user's version, for
+    `If-Match` on `PATCH /api/users/{id}`.
+    """
+    user = service.ensure_user_found(await session.get(User, user_id))
+    response.headers["ETag"] = version_etag(user.version, user.created_at)
+    return user
+
+
+@router.get("/{user_id}/posts", response_model=PostPage | PostWithAuthorPage)
+async def list_user_posts(
+    user_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+    include_author: bool = False,
+    if_none_match: str | None = Header(None),
+    session: AsyncSession = Depends(get_async_read_session),
+    current_user: User = Depends(get_async_current_user)
+):
+    """
+    List a user's posts, newest first (cursor-paginated).
+    
+    - **limit**: Maximum number of posts to return
+    - **cursor**: `next_cursor` from the previous page
+    - **include_author**: Embed each post's `author` (`id`, `email`)
+    
+    Requires authentication. Seeks on the `(author_id, created_at, id)`
+    index and is cached like `GET /api/posts`.
+    """
+    key = post_service.list_cache_key(True, 0, limit, cursor, user_id, include_author)
+    cached = post_service.cached_response(session, key, if_none_match)
+    if cached is not None:
+        return cached
+    generation = response_cache.generation()
+    
+    service.ensure_user_found(await session.get(User, user_id))
+    statement = post_service.cursor_page_statement(cursor, limit, user_id, include_author)
+    posts = (await session.exec(statement)).all()
+    
+    body, tags = post_service.serialize_post_list(
+        posts, limit, True, cursor, user_id, include_author
+    )
+    return response_cache.store(key, body, tags, if_none_match, generation=generation)
+
+
+@router.patch("/{user_id}", response_model=UserRead)
+async def update_user(
+    user_id: int,
+    user_data: UserUpdate,
+    response: Response,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_async_current_user),
+    if_match: str | None = Header(None)
+):
+    """
+    Update user.
+    
+    Users can only update their own profile.
+    Admins can update any user.
+    
+    Optimistic concurrency: send the user's `ETag` as `If-Match` (412 if
+    it has changed since), or its `version` in the body (409). The update
+    is one conditional `UPDATE ... RETURNING`; no rows are locked.
+    """
+    service.ensure_can_update(user_id, current_user)
+    
+    # Update only provided fields
+    update_data = user_data.model_dump(exclude_unset=True, exclude={"version"})
+    versions = if_match_versions(if_match)
+    
+    # The principal cache is keyed by email: find the one being replaced
+    previous_email = current_user.email if user_id == current_user.id else None
+    if "email" in update_data and previous_email is None:
+        previous_email = (await session.exec(service.email_statement(user_id))).first()
+    
+    statement = service.update_statement(user_id, update_data, versions, user_data.version)
+    user = (await session.exec(statement)).first()
+    if user is None:
+        current = (await session.exec(service.version_statement(user_id))).first()
+        service.raise_update_failure(current, versions, user_data.version)
+    
+    if update_data:
+        await session.commit()
+        service.invalidate_principal(previous_email or user.email, update_data)
+        service.invalidate_author(user_id, update_data)
+    
+    response.headers["ETag"] = version_etag(user.version, user.created_at)
+    return user
+
+
+@router.delete("/{user_id}")
+async def delete_user(
+    user_id: int,
+    session: AsyncSession = Depends(get_async_session),
+    current_admin: User = Depends(get_async_current_admin)
+):
+    """
+    Delete user (admin only).
+    """
+    user = service.ensure_user_found(await session.get(User, user_id))
+    
+    await session.delete(user)
+    await session.commit()
+    service.invalidate_principal(user.email)
+    service.invalidate_author(user_id)
+    
+    return {"message": "User deleted successfully"}
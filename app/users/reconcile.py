@@ -0,0 +1,62 @@
+"""
+Repair drift in the denormalized User.post_count / last_posted_at.
+
+The post write paths keep the stats in step transactionally; drift
+only comes from writes that bypass them (manual SQL, restores, bugs). Running workers
+serve repaired values once their principal cache entries expire.
+
+Run from the project root:
+    python -m app.users.reconcile [--batch-size 1000]
+"""
+
+import argparse
+
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from app.db.engine import engine
+from app.db.models import User
+from app.users import service
+
+# Users checked per UPDATE (and per transaction)
+RECONCILE_BATCH_SIZE = 1000
+
+
+def reconcile_post_counts(session: Session, batch_size: int = RECONCILE_BATCH_SIZE) -> int:
+    """
+    Recompute every user's post stats, one ID range per transaction.
+    
+    Short transactions keep row locks brief on a live database. Each
+    batch locks its users before recounting, so post writes committing
+    meanwhile aren't overwritten with stale counts.
+    
+    Args:
+        session: Session on the primary
+        batch_size: Users per batch
+    
+    Returns:
+        Number of users whose stats were repaired
+    """
+    repaired = 0
+    last_id = session.exec(select(func.max(User.id))).one() or 0
+    for first_id in range(1, last_id + 1, batch_size):
+        batch_last_id = first_id + batch_size - 1
+        session.exec(service.post_stats_lock(first_id, batch_last_id)).all()
+        result = session.exec(service.post_stats_repair(first_id, batch_last_id))
+        session.commit()
+        repaired += result.rowcount
+    return repaired
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch-size", type=int, default=RECONCILE_BATCH_SIZE)
+    args = parser.parse_args()
+    
+    with Session(engine) as session:
+        repaired = reconcile_post_counts(session, args.batch_size)
+    print(f"Repaired post stats of {repaired} user(s)")
+
+
+if __name__ == "__main__":
+    main()
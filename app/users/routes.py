@@ -1,84 +1,179 @@
 """User management routes."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from sqlmodel import Session
 
-from app.db.session import get_session
+from app.db.session import get_read_session, get_session
 from app.db.models import User
-from app.users.schemas import UserRead, UserUpdate
+from app.users.schemas import UserBulkCreate, UserBulkResult, UserRead, UserUpdate
+from app.users import service
+from app.posts.schemas import PostPage, PostWithAuthorPage
+from app.posts import service as post_service
 from app.auth.dependencies import get_current_user, get_current_admin
+from app.core.concurrency import if_match_versions, version_etag
+from app.core.hashing import hashing_service
+from app.core.response_cache import response_cache
+from app.core.timing import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get("/me", response_model=UserRead)
 def get_current_user_info(
+    response: Response,
     current_user: User = Depends(get_current_user)
 ):
     """
     Get current authenticated user's information.
     
-    Requires valid JWT token.
+    Requires valid JWT token. The `ETag` is the user's version, for
+    `If-Match` on `PATCH /api/users/{id}`.
     """
+    response.headers["ETag"] = version_etag(current_user.version, current_user.created_at)
     return current_user
 
 
+@router.post(
+    "/bulk",
+    response_model=UserBulkResult,
+    status_code=status.HTTP_201_CREATED
+)
+def create_users_bulk(
+    payload: UserBulkCreate,
+    session: Session = Depends(get_session),
+    current_admin: User = Depends(get_current_admin)
+):
+    """
+    Create many users in one request (admin only), e.g. from an identity import.
+    
+    - **items**: Up to USER_BULK_MAX_ITEMS `{"email", "password" | "password_hash",
+      "role", "is_active"}` objects; `password_hash` takes a bcrypt hash from
+      the source system as is
+    
+    Invalid items and emails that are already registered (or repeated in
+    the batch) are skipped; `results` reports each item's outcome by index.
+    Duplicates are found with one `IN` query before any hashing, plain
+    passwords are hashed in parallel across the hashing pool, and rows
+    go in with multi-row `INSERT ... RETURNING`.
+    """
+    users, outcomes = service.validate_bulk_users(payload)
+    if users:
+        emails = [user.email for _, user in users]
+        existing = set(session.exec(service.existing_emails_statement(emails)).all())
+        users = service.drop_existing(users, existing, outcomes)
+    
+    created = []
+    if users:
+        # Don't keep a pooled connection idle in a transaction while bcrypt runs
+        session.commit()
+        hashed_passwords = hashing_service.hash_many(
+            [user.password for _, user in users if user.password_hash is None]
+        )
+        statement, rows = service.bulk_user_insert(
+            session.bind.dialect.name, users, hashed_passwords
+        )
+        created = session.exec(statement, params=rows).all()
+        session.commit()
+    
+    return service.bulk_user_result(len(payload.items), users, outcomes, created)
+
+
 @router.get("/{user_id}", response_model=UserRead)
 def get_user(
     user_id: int,
-    session: Session = Depends(get_session),
+    response: Response,
+    session: Session = Depends(get_read_session),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get user by ID.
     
-    Requires authentication.
+    Requires authentication. The `ETag` is the user's version, for
+    `If-Match` on `PATCH /api/users/{id}`.
     """
-    user = session.get(User, user_id)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
+    user = service.ensure_user_found(session.get(User, user_id))
+    response.headers["ETag"] = version_etag(user.version, user.created_at)
     return user
 
 
+@router.get("/{user_id}/posts", response_model=PostPage | PostWithAuthorPage)
+def list_user_posts(
+    user_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+    include_author: bool = False,
+    if_none_match: str | None = Header(None),
+    session: Session = Depends(get_read_session),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    List a user's posts, newest first (cursor-paginated).
+    
+    - **limit**: Maximum number of posts to return
+    - **cursor**: `next_cursor` from the previous page
+    - **include_author**: Embed each post's `author` (`id`, `email`)
+    
+    Requires authentication. Seeks on the `(author_id, created_at, id)`
+    index and is cached like `GET /api/posts`.
+    """
+    key = post_service.list_cache_key(True, 0, limit, cursor, user_id, include_author)
+    cached = post_service.cached_response(session, key, if_none_match)
+    if cached is not None:
+        return cached
+    generation = response_cache.generation()
+    
+    service.ensure_user_found(session.get(User, user_id))
+    statement = post_service.cursor_page_statement(cursor, limit, user_id, include_author)
+    posts = session.exec(statement).all()
+    
+    body, tags = post_service.serialize_post_list(
+        posts, limit, True, cursor, user_id, include_author
+    )
+    return response_cache.store(key, body, tags, if_none_match, generation=generation)
+
+
 @router.patch("/{user_id}", response_model=UserRead)
 def update_user(
     user_id: int,
     user_data: UserUpdate,
+    response: Response,
     session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    if_match: str | None = Header(None)
 ):
     """
     Update user.
     
     Users can only update their own profile.
     Admins can update any user.
-    """
-    user = session.get(User, user_id)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
     
-    # Check permissions
-    if user.id != current_user.id and current_user.role != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to update this user"
-        )
+    Optimistic concurrency: send the user's `ETag` as `If-Match` (412 if
+    it has changed since), or its `version` in the body (409). The update
+    is one conditional `UPDATE ... RETURNING`; no rows are locked.
+    """
+    service.ensure_can_update(user_id, current_user)
     
     # Update only provided fields
-    update_data = user_data.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(user, key, value)
+    update_data = user_data.model_dump(exclude_unset=True, exclude={"version"})
+    versions = if_match_versions(if_match)
     
-    session.add(user)
-    session.commit()
-    session.refresh(user)
+    # The principal cache is keyed by email: find the one being replaced
+    previous_email = current_user.email if user_id == current_user.id else None
+    if "email" in update_data and previous_email is None:
+        previous_email = session.exec(service.email_statement(user_id)).first()
+    
+    statement = service.update_statement(user_id, update_data, versions, user_data.version)
+    user = session.exec(statement).first()
+    if user is None:
+        current = session.exec(service.version_statement(user_id)).first()
+        service.raise_update_failure(current, versions, user_data.version)
     
+    if update_data:
+        session.commit()
+        service.invalidate_principal(previous_email or user.email, update_data)
+        service.invalidate_author(user_id, update_data)
+    
+    response.headers["ETag"] = version_etag(user.version, user.created_at)
     return user
 
 
@@ -91,14 +186,11 @@ def delete_user(
     """
     Delete user (admin only).
     """
-    user = session.get(User, user_id)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
+    user = service.ensure_user_found(session.get(User, user_id))
     
     session.delete(user)
     session.commit()
+    service.invalidate_principal(user.email)
+    service.invalidate_author(user_id)
     
     return {"message": "User deleted successfully"}
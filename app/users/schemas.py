@@ -1,5 +1,20 @@
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator
 from datetime import datetime
+from typing import Any, Literal
+
+from app.core.config import settings
+
+# Hashes accepted from other systems on bulk import (passlib's bcrypt)
+BCRYPT_HASH_PATTERN = r"^\$2[aby]?\$\d{2}\$[./A-Za-z0-9]{53}$"
+
+
+def check_password_strength(password: str) -> str:
+    """Ensure password meets security requirements."""
+    if not any(char.isdigit() for char in password):
+        raise ValueError('Password must contain at least one digit')
+    if not any(char.isupper() for char in password):
+        raise ValueError('Password must contain at least one uppercase letter')
+    return password
 
 
 class UserCreate(BaseModel):
@@ -15,11 +30,7 @@ class UserCreate(BaseModel):
     @classmethod
     def validate_password(cls, v: str) -> str:
         """Ensure password meets security requirements."""
-        if not any(char.isdigit() for char in v):
-            raise ValueError('Password must contain at least one digit')
-        if not any(char.isupper() for char in v):
-            raise ValueError('Password must contain at least one uppercase letter')
-        return v
+        return check_password_strength(v)
 
 
 class UserRead(BaseModel):
@@ -33,6 +44,18 @@ class UserRead(BaseModel):
     role: str
     is_active: bool
     created_at: datetime
+    post_count: int
+    last_posted_at: datetime | None = None
+    version: int
+    
+    class Config:
+        from_attributes = True
+
+
+class AuthorSummary(BaseModel):
+    """Schema for the author embedded in post responses."""
+    id: int
+    email: str
     
     class Config:
         from_attributes = True
@@ -42,10 +65,13 @@ class UserUpdate(BaseModel):
     """
     Schema for updating user.
     
-    All fields are optional (only update what's provided).
+    All fields are optional (only update what's provided). `version` is
+    the version the edit was based on: the update fails with 409 if the
+    user has changed since (like `If-Match` does with 412).
     """
     email: EmailStr | None = None
     is_active: bool | None = None
+    version: int | None = Field(None, ge=1)
     
     class Config:
         extra = "forbid"  # Reject unknown fields
@@ -55,3 +81,65 @@ class UserLogin(BaseModel):
     """Schema for login request."""
     email: EmailStr
     password: str
+
+
+class UserBulkItem(BaseModel):
+    """
+    Schema for one user of a bulk import.
+    
+    Give either a plain `password` (hashed here) or the bcrypt
+    `password_hash` exported by the source system.
+    """
+    email: EmailStr
+    password: str | None = Field(None, min_length=8, max_length=100)
+    password_hash: str | None = Field(None, pattern=BCRYPT_HASH_PATTERN)
+    role: Literal["user", "admin"] = "user"
+    is_active: bool = True
+    
+    class Config:
+        extra = "forbid"
+    
+    @field_validator('password')
+    @classmethod
+    def validate_password(cls, v: str | None) -> str | None:
+        return v if v is None else check_password_strength(v)
+    
+    @model_validator(mode="after")
+    def check_one_password(self) -> "UserBulkItem":
+        if (self.password is None) == (self.password_hash is None):
+            raise ValueError("Give exactly one of password and password_hash")
+        return self
+
+
+class UserBulkCreate(BaseModel):
+    """
+    Schema for creating many users in one request.
+    
+    Items are validated one by one against UserBulkItem, so a bad item
+    is reported by index instead of rejecting the whole payload.
+    """
+    items: list[Any] = Field(..., min_length=1, max_length=settings.USER_BULK_MAX_ITEMS)
+
+
+class UserBulkItemError(BaseModel):
+    """Validation error of one bulk item."""
+    loc: list[str | int]
+    msg: str
+    type: str
+
+
+class UserBulkOutcome(BaseModel):
+    """Schema for what happened to one bulk item."""
+    index: int
+    email: str | None = None  # None if the item has no valid email
+    status: Literal["created", "duplicate", "invalid"]
+    id: int | None = None  # Set when created
+    errors: list[UserBulkItemError] = []
+
+
+class UserBulkResult(BaseModel):
+    """Schema for the outcome of a bulk user import."""
+    created: int
+    duplicates: int
+    invalid: int
+    results: list[UserBulkOutcome]  # One per item, in request order
@@ -0,0 +1,357 @@
+"""User business logic shared by the sync and async routers."""
+
+import importlib
+from datetime import datetime
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from typing import Any, Iterator, NoReturn, Sequence
+from sqlalchemy import Row, case, func, insert, or_, tuple_, update
+from sqlalchemy.sql.dml import ReturningInsert, ReturningUpdate, Update
+from sqlmodel import select
+from sqlmodel.sql.expression import Select
+
+from app.db.models import Post, User
+from app.users.schemas import (
+    UserBulkCreate,
+    UserBulkItem,
+    UserBulkItemError,
+    UserBulkOutcome,
+    UserBulkResult,
+    UserRead,
+)
+from app.auth.cache import principal_cache
+from app.core.concurrency import raise_version_conflict
+from app.core.response_cache import response_cache
+from app.posts.service import author_tag
+
+# Columns of a UserRead, returned by conditional updates
+USER_READ_COLUMNS = tuple(User.__table__.c[name] for name in UserRead.model_fields)
+
+# Dialects with INSERT ... ON CONFLICT DO NOTHING; their modules are imported
+# on first use, the engine only loads the one it connects with
+_CONFLICT_DIALECTS = frozenset({"postgresql", "sqlite"})
+
+
+def ensure_user_found(user: User | None) -> User:
+    """Raise 404 if the user doesn't exist."""
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    return user
+
+
+def ensure_can_update(user_id: int, current_user: User) -> None:
+    """
+    Users can only update their own profile.
+    Admins can update any user.
+    """
+    if user_id != current_user.id and current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to update this user"
+        )
+
+
+def update_statement(
+    user_id: int,
+    values: dict[str, Any],
+    if_match: list[tuple[int, datetime]] | None = None,
+    expected_version: int | None = None
+) -> ReturningUpdate | Select:
+    """
+    Build the conditional update of a user, returning its UserRead columns.
+    
+    Like the posts' update_statement: the version preconditions are part
+    of the WHERE clause and the version is bumped in the database, so a
+    successful update costs one round trip. No row back means the user
+    doesn't exist or has another version: see raise_update_failure.
+    Without values it only runs the checks, leaving the version alone.
+    
+    Args:
+        user_id: User to update
+        values: Columns to set
+        if_match: Versions accepted by If-Match, see if_match_versions
+        expected_version: Version given in the request body
+    """
+    if values:
+        statement = (
+            update(User)
+            .where(User.id == user_id)
+            .values(**values, version=User.version + 1, updated_at=datetime.utcnow())
+            .returning(*USER_READ_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+    else:
+        statement = select(*USER_READ_COLUMNS).where(User.id == user_id)
+    if if_match is not None:
+        statement = statement.where(tuple_(User.version, User.created_at).in_(if_match))
+    if expected_version is not None:
+        statement = statement.where(User.version == expected_version)
+    return statement
+
+
+def email_statement(user_id: int) -> Select:
+    """Build the lookup of a user's current email."""
+    return select(User.email).where(User.id == user_id)
+
+
+def version_statement(user_id: int) -> Select:
+    """Build the lookup that explains a failed update_statement."""
+    return select(User.version, User.created_at).where(User.id == user_id)
+
+
+def raise_update_failure(
+    user: Row | None,
+    if_match: list[tuple[int, datetime]] | None,
+    expected_version: int | None
+) -> NoReturn:
+    """
+    Raise the error for an update_statement that matched no row: 404, then
+    412 or 409 for a version mismatch.
+    
+    Args:
+        user: version_statement row, None if the user doesn't exist
+    """
+    user = ensure_user_found(user)
+    raise_version_conflict(user.version, user.created_at, if_match, expected_version)
+
+
+def invalidate_principal(email: str, update_data: dict | None = None) -> None:
+    """
+    Evict a user from the principal cache after a committed change.
+    
+    Every update bumps the version the cached copy carries, so any change
+    evicts, not just changes to email, role or status.
+    
+    Args:
+        email: User's email before the change
+        update_data: Fields that were changed; None means the user was deleted
+    """
+    subjects = [email]
+    if update_data and update_data.get("email"):
+        subjects.append(update_data["email"])
+    principal_cache.invalidate(*subjects)
+
+
+def validate_bulk_users(
+    payload: UserBulkCreate
+) -> tuple[list[tuple[int, UserBulkItem]], dict[int, UserBulkOutcome]]:
+    """
+    Validate each bulk item against UserBulkItem.
+    
+    Returns:
+        (index, user) pairs to create, and the outcomes of the items that
+        are invalid or repeat an earlier email of the batch
+    """
+    users: list[tuple[int, UserBulkItem]] = []
+    outcomes: dict[int, UserBulkOutcome] = {}
+    seen: set[str] = set()
+    for index, item in enumerate(payload.items):
+        try:
+            user = UserBulkItem.model_validate(item)
+        except ValidationError as exc:
+            email = item.get("email") if isinstance(item, dict) else None
+            outcomes[index] = UserBulkOutcome(
+                index=index,
+                email=email if isinstance(email, str) else None,
+                status="invalid",
+                errors=[
+                    UserBulkItemError(loc=list(error["loc"]), msg=error["msg"], type=error["type"])
+                    for error in exc.errors(include_url=False)
+                ]
+            )
+            continue
+        
+        if user.email in seen:
+            outcomes[index] = UserBulkOutcome(index=index, email=user.email, status="duplicate")
+            continue
+        seen.add(user.email)
+        users.append((index, user))
+    return users, outcomes
+
+
+def existing_emails_statement(emails: list[str]) -> Select:
+    """One `IN` lookup on the ix_user_email index for a whole batch."""
+    return select(User.email).where(User.email.in_(emails))
+
+
+def drop_existing(
+    users: list[tuple[int, UserBulkItem]],
+    existing: set[str],
+    outcomes: dict[int, UserBulkOutcome]
+) -> list[tuple[int, UserBulkItem]]:
+    """Record already registered emails as duplicates, before paying for bcrypt."""
+    remaining = []
+    for index, user in users:
+        if user.email in existing:
+            outcomes[index] = UserBulkOutcome(index=index, email=user.email, status="duplicate")
+        else:
+            remaining.append((index, user))
+    return remaining
+
+
+def bulk_user_insert(
+    dialect: str,
+    users: list[tuple[int, UserBulkItem]],
+    hashed_passwords: list[str]
+) -> tuple[ReturningInsert, list[dict]]:
+    """
+    Build a bulk INSERT ... RETURNING for new users and its rows.
+    
+    Execute as `session.exec(statement, params=rows)`, like the posts'
+    bulk_insert. Emails registered concurrently since
+    existing_emails_statement are skipped by ON CONFLICT DO NOTHING
+    (PostgreSQL, SQLite) and simply not returned.
+    
+    Args:
+        dialect: Database dialect name
+        users: Users to create
+        hashed_passwords: Hashes of the users given a plain password, in order
+    """
+    hashed: Iterator[str] = iter(hashed_passwords)
+    now = datetime.utcnow()
+    rows = [
+        {
+            "email": user.email,
+            "hashed_password": user.password_hash or next(hashed),
+            "role": user.role,
+            "is_active": user.is_active,
+            "post_count": 0,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for _, user in users
+    ]
+    if dialect in _CONFLICT_DIALECTS:
+        dialect_module = importlib.import_module(f"sqlalchemy.dialects.{dialect}")
+        statement = dialect_module.insert(User.__table__).on_conflict_do_nothing(
+            index_elements=["email"]
+        )
+    else:
+        statement = insert(User.__table__)
+    return statement.returning(User.id, User.email), rows
+
+
+def bulk_user_result(
+    count: int,
+    users: list[tuple[int, UserBulkItem]],
+    outcomes: dict[int, UserBulkOutcome],
+    created: Sequence[Row]
+) -> UserBulkResult:
+    """Assemble the per-item outcomes of a bulk import, in request order."""
+    ids = {row.email: row.id for row in created}
+    for index, user in users:
+        if user.email in ids:
+            outcomes[index] = UserBulkOutcome(
+                index=index, email=user.email, status="created", id=ids[user.email]
+            )
+        else:
+            # Lost a race with a concurrent registration
+            outcomes[index] = UserBulkOutcome(index=index, email=user.email, status="duplicate")
+    
+    results = [outcomes[index] for index in range(count)]
+    return UserBulkResult(
+        created=len(ids),
+        duplicates=sum(outcome.status == "duplicate" for outcome in results),
+        invalid=sum(outcome.status == "invalid" for outcome in results),
+        results=results
+    )
+
+
+def post_count_increment(author_id: int, count: int, posted_at: datetime) -> Update:
+    """
+    Build the stats update for `count` new posts by the author.
+    
+    Execute it in the transaction that inserts the posts. The increment
+    happens in the database (`post_count = post_count + n`), so concurrent
+    writers can't lose updates, and last_posted_at only moves forward
+    whatever order they commit in. Returns the author's email for
+    invalidate_post_stats.
+    """
+    last_posted_at = case(
+        (
+            User.last_posted_at.is_(None) | (User.last_posted_at < posted_at),
+            posted_at
+        ),
+        else_=User.last_posted_at
+    )
+    return (
+        update(User)
+        .where(User.id == author_id)
+        .values(post_count=User.post_count + count, last_posted_at=last_posted_at)
+        .returning(User.email)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def post_count_decrement(author_id: int) -> Update:
+    """
+    Build the stats update for a deleted post of the author.
+    
+    Execute it after the post's delete_statement returned a row, in the
+    same transaction. last_posted_at is recomputed with a seek on the
+    (author_id, created_at, id) index. Returns the author's email.
+    """
+    latest = select(func.max(Post.created_at)).where(Post.author_id == author_id)
+    return (
+        update(User)
+        .where(User.id == author_id)
+        .values(post_count=User.post_count - 1, last_posted_at=latest.scalar_subquery())
+        .returning(User.email)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def post_stats_lock(first_id: int, last_id: int) -> Select:
+    """
+    Build the row lock taken before post_stats_repair on the same range.
+    
+    Under READ COMMITTED, an UPDATE that waits on a row a post write is
+    changing re-checks the row, but its recount subqueries keep the
+    statement's snapshot, so it would overwrite the committed increment
+    with a stale count. Locking first waits for those writers; the
+    UPDATE's snapshot then includes their posts, and later writers
+    increment on top of the repaired value. (SQLite serializes writers
+    and ignores FOR UPDATE.)
+    """
+    return select(User.id).where(User.id.between(first_id, last_id)).with_for_update()
+
+
+def post_stats_repair(first_id: int, last_id: int) -> Update:
+    """
+    Build the reconciliation update for users with IDs in [first_id, last_id].
+    
+    Recomputes the stats from `post` inside the UPDATE and only writes the
+    rows that drifted, so the rowcount is the number of repaired users.
+    Run it after post_stats_lock, in the same transaction.
+    """
+    count = select(func.count()).where(Post.author_id == User.id).scalar_subquery()
+    latest = select(func.max(Post.created_at)).where(Post.author_id == User.id).scalar_subquery()
+    return (
+        update(User)
+        .where(User.id.between(first_id, last_id))
+        .where(or_(User.post_count != count, User.last_posted_at.is_distinct_from(latest)))
+        .values(post_count=count, last_posted_at=latest)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def invalidate_post_stats(email: str) -> None:
+    """Evict the author from the principal cache after their post stats changed."""
+    principal_cache.invalidate(email)
+
+
+def invalidate_author(user_id: int, update_data: dict | None = None) -> None:
+    """
+    Evict cached post listings scoped to or embedding the user after a
+    committed change.
+    
+    Args:
+        user_id: User's ID
+        update_data: Fields that were changed; None means the user was deleted
+    """
+    if update_data is not None and "email" not in update_data:
+        return
+    response_cache.invalidate(author_tag(user_id))
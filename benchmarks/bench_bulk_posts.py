@@ -0,0 +1,80 @@
+"""
+Benchmark: importing posts one request at a time vs POST /api/posts/bulk.
+
+Run from the project root:
+    python -m benchmarks.bench_bulk_posts [--posts 2000] [--batch 1000]
+
+Runs the real app in-process against a scratch SQLite database (override
+with DATABASE_URL), so the difference is per-request and per-row overhead.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/bench_bulk_posts.db"
+)
+os.environ.setdefault("JWT_SECRET", "benchmark-secret-benchmark-secret")
+os.environ.setdefault("HASH_POOL_WORKERS", "0")
+os.environ.setdefault("METRICS_ENABLED", "false")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("LOG_LEVEL", "WARNING")  # Keep request logs out of the report
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+
+from app.db.engine import engine  # noqa: E402
+from app.main import create_app  # noqa: E402
+
+
+def login(client: TestClient) -> dict[str, str]:
+    credentials = {"email": "bench@example.com", "password": "Benchmark-Passw0rd"}
+    client.post("/api/auth/register", json=credentials)
+    response = client.post(
+        "/api/auth/login",
+        data={"username": credentials["email"], "password": credentials["password"]},
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    items = [
+        {"title": f"Post {i}", "content": "Lorem ipsum dolor sit amet. " * 10}
+        for i in range(args.posts)
+    ]
+
+    with TestClient(create_app()) as client:
+        headers = login(client)
+
+        started = time.perf_counter()
+        for item in items:
+            response = client.post("/api/posts/", json=item, headers=headers)
+            assert response.status_code == 201, response.text
+        single = args.posts / (time.perf_counter() - started)
+
+        started = time.perf_counter()
+        for start in range(0, args.posts, args.batch):
+            response = client.post(
+                "/api/posts/bulk",
+                json={"items": items[start:start + args.batch]},
+                headers=headers,
+            )
+            assert response.status_code == 201, response.text
+        bulk = args.posts / (time.perf_counter() - started)
+
+    print(f"{'POST /api/posts (before)':<34} {single:>10,.0f} posts/sec")
+    print(f"{'POST /api/posts/bulk (after)':<34} {bulk:>10,.0f} posts/sec")
+    print(f"{'speedup':<34} {bulk / single:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark: registering users one at a time vs POST /api/users/bulk.
+
+Run from the project root:
+    python -m benchmarks.bench_bulk_users [--users 64] [--imported 10000] [--batch 1000]
+
+Runs the real app in-process against a scratch SQLite database (override
+with DATABASE_URL). Plain passwords are bound by bcrypt, so the bulk path
+scales with HASH_POOL_WORKERS (default: CPU count). Imports that carry
+the source system's bcrypt hashes skip hashing entirely; `--imported`
+users are created that way.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/bench_bulk_users.db"
+)
+os.environ.setdefault("JWT_SECRET", "benchmark-secret-benchmark-secret")
+os.environ.setdefault("METRICS_ENABLED", "false")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("LOG_LEVEL", "WARNING")  # Keep request logs out of the report
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlmodel import Session, SQLModel, select  # noqa: E402
+
+from app.core.hashing import hashing_service  # noqa: E402
+from app.core.security import hash_password  # noqa: E402
+from app.db.engine import engine  # noqa: E402
+from app.db.models import User  # noqa: E402
+from app.main import create_app  # noqa: E402
+
+PASSWORD = "Benchmark-Passw0rd"
+
+
+def admin_headers(client: TestClient) -> dict[str, str]:
+    credentials = {"email": "admin@bench.example.com", "password": PASSWORD}
+    client.post("/api/auth/register", json=credentials)
+    with Session(engine) as session:
+        admin = session.exec(select(User).where(User.email == credentials["email"])).one()
+        admin.role = "admin"
+        session.add(admin)
+        session.commit()
+    response = client.post(
+        "/api/auth/login",
+        data={"username": credentials["email"], "password": credentials["password"]},
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def bulk(client: TestClient, headers: dict[str, str], items: list[dict], batch: int) -> float:
+    started = time.perf_counter()
+    for start in range(0, len(items), batch):
+        response = client.post(
+            "/api/users/bulk", json={"items": items[start:start + batch]}, headers=headers
+        )
+        assert response.status_code == 201, response.text
+        assert response.json()["created"] == len(items[start:start + batch])
+    return len(items) / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=64, help="users with plain passwords")
+    parser.add_argument("--imported", type=int, default=10_000, help="users with bcrypt hashes")
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+
+    with TestClient(create_app()) as client:
+        headers = admin_headers(client)
+
+        started = time.perf_counter()
+        for i in range(args.users):
+            response = client.post(
+                "/api/auth/register",
+                json={"email": f"single{i}@bench.example.com", "password": PASSWORD},
+            )
+            assert response.status_code == 201, response.text
+        single = args.users / (time.perf_counter() - started)
+
+        plain = bulk(client, headers, [
+            {"email": f"bulk{i}@bench.example.com", "password": PASSWORD}
+            for i in range(args.users)
+        ], args.batch)
+
+        hashed_password = hash_password(PASSWORD)
+        imported = bulk(client, headers, [
+            {"email": f"imported{i}@bench.example.com", "password_hash": hashed_password}
+            for i in range(args.imported)
+        ], args.batch)
+
+    print(f"hashing pool workers: {hashing_service.max_workers}")
+    print(f"{'POST /api/auth/register (before)':<40} {single:>10,.1f} users/sec")
+    print(f"{'POST /api/users/bulk, passwords':<40} {plain:>10,.1f} users/sec")
+    print(f"{'POST /api/users/bulk, password_hash':<40} {imported:>10,.1f} users/sec")
+
+
+if __name__ == "__main__":
+    main()
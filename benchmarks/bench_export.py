@@ -0,0 +1,126 @@
+"""
+Benchmark: peak memory of GET /api/posts/export vs one big list_posts page.
+
+Run from the project root:
+    python -m benchmarks.bench_export [--rows 100000]
+
+Seeds a scratch SQLite database (override with DATABASE_URL), then drives
+the app's ASGI callable directly with a `send` that discards the body:
+the test clients buffer whole responses, which would hide the difference.
+Peak Python heap is measured with tracemalloc.
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/bench_export.db"
+)
+os.environ.setdefault("JWT_SECRET", "benchmark-secret-benchmark-secret")
+os.environ.setdefault("RESPONSE_CACHE_BACKEND", "none")
+os.environ.setdefault("METRICS_ENABLED", "false")
+# "before" is a single page far beyond the production cap
+os.environ.setdefault("POST_LIST_MAX_LIMIT", "100000000")
+
+from sqlalchemy import insert  # noqa: E402
+from sqlmodel import Session, SQLModel  # noqa: E402
+
+from app.db.engine import async_engine, engine  # noqa: E402
+from app.db.models import Post, User  # noqa: E402
+from app.main import create_app  # noqa: E402
+
+
+def seed(rows: int) -> None:
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    now = datetime.utcnow()
+    with Session(engine) as session:
+        author = User(email="bench@example.com", hashed_password="-")
+        session.add(author)
+        session.flush()
+        for start in range(0, rows, 10_000):
+            session.exec(insert(Post.__table__), params=[
+                {
+                    "title": f"Post {i}",
+                    "content": "Lorem ipsum dolor sit amet. " * 10,
+                    "author_id": author.id,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(start, min(start + 10_000, rows))
+            ])
+        session.commit()
+
+
+async def fetch(app, path: str, query: str) -> int:
+    """Run one GET through the ASGI app, returning the body size."""
+    size = 0
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": query.encode(), "root_path": "", "headers": [],
+        "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+
+    requested = False
+    done = asyncio.Event()
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Like a client that stays connected until the response is complete
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal size
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200, message
+        elif message["type"] == "http.response.body":
+            size += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    done.set()
+    return size
+
+
+async def measure(app, label: str, path: str, query: str) -> None:
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = await fetch(app, path, query)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{label:<28} {size / 2**20:>8.1f} MiB sent  "
+        f"{peak / 2**20:>8.1f} MiB peak heap  {elapsed:>6.1f}s"
+    )
+
+
+async def run(rows: int) -> None:
+    app = create_app()
+    await measure(app, "list_posts (before)", "/api/posts/", f"limit={rows}")
+    await measure(app, "export (after)", "/api/posts/export", "")
+    if async_engine is not None:
+        # aiosqlite connections own non-daemon threads
+        await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    seed(args.rows)
+    asyncio.run(run(args.rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark: response_model serialization cost per response class.
+
+Run from the project root:
+    python -m benchmarks.bench_json_response [--limit 100] [--requests 2000]
+
+Mounts list_posts as it is without the projected-row fast path, a
+`response_model=list[PostRead]` route returning `--limit` Post entities,
+on apps created with each response class. "before" is FastAPI's
+JSONResponse: the model is dumped to a JSON-compatible dict, then
+json.dumps walks it again. The others render the validated model straight
+to bytes. Reports the median `serialize` phase from Server-Timing
+(response validation + serialization + rendering), which is CPU only:
+the route does no I/O.
+"""
+
+import argparse
+import os
+import re
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/bench_json_response.db"
+)
+os.environ.setdefault("JWT_SECRET", "benchmark-secret-benchmark-secret")
+os.environ.setdefault("METRICS_ENABLED", "false")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("LOG_LEVEL", "WARNING")  # Keep request logs out of the report
+os.environ.setdefault("LOAD_SHED_ENABLED", "false")
+os.environ["SERVER_TIMING_ENABLED"] = "true"
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.responses import FastJSONResponse  # noqa: E402
+from app.db.models import Post  # noqa: E402
+from app.main import create_app  # noqa: E402
+from app.posts.schemas import PostRead  # noqa: E402
+
+SERIALIZE = re.compile(r"serialize;dur=([\d.]+)")
+
+
+def response_classes() -> dict[str, type[JSONResponse]]:
+    classes = {
+        "JSONResponse (before)": JSONResponse,
+        "FastJSONResponse": FastJSONResponse,
+    }
+    try:
+        import orjson
+    except ImportError:
+        return classes
+
+    class ORJSONResponse(FastJSONResponse):
+        encode = staticmethod(orjson.dumps)
+
+    classes["ORJSONResponse"] = ORJSONResponse
+    return classes
+
+
+def measure(response_class: type[JSONResponse], posts: list[Post], requests: int) -> tuple[float, float, bytes]:
+    app = create_app(response_class=response_class)
+
+    @app.get("/bench/posts", response_model=list[PostRead])
+    def bench_posts():
+        return posts
+
+    with TestClient(app) as client:
+        for _ in range(50):  # warm up
+            client.get("/bench/posts")
+        serialize = []
+        started = time.perf_counter()
+        for _ in range(requests):
+            response = client.get("/bench/posts")
+            serialize.append(float(SERIALIZE.search(response.headers["Server-Timing"]).group(1)))
+        elapsed = time.perf_counter() - started
+    return statistics.median(serialize), requests / elapsed, response.content
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    now = datetime.utcnow()
+    posts = [
+        Post(
+            id=i,
+            title=f"Post {i}",
+            content="Lorem ipsum dolor sit amet. " * 10,
+            author_id=1,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(1, args.limit + 1)
+    ]
+
+    print(f"{'response class':<24} {'serialize p50':>14} {'requests/sec':>13}")
+    bodies = set()
+    for label, response_class in response_classes().items():
+        serialize_ms, rate, body = measure(response_class, posts, args.requests)
+        bodies.add(body)
+        print(f"{label:<24} {serialize_ms:>12.3f}ms {rate:>13,.0f}")
+    assert len(bodies) == 1, "response classes rendered different bodies"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark: request logging written inline vs through the log queue.
+
+Run from the project root:
+    python -m benchmarks.bench_logging [--requests 5000] [--concurrency 50] [--write-ms 0.2]
+
+TracingMiddleware wraps a trivial JSON endpoint driven in-process through
+httpx's ASGI transport, logging two JSON lines per request. The sink's
+write() blocks for `--write-ms`, like a slow disk or a pipe the log
+shipper isn't draining fast enough. "before" writes from the request
+path with a StreamHandler; "after" is LogPipeline, whose writer thread
+takes that hit instead. Reports throughput and p99 latency.
+"""
+
+import argparse
+import asyncio
+import io
+import logging
+import os
+import statistics
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+os.environ.setdefault("JWT_SECRET", "benchmark-secret-benchmark-secret")
+os.environ["SERVER_TIMING_ENABLED"] = "true"
+
+import httpx  # noqa: E402
+from fastapi import FastAPI, Request  # noqa: E402
+
+from app.core.logs import JSONFormatter, LogPipeline  # noqa: E402
+from app.core.tracing import TracingMiddleware  # noqa: E402
+
+
+class SlowStream(io.StringIO):
+    """Text sink whose writes block, and that counts the lines it got."""
+
+    def __init__(self, write_seconds: float):
+        super().__init__()
+        self.write_seconds = write_seconds
+        self.lines = 0
+
+    def write(self, text: str) -> int:
+        time.sleep(self.write_seconds)
+        self.lines += text.count("\n")
+        return len(text)
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(TracingMiddleware)
+
+    @app.get("/ping")
+    async def ping(request: Request):
+        return {"trace_id": request.state.trace_id}
+
+    return app
+
+
+async def drive(app: FastAPI, total: int, concurrency: int) -> tuple[float, float]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        remaining = iter(range(total))
+        latencies = []
+
+        async def worker() -> None:
+            for _ in remaining:
+                started = time.perf_counter()
+                await client.get("/ping")
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        rate = total / (time.perf_counter() - started)
+    return rate, statistics.quantiles(latencies, n=100)[98] * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--write-ms", type=float, default=0.2)
+    args = parser.parse_args()
+
+    app = build_app()
+    app_logger = logging.getLogger("app")
+    root = logging.getLogger()
+
+    stream = SlowStream(args.write_ms / 1000)
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(JSONFormatter())
+    app_logger.setLevel(logging.INFO)
+    root.addHandler(handler)
+    asyncio.run(drive(app, 200, args.concurrency))  # warm up
+    before = asyncio.run(drive(app, args.requests, args.concurrency))
+    root.removeHandler(handler)
+    app_logger.setLevel(logging.NOTSET)
+
+    stream = SlowStream(args.write_ms / 1000)
+    pipeline = LogPipeline("INFO", True, queue_size=10_000, sample_rate=1.0, stream=stream)
+    pipeline.start()
+    asyncio.run(drive(app, 200, args.concurrency))  # warm up
+    after = asyncio.run(drive(app, args.requests, args.concurrency))
+    pipeline.stop()
+    stats = pipeline.stats()
+
+    print(f"{'':<26} {'req/sec':>10} {'p99 ms':>8}")
+    print(f"{'StreamHandler (before)':<26} {before[0]:>10,.0f} {before[1]:>8.2f}")
+    print(f"{'LogPipeline (after)':<26} {after[0]:>10,.0f} {after[1]:>8.2f}")
+    print(f"pipeline: {stream.lines:,} lines written, {stats['dropped_total']:,} dropped")
+
+
+if __name__ == "__main__":
+    main()
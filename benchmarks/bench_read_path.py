@@ -0,0 +1,113 @@
+"""
+Benchmark: list_posts read path with ORM entities vs projected rows.
+
+Run from the project root:
+    python -m benchmarks.bench_read_path [--rows 10000] [--limit 100] [--requests 300]
+
+"before" loads Post entities and validates them into PostRead from
+attributes before serializing; "after" is the service's fast path:
+PostRead columns as plain rows, serialized by a compiled TypedDict
+serializer. Each request uses its own session, like a handler. Reports
+rows/sec and the peak memory allocated while serving one request.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/bench_read_path.db"
+)
+os.environ.setdefault("JWT_SECRET", "benchmark-secret-benchmark-secret")
+
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+from sqlmodel import Session, SQLModel, select  # noqa: E402
+
+from app.db.engine import engine  # noqa: E402
+from app.db.models import Post, User  # noqa: E402
+from app.posts import service  # noqa: E402
+from app.posts.schemas import PostRead  # noqa: E402
+
+post_list_adapter = TypeAdapter(list[PostRead])
+
+
+def seed(rows: int) -> None:
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    now = datetime.utcnow()
+    with Session(engine) as session:
+        author = User(email="bench@example.com", hashed_password="-")
+        session.add(author)
+        session.flush()
+        session.exec(insert(Post.__table__), params=[
+            {
+                "title": f"Post {i}",
+                "content": "Lorem ipsum dolor sit amet. " * 10,
+                "author_id": author.id,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(rows)
+        ])
+        session.commit()
+
+
+def orm_page(skip: int, limit: int) -> bytes:
+    with Session(engine) as session:
+        posts = session.exec(select(Post).offset(skip).limit(limit)).all()
+        return post_list_adapter.dump_json(
+            post_list_adapter.validate_python(posts, from_attributes=True)
+        )
+
+
+def row_page(skip: int, limit: int) -> bytes:
+    with Session(engine) as session:
+        rows = session.exec(service.offset_page_statement(skip, limit)).all()
+        body, _ = service.serialize_post_list(rows, limit, False, None)
+        return body
+
+
+def run(label: str, page, args: argparse.Namespace) -> None:
+    pages = max(args.rows // args.limit, 1)
+    for i in range(20):  # warm up
+        page((i % pages) * args.limit, args.limit)
+
+    started = time.perf_counter()
+    for i in range(args.requests):
+        page((i % pages) * args.limit, args.limit)
+    rate = args.requests * args.limit / (time.perf_counter() - started)
+
+    tracemalloc.start()
+    peaks = []
+    for i in range(20):
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        page((i % pages) * args.limit, args.limit)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+
+    print(
+        f"{label:<32} {rate:>10,.0f} rows/sec  "
+        f"{sorted(peaks)[len(peaks) // 2] / 1024:>8.0f} KiB peak/request"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+
+    seed(args.rows)
+    assert orm_page(0, args.limit) == row_page(0, args.limit)
+    run("ORM + PostRead (before)", orm_page, args)
+    run("projected rows (after)", row_page, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Benchmark: full-text search vs a LIKE scan over a synthetic corpus.
+
+Run from the project root:
+    python -m benchmarks.bench_search [--rows 1000000] [--limit 20] [--repeat 5]
+
+Seeds a scratch database (override with DATABASE_URL; the FTS5 index on
+SQLite, the GIN index on PostgreSQL) with posts whose words follow a
+Zipf distribution, so queries range from rare to very common terms.
+"before" is what search looked like without an index: a
+`title/content LIKE '%term%'` scan, newest first. "after" is
+search.search_statement: first page, then the page after its cursor.
+Reports the median latency of each.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/bench_search.db"
+)
+os.environ.setdefault("JWT_SECRET", "benchmark-secret-benchmark-secret")
+
+from sqlalchemy import and_, insert, or_  # noqa: E402
+from sqlmodel import Session, SQLModel, select  # noqa: E402
+
+from app.core.pagination import encode_rank_cursor  # noqa: E402
+from app.db.engine import engine  # noqa: E402
+from app.db.models import Post, User  # noqa: E402
+from app.posts import search  # noqa: E402
+
+VOCABULARY_SIZE = 50_000
+BATCH_SIZE = 10_000
+
+
+def vocabulary() -> list[str]:
+    """Pronounceable pseudo-words, ranked by frequency."""
+    rng = random.Random(0)
+    syllables = [c + v for c in "bcdfghklmnprstvz" for v in "aeiou"]
+    words: dict[str, None] = {}
+    while len(words) < VOCABULARY_SIZE:
+        words["".join(rng.choices(syllables, k=rng.randint(2, 4)))] = None
+    return list(words)
+
+
+def seed(rows: int, words: list[str]) -> None:
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    rng = random.Random(1)
+    # Zipf (s=1): the word of rank r appears with probability ~ 1/r
+    weights = [1 / rank for rank in range(1, len(words) + 1)]
+    started = datetime.utcnow() - timedelta(seconds=rows)
+    with Session(engine) as session:
+        author = User(email="bench@example.com", hashed_password="-")
+        session.add(author)
+        session.flush()
+        for start in range(0, rows, BATCH_SIZE):
+            count = min(BATCH_SIZE, rows - start)
+            text = rng.choices(words, weights, k=count * 48)
+            session.exec(insert(Post.__table__), params=[
+                {
+                    "title": " ".join(text[i * 48:i * 48 + 6]),
+                    "content": " ".join(text[i * 48 + 6:(i + 1) * 48]),
+                    "author_id": author.id,
+                    "created_at": started + timedelta(seconds=start + i),
+                    "updated_at": started + timedelta(seconds=start + i),
+                }
+                for i in range(count)
+            ])
+        session.commit()
+
+
+def like_page(session: Session, q: str, limit: int) -> list:
+    """Unindexed baseline: every term must appear somewhere in the post."""
+    conditions = [
+        or_(Post.title.contains(term), Post.content.contains(term))
+        for term in q.split()
+    ]
+    statement = (
+        select(Post.id, Post.title)
+        .where(and_(*conditions))
+        .order_by(Post.created_at.desc(), Post.id.desc())
+        .limit(limit)
+    )
+    return session.exec(statement).all()
+
+
+def search_page(session: Session, q: str, cursor: str | None, limit: int) -> list:
+    statement = search.search_statement(session.bind.dialect.name, q, cursor, limit)
+    return session.exec(statement).all()
+
+
+def timed(fn, repeat: int) -> tuple[float, object]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-seed", action="store_true", help="reuse the database")
+    args = parser.parse_args()
+
+    words = vocabulary()
+    if not args.skip_seed:
+        started = time.perf_counter()
+        seed(args.rows, words)
+        print(f"seeded {args.rows:,} posts in {time.perf_counter() - started:.0f}s")
+
+    queries = {
+        "rare": words[20_000],
+        "medium": words[500],
+        "common": words[3],
+        "two terms": f"{words[50]} {words[400]}",
+    }
+    print(f"{'query':<10} {'LIKE scan':>12} {'search p1':>12} {'search p2':>12}")
+    with Session(engine) as session:
+        for label, q in queries.items():
+            like_ms, _ = timed(lambda: like_page(session, q, args.limit), args.repeat)
+            first_ms, rows = timed(
+                lambda: search_page(session, q, None, args.limit), args.repeat
+            )
+            next_page = "-"
+            if len(rows) > args.limit:
+                last = rows[args.limit - 1]
+                cursor = encode_rank_cursor(last.score, last.id)
+                next_ms, _ = timed(
+                    lambda: search_page(session, q, cursor, args.limit), args.repeat
+                )
+                next_page = f"{next_ms:.1f}ms"
+            print(f"{label:<10} {like_ms:>10.1f}ms {first_ms:>10.1f}ms {next_page:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark: cold start of a new worker, up to its first requests.
+
+Run from the project root:
+    python -m benchmarks.bench_startup [--runs 5]
+
+Each run starts a fresh interpreter that imports app.main, runs the
+lifespan startup (where the warmup hook runs, if STARTUP_WARMUP is on)
+and then sends its first requests: a public read, a login and an
+authenticated read. Against a scratch SQLite database (override with
+DATABASE_URL). Reports the median of each phase over `--runs`, and
+"first response": interpreter start to the first login answered.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/bench_startup.db"
+)
+os.environ.setdefault("JWT_SECRET", "benchmark-secret-benchmark-secret")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("LOG_LEVEL", "WARNING")  # Keep request logs out of the report
+
+EMAIL, PASSWORD = "startup@bench.example.com", "Benchmark-Passw0rd"
+
+# Runs in the fresh interpreter; prints one JSON line of phase timings (ms)
+WORKER = f"""
+import json, time
+started = time.perf_counter()
+import app.main
+application = app.main.app
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(application) as client:
+    ready = time.perf_counter()
+    timings = {{"import": imported - started, "startup": ready - imported}}
+    def timed(name, *args, **kwargs):
+        request_started = time.perf_counter()
+        response = client.request(*args, **kwargs)
+        assert response.status_code == 200, response.text
+        timings[name] = time.perf_counter() - request_started
+        return response
+    timed("GET /api/posts/1", "GET", "/api/posts/1")
+    token = timed(
+        "POST /api/auth/login", "POST", "/api/auth/login",
+        data={{"username": "{EMAIL}", "password": "{PASSWORD}"}},
+    ).json()["access_token"]
+    timings["first response"] = time.perf_counter() - started
+    timed("GET /api/users/me", "GET", "/api/users/me",
+          headers={{"Authorization": "Bearer " + token}})
+print(json.dumps({{name: seconds * 1000 for name, seconds in timings.items()}}))
+"""
+
+
+def seed() -> None:
+    from sqlmodel import Session, SQLModel
+
+    from app.core.security import hash_password
+    from app.db.engine import engine
+    from app.db.models import Post, User
+
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        user = User(email=EMAIL, hashed_password=hash_password(PASSWORD))
+        session.add(user)
+        session.flush()
+        session.add(Post(title="Cold start", content="First post", author_id=user.id))
+        session.commit()
+    engine.dispose()
+
+
+def run_worker() -> dict[str, float]:
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", WORKER], capture_output=True, text=True, check=True
+    )
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings["process total"] = (time.perf_counter() - started) * 1000
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    seed()
+    runs = [run_worker() for _ in range(args.runs)]
+    for name in runs[0]:
+        median = statistics.median(run[name] for run in runs)
+        print(f"{name:<24} {median:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
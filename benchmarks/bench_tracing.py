@@ -0,0 +1,92 @@
+"""
+Benchmark: TracingMiddleware as BaseHTTPMiddleware vs plain ASGI.
+
+Run from the project root:
+    python -m benchmarks.bench_tracing [--requests 5000] [--concurrency 50]
+
+Both variants wrap the same trivial JSON endpoint and are driven in-process
+through httpx's ASGI transport, so the difference is middleware overhead.
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+import uuid
+
+import httpx
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.tracing import TracingMiddleware
+
+logger = logging.getLogger("benchmarks.tracing")
+
+
+class LegacyTracingMiddleware(BaseHTTPMiddleware):
+    """The previous BaseHTTPMiddleware implementation, for comparison."""
+
+    async def dispatch(self, request: Request, call_next):
+        trace_id = request.headers.get("X-Trace-ID") or str(uuid.uuid4())
+        request.state.trace_id = trace_id
+        logger.info(
+            f"[{trace_id}] {request.method} {request.url.path}",
+            extra={"trace_id": trace_id}
+        )
+        response = await call_next(request)
+        response.headers["X-Trace-ID"] = trace_id
+        logger.info(
+            f"[{trace_id}] Response: {response.status_code}",
+            extra={"trace_id": trace_id}
+        )
+        return response
+
+
+def build_app(middleware: type) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(middleware)
+
+    @app.get("/ping")
+    async def ping(request: Request):
+        return {"trace_id": request.state.trace_id}
+
+    return app
+
+
+async def drive(app: FastAPI, total: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        remaining = iter(range(total))
+
+        async def worker() -> None:
+            for _ in remaining:
+                response = await client.get("/ping")
+                assert "x-trace-id" in response.headers
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return total / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    results = {}
+    for label, middleware in (
+        ("BaseHTTPMiddleware (before)", LegacyTracingMiddleware),
+        ("pure ASGI (after)", TracingMiddleware),
+    ):
+        app = build_app(middleware)
+        asyncio.run(drive(app, 200, args.concurrency))  # warm up
+        results[label] = asyncio.run(drive(app, args.requests, args.concurrency))
+        print(f"{label:<30} {results[label]:>10,.0f} req/sec")
+
+    before, after = results.values()
+    print(f"{'speedup':<30} {after / before:>10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
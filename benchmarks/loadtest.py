@@ -0,0 +1,392 @@
+"""
+Load test: mixed API workload at fixed concurrency, with a JSON baseline.
+
+Run from the project root:
+    python -m benchmarks.loadtest [--users 1000] [--posts 100000]
+        [--concurrency 32] [--duration 30] [--mix login=2,me=20,list=40,get=30,create=8]
+        [--output loadtest.json] [--baseline baseline.json] [--tolerance 0.15]
+
+Starts create_app() in-process, with its lifespan, and drives it over
+httpx's ASGI transport, so results measure the app rather than a network
+or server setup. By default it uses a scratch SQLite database. Point
+DATABASE_URL at a local Postgres to measure that instead; DB_MODE and the
+other settings are read from the environment as usual.
+
+The database is seeded with `--users` users and `--posts` posts. Authors
+follow a Zipf distribution, so a few users are prolific. `--concurrency`
+clients then replay the weighted mix for `--duration` seconds, after a
+warm-up. Each client holds an access token, like a logged-in browser.
+
+For each operation the report covers p50/p95/p99 latency, throughput and
+DB queries per request. Query counts come from the Server-Timing header.
+`--output` writes the report as JSON; `--baseline` compares the run with
+an earlier report and exits with status 1 if a hot path regressed.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/loadtest.db"
+)
+os.environ.setdefault("JWT_SECRET", "benchmark-secret-benchmark-secret")
+# Query counts are read from this header
+os.environ["SERVER_TIMING_ENABLED"] = "true"
+# Measure the app itself: every virtual user shares one client address, and
+# shedding would turn saturation into fast 503s. Set these to load-test them.
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("LOG_LEVEL", "WARNING")  # Keep request logs out of the report
+os.environ.setdefault("LOAD_SHED_ENABLED", "false")
+
+import httpx  # noqa: E402
+from sqlalchemy import func, insert  # noqa: E402
+from sqlmodel import Session, SQLModel, select  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.security import hash_password  # noqa: E402
+from app.db.engine import async_engine, engine  # noqa: E402
+from app.db.models import Post, User  # noqa: E402
+from app.main import create_app  # noqa: E402
+from app.users.reconcile import reconcile_post_counts  # noqa: E402
+
+PASSWORD = "Loadtest-Passw0rd"
+DEFAULT_MIX = "login=2,me=20,list=40,get=30,create=8"
+BATCH_SIZE = 10_000
+
+# Server-Timing: db;dur=1.234;desc="3 queries"
+DB_QUERIES = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+
+def user_email(index: int) -> str:
+    return f"user{index}@loadtest.example.com"
+
+
+def seed(users: int, posts: int) -> None:
+    """Create the schema and bulk-load users and posts."""
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    rng = random.Random(0)
+    # bcrypt is deliberately slow, and every user shares the password
+    hashed_password = hash_password(PASSWORD)
+    now = datetime.utcnow()
+
+    with Session(engine) as session:
+        for start in range(0, users, BATCH_SIZE):
+            session.exec(insert(User.__table__), params=[
+                {
+                    "email": user_email(i),
+                    "hashed_password": hashed_password,
+                    "role": "user",
+                    "is_active": True,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(start, min(start + BATCH_SIZE, users))
+            ])
+        user_ids = session.exec(select(User.id).order_by(User.id)).all()
+
+        # Zipf (s=1) authorship, posts spread over the last 90 days
+        weights = [1 / rank for rank in range(1, len(user_ids) + 1)]
+        for start in range(0, posts, BATCH_SIZE):
+            count = min(BATCH_SIZE, posts - start)
+            authors = rng.choices(user_ids, weights, k=count)
+            rows = []
+            for i, author_id in enumerate(authors):
+                created_at = now - timedelta(seconds=(posts - start - i) * 7776000 / posts)
+                rows.append({
+                    "title": f"Post {start + i}",
+                    "content": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 8,
+                    "author_id": author_id,
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                })
+            session.exec(insert(Post.__table__), params=rows)
+        session.commit()
+        reconcile_post_counts(session)
+
+
+def parse_mix(mix: str) -> dict[str, int]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name not in OPERATIONS:
+            raise SystemExit(f"Unknown operation '{name}', expected one of {list(OPERATIONS)}")
+        weights[name] = int(weight)
+    return weights
+
+
+@dataclass
+class Client:
+    """One simulated client: an HTTP client, a login and a random stream."""
+    http: httpx.AsyncClient
+    rng: random.Random
+    email: str
+    headers: dict[str, str] = field(default_factory=dict)
+    max_post_id: int = 1
+
+    async def login(self) -> httpx.Response:
+        response = await self.http.post(
+            "/api/auth/login", data={"username": self.email, "password": PASSWORD}
+        )
+        if response.status_code == 200:
+            self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        return response
+
+
+async def op_login(client: Client) -> httpx.Response:
+    return await client.login()
+
+
+async def op_me(client: Client) -> httpx.Response:
+    return await client.http.get("/api/users/me", headers=client.headers)
+
+
+async def op_list(client: Client) -> httpx.Response:
+    # Mostly the first page; some clients scroll on to the next one
+    response = await client.http.get("/api/posts/", params={"pagination": "cursor", "limit": 20})
+    if client.rng.random() < 0.3 and response.status_code == 200:
+        cursor = response.json()["next_cursor"]
+        response = await client.http.get("/api/posts/", params={"cursor": cursor, "limit": 20})
+    return response
+
+
+async def op_get(client: Client) -> httpx.Response:
+    # Popular posts are the recent ones; the load test never deletes posts
+    post_id = max(1, client.max_post_id - int(client.rng.expovariate(1 / 500)))
+    return await client.http.get(f"/api/posts/{post_id}")
+
+
+async def op_create(client: Client) -> httpx.Response:
+    response = await client.http.post(
+        "/api/posts/",
+        json={"title": "Load test", "content": "Lorem ipsum dolor sit amet. " * 8},
+        headers=client.headers,
+    )
+    if response.status_code == 201:
+        client.max_post_id = max(client.max_post_id, response.json()["id"])
+    return response
+
+
+OPERATIONS = {
+    "login": op_login,
+    "me": op_me,
+    "list": op_list,
+    "get": op_get,
+    "create": op_create,
+}
+
+
+@dataclass
+class Samples:
+    latencies: list[float] = field(default_factory=list)
+    queries: list[int] = field(default_factory=list)
+    errors: int = 0
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted `values`."""
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def summarize(samples: Samples, elapsed: float) -> dict:
+    latencies = sorted(samples.latencies)
+    if not latencies:
+        return {"requests": 0, "errors": samples.errors}
+    return {
+        "requests": len(latencies),
+        "errors": samples.errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "queries_per_request": round(sum(samples.queries) / len(samples.queries), 2),
+    }
+
+
+async def worker(
+    client: Client,
+    weights: dict[str, int],
+    results: dict[str, Samples],
+    measure_from: float,
+    deadline: float
+) -> None:
+    names, counts = list(weights), list(weights.values())
+    while (now := time.perf_counter()) < deadline:
+        name = client.rng.choices(names, counts)[0]
+        started = time.perf_counter()
+        response = await OPERATIONS[name](client)
+        finished = time.perf_counter()
+        if started < measure_from:
+            continue  # warm-up
+
+        samples = results[name]
+        if response.status_code >= 400:
+            samples.errors += 1
+            continue
+        samples.latencies.append(finished - started)
+        match = DB_QUERIES.search(response.headers.get("server-timing", ""))
+        samples.queries.append(int(match.group(1)) if match else 0)
+
+
+async def run(args: argparse.Namespace, weights: dict[str, int]) -> dict:
+    app = create_app()
+    results = {name: Samples() for name in weights}
+    with Session(engine) as session:
+        max_post_id = session.exec(select(func.max(Post.id))).one() or 1
+        users = session.exec(select(func.count()).select_from(User)).one()
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app), httpx.AsyncClient(
+        transport=transport, base_url="http://loadtest"
+    ) as http:
+        clients = [
+            Client(http, random.Random(i), user_email(i % users), max_post_id=max_post_id)
+            for i in range(args.concurrency)
+        ]
+        await asyncio.gather(*(client.login() for client in clients))
+
+        measure_from = time.perf_counter() + args.warmup
+        deadline = measure_from + args.duration
+        await asyncio.gather(*(
+            worker(client, weights, results, measure_from, deadline) for client in clients
+        ))
+    if async_engine is not None:
+        # aiosqlite connections own non-daemon threads
+        await async_engine.dispose()
+
+    total = Samples()
+    for samples in results.values():
+        total.latencies.extend(samples.latencies)
+        total.queries.extend(samples.queries)
+        total.errors += samples.errors
+    return {
+        "operations": {name: summarize(s, args.duration) for name, s in results.items()},
+        "total": summarize(total, args.duration),
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report: dict) -> None:
+    print(f"{'operation':<10} {'requests':>9} {'errors':>7} {'req/s':>9} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>8}")
+    rows = {**report["operations"], "total": report["total"]}
+    for name, stats in rows.items():
+        if not stats["requests"]:
+            print(f"{name:<10} {0:>9} {stats['errors']:>7}")
+            continue
+        print(
+            f"{name:<10} {stats['requests']:>9} {stats['errors']:>7} "
+            f"{stats['throughput_rps']:>9.1f} {stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} "
+            f"{stats['p99_ms']:>8.2f} {stats['queries_per_request']:>8.2f}"
+        )
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    List regressions against a baseline report.
+
+    A metric regresses when it is worse by more than `tolerance`
+    (relative). Query counts are averages that shift with response cache
+    hit rates, so they also have to grow by at least 0.1 query/request.
+    """
+    regressions = []
+    for name, stats in report["operations"].items():
+        before = baseline["operations"].get(name)
+        if not before or not before.get("requests") or not stats["requests"]:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            if stats[metric] > before[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{name} {metric}: {before[metric]:.2f} -> {stats[metric]:.2f}"
+                )
+        if stats["throughput_rps"] < before["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name} throughput_rps: {before['throughput_rps']:.1f} -> "
+                f"{stats['throughput_rps']:.1f}"
+            )
+        queries = stats["queries_per_request"]
+        if queries > max(before["queries_per_request"] * (1 + tolerance),
+                         before["queries_per_request"] + 0.1):
+            regressions.append(
+                f"{name} queries_per_request: {before['queries_per_request']:.2f} -> "
+                f"{queries:.2f}"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--posts", type=int, default=100_000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30, help="seconds measured")
+    parser.add_argument("--warmup", type=float, default=3, help="seconds not measured")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="operation=weight,...")
+    parser.add_argument("--skip-seed", action="store_true", help="reuse the database")
+    parser.add_argument("--output", help="write the report to this JSON file")
+    parser.add_argument("--baseline", help="compare with this JSON report")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args()
+    weights = parse_mix(args.mix)
+
+    if not args.skip_seed:
+        started = time.perf_counter()
+        seed(args.users, args.posts)
+        print(f"seeded {args.users:,} users and {args.posts:,} posts "
+              f"in {time.perf_counter() - started:.0f}s")
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+            "database": engine.dialect.name,
+            "db_mode": settings.DB_MODE,
+            "python": platform.python_version(),
+            "users": args.users,
+            "posts": args.posts,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "mix": weights,
+        },
+        **asyncio.run(run(args, weights)),
+    }
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"wrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print(f"compared with {args.baseline} (commit {baseline['meta'].get('commit')})")
+        regressions = compare(report, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"  REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print("  no regressions")
+
+
+if __name__ == "__main__":
+    main()